@@ -1,5 +1,7 @@
 import streamlit as st
 
+from ui.warmup import warm_up
+
 if 'show_flash' not in st.session_state:
     st.session_state.show_flash = False
 
@@ -23,7 +25,14 @@ if st.button("TOPSIS"):
 if st.button("Weighted Product (WP)"):
     st.session_state.show_flash = True
 
+if st.button("Method Comparison"):
+    st.session_state.show_flash = True
+
 if st.session_state.show_flash:
     st.info("Please select the method from the sidebar")
 st.markdown("---")
-st.markdown("Built for Ujian Tengah Semester Decision Support System")
\ No newline at end of file
+st.markdown("Built for Ujian Tengah Semester Decision Support System")
+
+# Everything above needs only streamlit; the method pages' libraries load in
+# the background once the page is on screen
+warm_up()
@@ -0,0 +1,179 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from mcdm.ahp import solve_batch
+from mcdm.pipeline import compare_methods
+from mcdm.saw import saw_scores
+from mcdm.shard import sharded_scores
+from mcdm.topsis import topsis_scores
+from mcdm.wp import weight_product, weight_product_log
+
+# Decision-matrix sizes as alternatives x criteria
+DEFAULT_SIZES = ["10x5", "1000x10", "100000x20", "1000000x20"]
+FULL_SIZES = DEFAULT_SIZES + ["1000000x50", "10000000x50"]
+
+AHP_ORDERS = range(3, 11)
+DEFAULT_AHP_BATCH = 10000
+
+# (method, backend) -> function(problem) for decision-matrix benchmarks
+MATRIX_BENCHMARKS = {
+    ("saw", "numpy"): lambda p: saw_scores(p["matrix"], p["weights"], p["is_benefit"]),
+    ("wp", "numpy"): lambda p: weight_product(p["weights"], p["matrix"], p["is_benefit"]),
+    ("wp", "log"): lambda p: weight_product_log(p["weights"], p["matrix"], p["is_benefit"]),
+    ("topsis", "numpy"): lambda p: topsis_scores(p["matrix"], p["weights"], p["is_benefit"]),
+    ("compare", "pipeline"): lambda p: compare_methods(p["matrix"], p["weights"], p["is_benefit"]),
+    ("saw", "sharded"): lambda p: sharded_scores("saw", p["matrix"], p["weights"], p["is_benefit"]),
+    ("wp", "sharded"): lambda p: sharded_scores("wp", p["matrix"], p["weights"], p["is_benefit"]),
+    ("topsis", "sharded"): lambda p: sharded_scores("topsis", p["matrix"], p["weights"], p["is_benefit"]),
+}
+
+# (method, backend) -> function(matrices) for batched AHP benchmarks
+AHP_BENCHMARKS = {
+    ("ahp", "mean"): lambda matrices: solve_batch(matrices, "mean"),
+    ("ahp", "eigen"): lambda matrices: solve_batch(matrices, "eigen"),
+}
+
+
+def parse_size(size):
+    n_alternatives, n_criteria = size.lower().split("x")
+    return int(n_alternatives), int(n_criteria)
+
+
+def make_problem(n_alternatives, n_criteria, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        "matrix": rng.uniform(1.0, 100.0, size=(n_alternatives, n_criteria)),
+        "weights": rng.dirichlet(np.ones(n_criteria)),
+        "is_benefit": rng.random(n_criteria) < 0.5,
+    }
+
+
+def make_ahp_batch(order, batch, seed):
+    # Reciprocal matrices with judgments drawn from the Saaty scale
+    rng = np.random.default_rng(seed)
+    scale = np.array([1 / 9, 1 / 7, 1 / 5, 1 / 3, 1, 3, 5, 7, 9])
+    rows, cols = np.triu_indices(order, k=1)
+    upper = rng.choice(scale, size=(batch, len(rows)))
+    matrices = np.ones((batch, order, order))
+    matrices[:, rows, cols] = upper
+    matrices[:, cols, rows] = 1 / upper
+    return matrices
+
+
+def measure(fn, arg, repeats):
+    # Best wall time over repeats, then one traced run for peak allocation
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(sizes, ahp_batch, repeats, selected=None, seed=0, log=print):
+    results = []
+    for size in sizes:
+        n_alternatives, n_criteria = parse_size(size)
+        problem = make_problem(n_alternatives, n_criteria, seed)
+        for (method, backend), fn in MATRIX_BENCHMARKS.items():
+            if selected and method not in selected:
+                continue
+            seconds, peak = measure(fn, problem, repeats)
+            results.append({
+                "method": method, "backend": backend, "size": size,
+                "alternatives": n_alternatives, "criteria": n_criteria,
+                "seconds": seconds, "peak_bytes": peak, "alternatives_per_second": n_alternatives / seconds,
+            })
+            log(f"{method:8} {backend:9} {size:>12}  {seconds * 1e3:10.2f} ms  {peak / 2**20:9.1f} MiB  {n_alternatives / seconds:14,.0f} alt/s")
+        del problem
+
+    if not selected or "ahp" in selected:
+        for order in AHP_ORDERS:
+            matrices = make_ahp_batch(order, ahp_batch, seed)
+            size = f"{ahp_batch}x{order}x{order}"
+            for (method, backend), fn in AHP_BENCHMARKS.items():
+                seconds, peak = measure(fn, matrices, repeats)
+                results.append({
+                    "method": method, "backend": backend, "size": size,
+                    "batch": ahp_batch, "order": order,
+                    "seconds": seconds, "peak_bytes": peak, "matrices_per_second": ahp_batch / seconds,
+                })
+                log(f"{method:8} {backend:9} {size:>12}  {seconds * 1e3:10.2f} ms  {peak / 2**20:9.1f} MiB  {ahp_batch / seconds:14,.0f} mat/s")
+    return results
+
+
+def compare_to_baseline(results, baseline_path, threshold, log=print):
+    # Report entries that got slower than the baseline by more than threshold
+    with open(baseline_path) as f:
+        baseline = {(r["method"], r["backend"], r["size"]): r["seconds"] for r in json.load(f)["results"]}
+    regressions = 0
+    for r in results:
+        previous = baseline.get((r["method"], r["backend"], r["size"]))
+        if previous is None:
+            continue
+        ratio = r["seconds"] / previous
+        if ratio > 1 + threshold:
+            regressions += 1
+            log(f"REGRESSION {r['method']} {r['backend']} {r['size']}: {previous * 1e3:.2f} ms -> {r['seconds'] * 1e3:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench", description="Benchmark the MCDM engines on synthetic data.")
+    parser.add_argument("--sizes", nargs="+", default=None, help=f"matrix sizes as NxM (default: {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--full", action="store_true", help="include the large sizes up to 10000000x50 (needs ~8 GB RAM)")
+    parser.add_argument("--methods", nargs="+", default=None, help="only run these methods (saw wp topsis compare ahp)")
+    parser.add_argument("--ahp-batch", type=int, default=DEFAULT_AHP_BATCH, help="AHP matrices per batch")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per benchmark, the best is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None, help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="JSON from an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown ratio reported as a regression (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    results = run_benchmarks(sizes, args.ahp_batch, args.repeats, args.methods, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+    if args.baseline:
+        return 1 if compare_to_baseline(results, args.baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
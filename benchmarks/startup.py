@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks.bench import environment
+from ui.warmup import PAGE_MODULES
+
+# Cold-start timings, each taken in a fresh interpreter: importing every module
+# the pages need, a headless server answering its health check, and the first
+# run of each page script (with the Welcome warm-up disabled, so a page pays for
+# its own imports as it would on a replica that was just started).
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_MODULES = ("streamlit",) + PAGE_MODULES
+PAGES = ["Welcome.py"] + sorted(os.path.join("pages", name) for name in os.listdir(os.path.join(ROOT, "pages")) if name.endswith(".py"))
+
+# Seconds to wait for a server or page before giving up
+TIMEOUT = 60
+
+_IMPORT = """
+import time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started)
+"""
+
+_PAGE = """
+import time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({path!r}, default_timeout={timeout})
+started = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - started
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+print(elapsed)
+"""
+
+
+def _fresh(code):
+    # Seconds printed by code run in a new interpreter at the repository root
+    env = dict(os.environ, MCDM_WARMUP="0")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, timeout=TIMEOUT)
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_start():
+    # Seconds from launching `streamlit run Welcome.py` until /_stcore/health answers
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "Welcome.py", "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < TIMEOUT:
+            if server.poll() is not None:
+                raise RuntimeError(f"streamlit exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"server not healthy after {TIMEOUT}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run_startup(repeats, log=print):
+    measurements = [("import", module, lambda module=module: _fresh(_IMPORT.format(module=module))) for module in IMPORT_MODULES]
+    measurements.append(("server", "Welcome.py", server_start))
+    measurements += [
+        ("page", path, lambda path=path: _fresh(_PAGE.format(path=os.path.join(ROOT, path), timeout=TIMEOUT)))
+        for path in PAGES
+    ]
+
+    results = []
+    for kind, target, fn in measurements:
+        seconds = min(fn() for _ in range(repeats))
+        results.append({"kind": kind, "target": target, "seconds": seconds})
+        log(f"{kind:7} {target:22} {seconds * 1e3:10.1f} ms")
+    return results
+
+
+def compare_to_baseline(results, baseline_path, threshold, log=print):
+    # Report entries that got slower than the baseline by more than threshold
+    with open(baseline_path) as f:
+        baseline = {(r["kind"], r["target"]): r["seconds"] for r in json.load(f)["results"]}
+    regressions = 0
+    for r in results:
+        previous = baseline.get((r["kind"], r["target"]))
+        if previous is None:
+            continue
+        ratio = r["seconds"] / previous
+        if ratio > 1 + threshold:
+            regressions += 1
+            log(f"REGRESSION {r['kind']} {r['target']}: {previous * 1e3:.1f} ms -> {r['seconds'] * 1e3:.1f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description="Measure import times and cold starts of the app.")
+    parser.add_argument("--repeats", type=int, default=3, help="fresh processes per measurement, the best is kept")
+    parser.add_argument("-o", "--output", default=None, help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=None, help="JSON from an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown ratio reported as a regression (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    results = run_startup(args.repeats)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+    if args.baseline:
+        return 1 if compare_to_baseline(results, args.baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import functools
+from collections import namedtuple
+
+import numpy as np
+
+from mcdm.instrument import stage
+
+# Saaty's random consistency index by matrix order
+RANDOM_INDEX = {1: 0, 2: 0, 3: 0.58, 4: 0.9, 5: 1.12, 6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49}
+
+WEIGHT_METHODS = ("mean", "eigen")
+
+# Judgments drawn when simulating the random index of larger matrices
+SAATY_SCALE = np.array([1 / 9, 1 / 8, 1 / 7, 1 / 6, 1 / 5, 1 / 4, 1 / 3, 1 / 2, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+RANDOM_INDEX_SAMPLES = 500
+
+AHPBatchResult = namedtuple("AHPBatchResult", ["weights", "lambda_max", "ci", "cr"])
+RepairResult = namedtuple("RepairResult", ["matrices", "cr_before", "cr_after", "changes"])
+AHPScenarioResult = namedtuple(
+    "AHPScenarioResult",
+    ["criteria_weights", "alternative_weights", "final_scores", "cr_criteria", "cr_alternatives"],
+)
+
+
+def _as_batch(matrices):
+    matrices = np.asarray(matrices, dtype=np.float64)
+    if matrices.ndim == 2:
+        return matrices[np.newaxis], True
+    return matrices, False
+
+
+@functools.lru_cache(maxsize=None)
+def random_index(n, n_samples=RANDOM_INDEX_SAMPLES, seed=0):
+    # Saaty's table up to n = 10; beyond that the mean CI of random reciprocal
+    # matrices with judgments from the 1/9..9 scale, simulated once per n
+    if n in RANDOM_INDEX:
+        return RANDOM_INDEX[n]
+    rng = np.random.default_rng(seed)
+    rows, cols = np.triu_indices(n, k=1)
+    upper = rng.choice(SAATY_SCALE, size=(n_samples, len(rows)))
+    matrices = np.ones((n_samples, n, n))
+    matrices[:, rows, cols] = upper
+    matrices[:, cols, rows] = 1 / upper
+    lambda_max = np.linalg.eigvals(matrices).real.max(axis=-1)
+    return float((lambda_max.mean() - n) / (n - 1))
+
+
+def _consistency(lambda_max, n):
+    consistency_index = (lambda_max - n) / (n - 1) if n > 1 else np.zeros_like(lambda_max)
+    random_index_n = random_index(n)
+    # Orders 1 and 2 are always consistent
+    if random_index_n == 0:
+        return consistency_index, np.zeros_like(lambda_max)
+    return consistency_index, consistency_index / random_index_n
+
+
+def reciprocal_judgments(matrices):
+    # Full reciprocal matrices from judgments given in either triangle; the upper
+    # triangle wins where both are given. NaN (or a non-positive entry) in both
+    # a_ij and a_ji marks a missing comparison and stays NaN.
+    batch, single = _as_batch(matrices)
+    n = batch.shape[-1]
+    rows, cols = np.triu_indices(n, k=1)
+    upper = batch[:, rows, cols]
+    lower = batch[:, cols, rows]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = np.where(upper > 0, upper, np.where(lower > 0, 1 / lower, np.nan))
+        result = np.ones_like(batch)
+        result[:, rows, cols] = value
+        result[:, cols, rows] = 1 / value
+    return result[0] if single else result
+
+
+def complete_judgments(matrices):
+    # Fill missing comparisons by logarithmic least squares: v = log w minimises
+    # the sum over known pairs of (v_i - v_j - log a_ij)^2, which is the graph
+    # Laplacian system L v = sum_j log a_ij. Missing a_ij become w_i / w_j; known
+    # judgments are kept. Each matrix's known pairs must connect all items.
+    batch, single = _as_batch(reciprocal_judgments(matrices))
+    n = batch.shape[-1]
+    off_diagonal = ~np.eye(n, dtype=bool)
+    known = np.isfinite(batch) & off_diagonal
+    if known.sum(axis=(-2, -1)).min() == n * (n - 1):
+        return batch[0] if single else batch
+
+    laplacian = -known.astype(np.float64)
+    laplacian[:, np.arange(n), np.arange(n)] = known.sum(axis=-1)
+    if n > 1 and (np.linalg.matrix_rank(laplacian) < n - 1).any():
+        raise ValueError("Comparisons are too sparse: every item must be linked to the others by known judgments")
+    rhs = np.where(known, np.log(np.where(known, batch, 1.0)), 0.0).sum(axis=-1)
+    # Adding 1/n to every entry pins sum(v) = 0, the free constant of L
+    log_weights = np.linalg.solve(laplacian + 1.0 / n, rhs[..., np.newaxis])[..., 0]
+    filled = np.exp(log_weights[:, :, np.newaxis] - log_weights[:, np.newaxis, :])
+    result = np.where(known | ~off_diagonal, batch, filled)
+    return result[0] if single else result
+
+
+def solve_batch(matrices, method="mean"):
+    # Weights, lambda_max, CI and CR for a stack of (batch, n, n) comparison matrices.
+    # "mean" is the column-normalised row mean used by the AHP page,
+    # "eigen" is the exact principal right eigenvector.
+    if method not in WEIGHT_METHODS:
+        raise ValueError(f"Unknown weighting method {method!r}, expected one of {WEIGHT_METHODS}")
+    batch, single = _as_batch(matrices)
+    n = batch.shape[-1]
+
+    with stage("ahp.weights"):
+        weights, lambda_max = _weights(batch, method)
+    with stage("ahp.consistency"):
+        if lambda_max is None:
+            lambda_max = np.linalg.eigvals(batch).real.max(axis=-1)
+        consistency_index, consistency_ratio = _consistency(lambda_max, n)
+    if single:
+        return AHPBatchResult(weights[0], lambda_max[0], consistency_index[0], consistency_ratio[0])
+    return AHPBatchResult(weights, lambda_max, consistency_index, consistency_ratio)
+
+
+def _weights(batch, method):
+    # The eigen method yields lambda_max with the weights; the mean method
+    # leaves it to the consistency check
+    if method == "eigen":
+        eigenvalues, eigenvectors = np.linalg.eig(batch)
+        principal = np.argmax(eigenvalues.real, axis=-1)
+        lambda_max = np.take_along_axis(eigenvalues.real, principal[:, np.newaxis], axis=-1)[:, 0]
+        vectors = np.take_along_axis(eigenvectors, principal[:, np.newaxis, np.newaxis], axis=-1)[..., 0]
+        weights = np.abs(vectors.real)
+        weights /= weights.sum(axis=-1, keepdims=True)
+    else:
+        weights = np.mean(batch / np.sum(batch, axis=-2, keepdims=True), axis=-1)
+        lambda_max = None
+    return weights, lambda_max
+
+
+def solve_scenarios(criteria_matrices, alternative_matrices, method="mean"):
+    # criteria_matrices: (batch, m, m); alternative_matrices: (batch, m, n, n),
+    # one stakeholder judgment set per batch entry
+    criteria_batch = np.asarray(criteria_matrices, dtype=np.float64)
+    alternative_batch = np.asarray(alternative_matrices, dtype=np.float64)
+    batch, m, n = alternative_batch.shape[0], alternative_batch.shape[1], alternative_batch.shape[-1]
+
+    criteria = solve_batch(criteria_batch, method)
+    alternatives = solve_batch(alternative_batch.reshape(batch * m, n, n), method)
+    alternative_weights = alternatives.weights.reshape(batch, m, n)
+
+    with stage("ahp.final_scores"):
+        final_scores = np.einsum("bmn,bm->bn", alternative_weights, criteria.weights)
+    return AHPScenarioResult(
+        criteria.weights,
+        alternative_weights,
+        final_scores,
+        criteria.cr,
+        alternatives.cr.reshape(batch, m),
+    )
+
+
+def ratio_column_params(stats, weights, is_benefit):
+    # Pairwise comparisons built from ratio-scale scores (a_ij = x_i / x_j, inverted
+    # for cost criteria) are perfectly consistent, and their principal eigenvector
+    # is the column divided by its sum (sum of reciprocals for cost). This lets
+    # AHP score a plain decision matrix without materialising n x n matrices.
+    criteria_weights = weights / weights.sum()
+    return np.where(is_benefit, stats.col_sum, stats.recip_sum), criteria_weights, is_benefit
+
+
+def ratio_chunk(chunk, params):
+    divisor, criteria_weights, is_benefit = params
+    with np.errstate(divide="ignore"):
+        priorities = np.where(is_benefit, chunk, 1.0 / chunk) / divisor
+    # einsum rather than @, as in saw_chunk: BLAS rounds a row differently
+    # depending on where it sits in the block
+    return np.einsum("ij,j->i", priorities, criteria_weights)
+
+
+def _nearest_judgment(target, current):
+    # Saaty-scale value closest to target in log terms, one notch further towards
+    # it when rounding would give back the current judgment
+    log_scale = np.log(SAATY_SCALE)
+    index = np.abs(log_scale - np.log(target)[:, np.newaxis]).argmin(axis=-1)
+    unchanged = np.isclose(SAATY_SCALE[index], current)
+    step = np.where(target > current, 1, -1)
+    index = np.where(unchanged, np.clip(index + step, 0, len(SAATY_SCALE) - 1), index)
+    return SAATY_SCALE[index]
+
+
+def suggest_repairs(matrices, threshold=0.1, max_changes=None):
+    # Greedy consistency repair for a (batch, n, n) stack. Each round takes one
+    # eigen-decomposition of every matrix still above threshold, finds the
+    # judgment with the largest error e_ij = a_ij * w_j / w_i (in log terms) and
+    # moves it to the Saaty-scale value nearest w_i / w_j. A judgment is not
+    # changed again until every other one has been, so rounds cannot oscillate
+    # between two cells. changes lists (i, j, original, suggested) per matrix;
+    # matrices holds the repaired stack.
+    batch, single = _as_batch(matrices)
+    batch = batch.copy()
+    n_matrices, n = batch.shape[0], batch.shape[-1]
+    max_changes = n * (n - 1) if max_changes is None else max_changes
+    rows, cols = np.triu_indices(n, k=1)
+    changes = [[] for _ in range(n_matrices)]
+    touched = np.zeros((n_matrices, len(rows)), dtype=bool)
+
+    active = np.arange(n_matrices)
+    cr_before = cr_after = None
+    for iteration in range(max_changes + 1):
+        result = solve_batch(batch[active], "eigen")
+        if cr_before is None:
+            cr_before, cr_after = result.cr.copy(), result.cr.copy()
+        cr_after[active] = result.cr
+        above = result.cr > threshold
+        if iteration == max_changes or not above.any():
+            break
+
+        active, weights = active[above], result.weights[above]
+        judgments = batch[active][:, rows, cols]
+        error = np.abs(np.log(judgments * weights[:, cols] / weights[:, rows]))
+        exhausted = touched[active].all(axis=-1)
+        touched[active[exhausted]] = False
+        error[touched[active]] = -1.0
+        worst = error.argmax(axis=-1)
+        touched[active, worst] = True
+        i, j = rows[worst], cols[worst]
+        current = judgments[np.arange(len(active)), worst]
+        suggested = _nearest_judgment(weights[np.arange(len(active)), i] / weights[np.arange(len(active)), j], current)
+        batch[active, i, j] = suggested
+        batch[active, j, i] = 1 / suggested
+        for k, ii, jj, old, new in zip(active, i, j, current, suggested):
+            changes[k].append((int(ii), int(jj), float(old), float(new)))
+
+    if single:
+        return RepairResult(batch[0], cr_before[0], cr_after[0], changes[0])
+    return RepairResult(batch, cr_before, cr_after, changes)
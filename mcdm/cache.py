@@ -0,0 +1,171 @@
+import functools
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from mcdm.instrument import stage
+
+# Default memory budget for cached results shared by every session in the process
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _update_hash(h, value):
+    if isinstance(value, np.ndarray):
+        h.update(b"ndarray")
+        h.update(value.dtype.str.encode())
+        h.update(repr(value.shape).encode())
+        h.update(memoryview(np.ascontiguousarray(value)).cast("B"))
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        h.update(b"bytes")
+        h.update(value)
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _update_hash(h, item)
+    elif isinstance(value, dict):
+        h.update(f"dict{len(value)}".encode())
+        for k in sorted(value):
+            _update_hash(h, k)
+            _update_hash(h, value[k])
+    else:
+        h.update(f"{type(value).__name__}:{value!r}".encode())
+    h.update(b"|")
+
+
+def content_key(*parts):
+    # Hash of the raw bytes, dtype and shape of every array plus the repr of scalars
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update_hash(h, part)
+    return h.hexdigest()
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if hasattr(value, "nbytes"):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    # Cached results are shared between callers, so arrays are made read-only
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    return value
+
+
+class _Pending:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    # Thread-safe LRU cache bounded by the total size of the stored results.
+    # Concurrent requests for a key being computed wait for that one computation.
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Results larger than the whole budget, returned but never stored
+        self.oversize = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = _freeze(compute())
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if pending.error is None:
+                    self._store(key, pending.value)
+            pending.event.set()
+        return pending.value
+
+    def _store(self, key, value):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            self.oversize += 1
+            return
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "oversize": self.oversize,
+            }
+
+
+default_cache = ResultCache()
+
+
+def memoize(fn, cache=None):
+    # Wrap a pure engine function so identical inputs share one cached result
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        target = cache if cache is not None else default_cache
+        with stage("cache.key"):
+            key = content_key(name, args, kwargs)
+        return target.get_or_compute(key, lambda: fn(*args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,103 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from mcdm.ingest import load_decision_matrix
+from mcdm.pipeline import METHODS, compare_methods
+from mcdm.ranking import RANK_METHOD, top_k
+from mcdm.shard import sharded_scores
+from mcdm.stats import DEFAULT_CHUNK_SIZE
+
+INPUT_EXTENSIONS = (".csv", ".parquet", ".pq")
+
+
+def find_problems(input_dir):
+    return sorted(
+        os.path.join(input_dir, name)
+        for name in os.listdir(input_dir)
+        if name.lower().endswith(INPUT_EXTENSIONS)
+    )
+
+
+def sidecar_for(path):
+    # data.csv pairs with data.json when it exists
+    candidate = os.path.splitext(path)[0] + ".json"
+    return candidate if os.path.exists(candidate) else None
+
+
+def rank_problem(path, method, output_dir, top=None, chunk_size=DEFAULT_CHUNK_SIZE, shards=1):
+    started = time.perf_counter()
+    decision = load_decision_matrix(path, sidecar=sidecar_for(path), chunk_size=chunk_size)
+    limit = decision.matrix.shape[0] if top is None else top
+
+    if method == "compare":
+        result = compare_methods(decision.matrix, decision.weights, decision.is_benefit, METHODS, chunk_size)
+        order, ranks = top_k(result.consensus_scores, limit, method="min")
+        output = pd.DataFrame({"alternative": decision.alternatives[order], "consensus_rank": ranks})
+        for name in result.methods:
+            output[f"{name}_score"] = result.scores[name][order]
+            output[f"{name}_rank"] = result.ranks[name][order]
+    else:
+        if shards > 1:
+            # Scores and the top-k merge run across processes, one shard of rows each
+            result = sharded_scores(method, decision.matrix, decision.weights, decision.is_benefit, shards, limit, chunk_size)
+            scores, order, ranks = result.scores, result.top_indices, result.top_ranks
+        else:
+            scores = compare_methods(decision.matrix, decision.weights, decision.is_benefit, (method,), chunk_size).scores[method]
+            order, ranks = top_k(scores, limit, method=RANK_METHOD[method])
+        output = pd.DataFrame({"alternative": decision.alternatives[order], "score": scores[order], "rank": ranks})
+
+    out_path = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(path))[0]}.{method}.csv")
+    output.to_csv(out_path, index=False)
+    return path, out_path, decision.matrix.shape[0], time.perf_counter() - started
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m mcdm",
+        description="Rank every decision matrix (CSV/Parquet) in a directory without starting Streamlit.",
+    )
+    parser.add_argument("input_dir", help="directory of decision-matrix files; data.json next to data.csv is used as its sidecar")
+    parser.add_argument("method", choices=METHODS + ("compare",), help="method to run, or 'compare' for all methods plus consensus")
+    parser.add_argument("-o", "--output-dir", default="rankings", help="where ranking CSVs are written (default: rankings)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="problems ranked concurrently (default: CPU count)")
+    parser.add_argument("-k", "--top", type=int, default=None, help="only write the best K alternatives")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows read and scored per block")
+    parser.add_argument("-s", "--shards", type=int, default=1, help="processes scoring each problem by rows, for very large files (default: 1; not used by compare)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    paths = find_problems(args.input_dir)
+    if not paths:
+        print(f"No decision-matrix files found in {args.input_dir}", file=sys.stderr)
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    failures = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(paths)))) as pool:
+        futures = {
+            pool.submit(rank_problem, path, args.method, args.output_dir, args.top, args.chunk_size, args.shards): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                path, out_path, n_alternatives, seconds = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"FAILED {futures[future]}: {e}", file=sys.stderr)
+            else:
+                print(f"{path}: {n_alternatives} alternatives in {seconds:.3f}s -> {out_path}")
+
+    print(
+        f"Ranked {len(paths) - failures}/{len(paths)} problems with {args.method} in {time.perf_counter() - started:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if failures else 0
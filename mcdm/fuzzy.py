@@ -0,0 +1,152 @@
+from collections import namedtuple
+
+import numpy as np
+
+from mcdm.instrument import stage
+from mcdm.ranking import rank_average, rank_min
+from mcdm.stats import DEFAULT_CHUNK_SIZE, iter_chunks
+
+# Triangular fuzzy numbers (low, mode, high) are stored as a trailing axis of 3,
+# so an alternatives x criteria decision matrix is an (n, m, 3) float64 array and
+# every fuzzy operation is a broadcast NumPy expression over whole blocks of rows.
+#
+# Benefit columns are normalised by their largest high value, cost columns divide
+# their smallest low value (Chen's linear scaling, which keeps the numbers
+# triangular); weights may be crisp (m,) or fuzzy (m, 3).
+
+FuzzyStats = namedtuple("FuzzyStats", ["low_min", "high_max"])
+FuzzySAWResult = namedtuple("FuzzySAWResult", ["fuzzy_scores", "scores", "ranks"])
+
+
+def as_fuzzy(values):
+    # Crisp values become degenerate triangles (x, x, x)
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[-1:] == (3,) and values.ndim > 1:
+        return values
+    return np.repeat(values[..., np.newaxis], 3, axis=-1)
+
+
+def from_intervals(low, high):
+    # Interval judgments [low, high] as triangles peaking at the midpoint
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    return np.stack([low, (low + high) / 2, high], axis=-1)
+
+
+def validate(fuzzy):
+    if fuzzy.shape[-1] != 3:
+        raise ValueError(f"Triangular fuzzy numbers need a trailing axis of 3, got shape {fuzzy.shape}")
+    if np.any(fuzzy[..., 0] > fuzzy[..., 1]) or np.any(fuzzy[..., 1] > fuzzy[..., 2]):
+        raise ValueError("Triangular fuzzy numbers must satisfy low <= mode <= high")
+
+
+def defuzzify(fuzzy):
+    # Centroid of the triangle
+    return fuzzy.mean(axis=-1)
+
+
+def fuzzy_column_stats(matrix, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Column extremes in one streaming pass, which also checks every triangle
+    low_min = high_max = None
+    for start, stop in iter_chunks(matrix.shape[0], chunk_size):
+        chunk = matrix[start:stop]
+        validate(chunk)
+        block_min, block_max = chunk[..., 0].min(axis=0), chunk[..., 2].max(axis=0)
+        low_min = block_min if low_min is None else np.minimum(low_min, block_min)
+        high_max = block_max if high_max is None else np.maximum(high_max, block_max)
+    return FuzzyStats(low_min, high_max)
+
+
+def fuzzy_normalize(chunk, stats, is_benefit):
+    # Benefit: (l, m, u) / u_max; cost: l_min / (u, m, l)
+    return fuzzy_weighted(chunk, stats, np.ones((len(is_benefit), 3)), is_benefit)
+
+
+def fuzzy_weighted(chunk, stats, weights, is_benefit):
+    # Normalised triangles times the weight triangles, with the weights folded
+    # into the per-column factors: one multiply for every cell, plus a division
+    # only for the cost columns
+    weighted = chunk * (weights / stats.high_max[:, np.newaxis])
+    cost = ~is_benefit
+    if cost.any():
+        with np.errstate(divide="ignore"):
+            weighted[:, cost] = (stats.low_min[cost, np.newaxis] * weights[cost]) / chunk[:, cost, ::-1]
+    return weighted
+
+
+def _checked(matrix, weights, is_benefit_criteria):
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.ndim != 3:
+        raise ValueError(f"A fuzzy decision matrix has shape (alternatives, criteria, 3), got {matrix.shape}")
+    weights = as_fuzzy(weights)
+    validate(weights)
+    return matrix, weights, np.asarray(is_benefit_criteria, dtype=bool)
+
+
+def fuzzy_topsis_column_params(stats, weights, is_benefit):
+    # Normalising and weighting scale each vertex of a column by a positive
+    # factor, so the weighted ideals follow from the raw column extremes: the
+    # best high value of every weighted column is its weight's high vertex, the
+    # worst low value its low vertex scaled by (column min / column max)
+    ratio = stats.low_min / stats.high_max
+    ideal_positive = weights[:, 2]
+    ideal_negative = weights[:, 0] * ratio
+    return stats, weights, is_benefit, ideal_positive, ideal_negative
+
+
+def fuzzy_topsis_chunk(chunk, params):
+    stats, weights, is_benefit, ideal_positive, ideal_negative = params
+    weighted = fuzzy_weighted(chunk, stats, weights, is_benefit)
+
+    # Vertex distance of every cell to the crisp ideal, summed over criteria.
+    # Differences are taken before squaring: the expanded form cancels badly
+    # when a triangle sits close to the ideal.
+    def distance(ideal):
+        difference = weighted - ideal[:, np.newaxis]
+        return np.sqrt(np.einsum("ijk,ijk->ij", difference, difference) / 3).sum(axis=1)
+
+    distance_to_positive = distance(ideal_positive)
+    distance_to_negative = distance(ideal_negative)
+    return distance_to_negative / (distance_to_positive + distance_to_negative)
+
+
+def fuzzy_topsis_closeness(matrix, weights, is_benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Fuzzy TOPSIS: vertex distances of the weighted normalised triangles to
+    # crisp ideal points taken column by column from the data (the largest high
+    # and smallest low weighted value), summed over criteria
+    matrix, weights, is_benefit = _checked(matrix, weights, is_benefit_criteria)
+    with stage("fuzzy_topsis.ideal_solutions"):
+        params = fuzzy_topsis_column_params(fuzzy_column_stats(matrix, chunk_size), weights, is_benefit)
+    closeness = np.empty(matrix.shape[0])
+    with stage("fuzzy_topsis.closeness"):
+        for start, stop in iter_chunks(matrix.shape[0], chunk_size):
+            closeness[start:stop] = fuzzy_topsis_chunk(matrix[start:stop], params)
+    return closeness
+
+
+def fuzzy_topsis_scores(matrix, weights, is_benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE):
+    closeness = fuzzy_topsis_closeness(matrix, weights, is_benefit_criteria, chunk_size)
+    with stage("fuzzy_topsis.rank"):
+        ranks = rank_min(closeness)
+    return closeness, ranks
+
+
+def fuzzy_saw_chunk(chunk, params):
+    stats, weights, is_benefit = params
+    # Sum over criteria of normalised triangle times weight triangle, per vertex
+    return np.einsum("ijk->ik", fuzzy_weighted(chunk, stats, weights, is_benefit))
+
+
+def fuzzy_saw_scores(matrix, weights, is_benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Fuzzy SAW: a triangular score per alternative, ranked by its centroid
+    matrix, weights, is_benefit = _checked(matrix, weights, is_benefit_criteria)
+    with stage("fuzzy_saw.normalize"):
+        params = (fuzzy_column_stats(matrix, chunk_size), weights, is_benefit)
+    fuzzy_scores = np.empty((matrix.shape[0], 3))
+    with stage("fuzzy_saw.dot"):
+        for start, stop in iter_chunks(matrix.shape[0], chunk_size):
+            fuzzy_scores[start:stop] = fuzzy_saw_chunk(matrix[start:stop], params)
+    scores = defuzzify(fuzzy_scores)
+    with stage("fuzzy_saw.rank"):
+        ranks = rank_average(scores)
+    return FuzzySAWResult(fuzzy_scores, scores, ranks)
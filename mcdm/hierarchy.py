@@ -0,0 +1,166 @@
+import numpy as np
+
+from mcdm.ahp import solve_batch
+from mcdm.instrument import stage
+from mcdm.ranking import rank_min, top_k
+
+PATH_SEPARATOR = "/"
+
+
+def synthesize(local_weights, parent, levels):
+    # Global weight of every node: its local weight times its parent's global
+    # weight. The parent links form a sparse matrix with one entry per row, so
+    # each level is a single gather-multiply; leading batch axes of
+    # local_weights are carried through.
+    global_weights = np.zeros_like(local_weights)
+    global_weights[..., 0] = 1.0
+    for nodes in levels:
+        global_weights[..., nodes] = local_weights[..., nodes] * global_weights[..., parent[nodes]]
+    return global_weights
+
+
+class Hierarchy:
+    # Goal -> criteria -> sub-criteria ... -> alternatives. structure is a nested
+    # dict of criterion names ({"Cost": {"Price": {}, "Upkeep": {}}, "Quality": {}});
+    # an empty dict or None marks a leaf criterion, under which the alternatives
+    # are compared. Nodes are numbered in preorder (0 is the goal) and addressed
+    # by their "/"-joined path, so every subtree is a contiguous index range and
+    # its leaves a contiguous block of alternative_priorities rows.
+    #
+    # Judgments default to all-ones (equal priorities). Changing one node
+    # re-solves only that node and re-synthesises only its subtree. Scores are
+    # then recomputed from the global weights rather than shifted by the
+    # difference, so they never drift and equal those of a full rebuild.
+
+    def __init__(self, structure, alternatives, method="mean"):
+        if not structure:
+            raise ValueError("A hierarchy needs at least one criterion")
+        self.alternatives = list(alternatives)
+        self.method = method
+
+        paths, parent, depth = ["Goal"], [-1], [0]
+
+        def visit(children, parent_index, prefix, level):
+            for name, sub in children.items():
+                index = len(paths)
+                paths.append(f"{prefix}{name}")
+                parent.append(parent_index)
+                depth.append(level)
+                visit(sub or {}, index, f"{prefix}{name}{PATH_SEPARATOR}", level + 1)
+
+        visit(structure, 0, "", 1)
+        self.paths = paths
+        self.parent = np.array(parent)
+        self.depth = np.array(depth)
+        self._index = {path: i for i, path in enumerate(paths)}
+
+        n_nodes = len(paths)
+        size = np.ones(n_nodes, dtype=np.intp)
+        for i in range(n_nodes - 1, 0, -1):
+            size[self.parent[i]] += size[i]
+        self.end = np.arange(n_nodes) + size
+        self.is_leaf = size == 1
+        self.leaves = np.flatnonzero(self.is_leaf)
+        # Leaves numbered before each node index; a leaf's row is its own entry
+        self._leaf_row = np.concatenate([[0], np.cumsum(self.is_leaf)])
+        self.children = [[] for _ in range(n_nodes)]
+        for i in range(1, n_nodes):
+            self.children[self.parent[i]].append(i)
+        self.children = [np.array(c, dtype=np.intp) for c in self.children]
+        self.levels = [np.flatnonzero(self.depth == d) for d in range(1, self.depth.max() + 1)]
+
+        n_alternatives = len(self.alternatives)
+        self.judgments = {
+            i: np.ones((n_alternatives, n_alternatives)) if self.is_leaf[i] else np.ones((len(self.children[i]),) * 2)
+            for i in range(n_nodes)
+        }
+        self.local_weights = np.zeros(n_nodes)
+        self.alternative_priorities = np.zeros((len(self.leaves), n_alternatives))
+        self.cr = np.zeros(n_nodes)
+        self.rebuild()
+
+    def node(self, key):
+        if isinstance(key, (int, np.integer)):
+            return int(key)
+        if isinstance(key, (tuple, list)):
+            key = PATH_SEPARATOR.join(key)
+        try:
+            return self._index[key]
+        except KeyError:
+            raise KeyError(f"Unknown hierarchy node {key!r}") from None
+
+    def _apply(self, nodes, results):
+        for i, weights, cr in zip(nodes, results.weights, results.cr):
+            if self.is_leaf[i]:
+                self.alternative_priorities[self._leaf_row[i]] = weights
+            else:
+                self.local_weights[self.children[i]] = weights
+            self.cr[i] = cr
+
+    def _solve(self, nodes):
+        # One batched solve per matrix order
+        orders = {}
+        for i in nodes:
+            orders.setdefault(self.judgments[i].shape[0], []).append(i)
+        with stage("hierarchy.local_weights"):
+            for group in orders.values():
+                self._apply(group, solve_batch(np.stack([self.judgments[i] for i in group]), self.method))
+
+    def rebuild(self):
+        self._solve(range(len(self.paths)))
+        self.local_weights[0] = 1.0
+        with stage("hierarchy.synthesis"):
+            self.global_weights = synthesize(self.local_weights, self.parent, self.levels)
+            self._rescore()
+
+    def _rescore(self):
+        # Every alternative's score depends on every leaf weight
+        self.scores = np.einsum("l,ln->n", self.global_weights[self.leaves], self.alternative_priorities)
+
+    def _check(self, i, matrix):
+        expected = self.judgments[i].shape
+        if matrix.shape != expected:
+            raise ValueError(f"Judgments for {self.paths[i]!r} must have shape {expected}, got {matrix.shape}")
+
+    def set_judgments(self, key, matrix):
+        # Re-weight one node: a leaf only changes its alternative priorities, an
+        # inner node also re-synthesises the global weights of its subtree
+        i = self.node(key)
+        matrix = np.array(matrix, dtype=np.float64)
+        self._check(i, matrix)
+        self.judgments[i] = matrix
+        self._solve([i])
+        with stage("hierarchy.synthesis"):
+            if not self.is_leaf[i]:
+                self._resynthesize(i)
+            self._rescore()
+
+    def update_judgments(self, judgments):
+        # Several nodes at once: one batched solve, then a full synthesis
+        nodes = [self.node(key) for key in judgments]
+        for i, matrix in zip(nodes, judgments.values()):
+            matrix = np.array(matrix, dtype=np.float64)
+            self._check(i, matrix)
+            self.judgments[i] = matrix
+        self._solve(nodes)
+        with stage("hierarchy.synthesis"):
+            self.global_weights = synthesize(self.local_weights, self.parent, self.levels)
+            self._rescore()
+
+    def _resynthesize(self, i):
+        # Global weights below node i, level by level, from its own global weight
+        start, stop = i + 1, self.end[i]
+        subtree = np.arange(start, stop)
+        subtree_depth = self.depth[subtree]
+        for d in range(self.depth[i] + 1, subtree_depth.max() + 1):
+            nodes = subtree[subtree_depth == d]
+            self.global_weights[nodes] = self.local_weights[nodes] * self.global_weights[self.parent[nodes]]
+
+    def leaf_weights(self):
+        return dict(zip((self.paths[i] for i in self.leaves), self.global_weights[self.leaves]))
+
+    def ranks(self):
+        return rank_min(self.scores)
+
+    def top(self, k):
+        return top_k(self.scores, k, method="min")
@@ -0,0 +1,286 @@
+import numpy as np
+
+from mcdm.ranking import rank_average_lexicographic, top_k
+from mcdm.wp import wp_exponents, wp_log_chunk
+
+# Edits recompute the scores they touch exactly, so nothing drifts; a full
+# rebuild from the matrix after this many updates is only a safety net
+DEFAULT_REBUILD_EVERY = 10000
+
+
+class _IncrementalRanking:
+    # Scores plus a sorted copy of the defined ones. Changing one score moves a
+    # single entry inside the sorted array, so ranks are adjusted locally instead
+    # of re-sorted. NaN scores are left out: they would sort last and count as
+    # above every real score.
+
+    def __init__(self, method, rebuild_every):
+        self.method = method
+        self.rebuild_every = rebuild_every
+        self._updates = 0
+
+    def _reset_scores(self, scores):
+        self.scores = scores
+        self._sorted = np.sort(scores[~np.isnan(scores)])
+
+    def _set_score(self, i, value):
+        old = self.scores[i]
+        if old == value or (np.isnan(old) and np.isnan(value)):
+            return
+        self.scores[i] = value
+        if np.isnan(old):
+            self._sorted = np.insert(self._sorted, np.searchsorted(self._sorted, value), value)
+            return
+        if np.isnan(value):
+            self._sorted = np.delete(self._sorted, np.searchsorted(self._sorted, old))
+            return
+        s = self._sorted
+        pos = np.searchsorted(s, old)
+        new_pos = np.searchsorted(s, value)
+        if new_pos > pos:
+            s[pos:new_pos - 1] = s[pos + 1:new_pos]
+            s[new_pos - 1] = value
+        else:
+            s[new_pos + 1:pos + 1] = s[new_pos:pos]
+            s[new_pos] = value
+
+    def _after_update(self):
+        self._updates += 1
+        if self._updates >= self.rebuild_every:
+            self.rebuild()
+
+    def _rank_values(self, values):
+        # Higher scores rank first, ties follow the method's pandas semantics
+        above = len(self._sorted) - np.searchsorted(self._sorted, values, side="right")
+        if self.method == "min":
+            ranks = above + 1
+        else:
+            equal = np.searchsorted(self._sorted, values, side="right") - np.searchsorted(self._sorted, values, side="left")
+            ranks = above + (equal + 1) / 2
+        # Undefined scores (a constant TOPSIS column, a SAW cost column whose
+        # reference is 0) stay unranked, as in pandas
+        return np.where(np.isnan(values), np.nan, ranks) if np.isnan(values).any() else ranks
+
+    def rank(self, i):
+        return self._rank_values(self.scores[i])
+
+    def ranks(self):
+        return self._rank_values(self.scores)
+
+    def top(self, k):
+        return top_k(self.scores, k, method=self.method)
+
+    def update_cells(self, rows, cols, values):
+        for i, j, value in zip(rows, cols, values):
+            self.update_cell(i, j, value)
+
+    def sync(self, matrix, weights, rebuild_fraction=0.1):
+        # Apply only what differs from the engine's state; fall back to a rebuild
+        # when the shape changed or a large part of the matrix was replaced
+        matrix = np.asarray(matrix, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if matrix.shape != self.matrix.shape:
+            self.matrix = matrix.copy()
+            self.weights = weights.copy()
+            self.rebuild()
+            return self
+        rows, cols = np.nonzero(matrix != self.matrix)
+        if len(rows) > rebuild_fraction * matrix.size:
+            self.matrix = matrix.copy()
+            self.weights = weights.copy()
+            self.rebuild()
+            return self
+        self.update_cells(rows, cols, matrix[rows, cols])
+        for j in np.flatnonzero(weights != self.weights):
+            self.update_weight(j, weights[j])
+        return self
+
+
+class IncrementalSAW(_IncrementalRanking):
+    # SAW keeps each column's normalisation reference: max for benefit, min for cost.
+    # A cell edit that leaves the reference alone rescores one row in O(m). Rows
+    # are always rescored from scratch, never adjusted by deltas, so the scores
+    # match saw_scores bit for bit and ties stay exact.
+
+    def __init__(self, matrix, weights, is_benefit_criteria, rebuild_every=DEFAULT_REBUILD_EVERY):
+        super().__init__("average", rebuild_every)
+        self.matrix = np.array(matrix, dtype=np.float64)
+        self.weights = np.array(weights, dtype=np.float64)
+        self.is_benefit = np.array(is_benefit_criteria, dtype=bool)
+        self.rebuild()
+
+    def rebuild(self):
+        self.reference = np.where(self.is_benefit, self.matrix.max(axis=0), self.matrix.min(axis=0))
+        self._reset_scores(self._row_scores())
+        self._updates = 0
+
+    def normalized(self, rows=slice(None)):
+        matrix = self.matrix[rows]
+        return np.where(self.is_benefit, matrix / self.reference, self.reference / matrix)
+
+    def _row_scores(self, rows=slice(None)):
+        return np.einsum("ij,j->i", self.normalized(rows), self.weights)
+
+    def _column_reference(self, j, old, value):
+        reference = self.reference[j]
+        if self.is_benefit[j]:
+            if value >= reference:
+                return value
+            return self.matrix[:, j].max() if old == reference else reference
+        if value <= reference:
+            return value
+        return self.matrix[:, j].min() if old == reference else reference
+
+    def update_cell(self, i, j, value):
+        old = self.matrix[i, j]
+        if value == old:
+            return
+        self.matrix[i, j] = value
+        new_reference = self._column_reference(j, old, value)
+        if new_reference == self.reference[j]:
+            self._set_score(i, self._row_scores([i])[0])
+        else:
+            # Reference moved: column j's contribution changes for every row
+            self.reference[j] = new_reference
+            self._reset_scores(self._row_scores())
+        self._after_update()
+
+    def update_weight(self, j, weight):
+        if weight == self.weights[j]:
+            return
+        self.weights[j] = weight
+        self._reset_scores(self._row_scores())
+        self._after_update()
+
+
+class IncrementalTOPSIS(_IncrementalRanking):
+    # TOPSIS keeps per-column sums of squares and extremes plus every cell's
+    # squared distance terms to both ideals. An edit recomputes one column's terms,
+    # O(n), and re-sums the rows instead of renormalising the whole matrix. Terms
+    # are replaced rather than adjusted by deltas, so a row on an ideal gets a
+    # distance of exactly 0 and closeness matches topsis_closeness.
+
+    def __init__(self, matrix, weights, is_benefit_criteria, rebuild_every=DEFAULT_REBUILD_EVERY):
+        super().__init__("min", rebuild_every)
+        self.matrix = np.array(matrix, dtype=np.float64)
+        self.weights = np.array(weights, dtype=np.float64)
+        self.is_benefit = np.array(is_benefit_criteria, dtype=bool)
+        self.rebuild()
+
+    def rebuild(self):
+        self.sum_sq = np.einsum("ij,ij->j", self.matrix, self.matrix)
+        self.col_max = self.matrix.max(axis=0)
+        self.col_min = self.matrix.min(axis=0)
+        self.terms_positive, self.terms_negative = self._column_terms(self.matrix, slice(None))
+        self._rescore()
+        self._updates = 0
+
+    def _column_params(self, j=slice(None)):
+        scale = self.weights[j] / np.sqrt(self.sum_sq[j])
+        benefit = self.is_benefit[j]
+        ideal_positive = np.where(benefit, self.col_max[j], self.col_min[j]) * scale
+        ideal_negative = np.where(benefit, self.col_min[j], self.col_max[j]) * scale
+        return scale, ideal_positive, ideal_negative
+
+    def _column_terms(self, column, j):
+        scale, ideal_positive, ideal_negative = self._column_params(j)
+        weighted = column * scale
+        return (weighted - ideal_positive) ** 2, (weighted - ideal_negative) ** 2
+
+    def _rescore(self):
+        distance_to_positive = np.sqrt(self.terms_positive.sum(axis=1))
+        distance_to_negative = np.sqrt(self.terms_negative.sum(axis=1))
+        with np.errstate(invalid="ignore"):
+            self._reset_scores(distance_to_negative / (distance_to_positive + distance_to_negative))
+
+    def _refresh_column(self, j):
+        self.terms_positive[:, j], self.terms_negative[:, j] = self._column_terms(self.matrix[:, j], j)
+        self._rescore()
+        self._after_update()
+
+    def update_cell(self, i, j, value):
+        old = self.matrix[i, j]
+        if value == old:
+            return
+        self.matrix[i, j] = value
+        # Recomputed rather than adjusted, so the column norm does not drift
+        self.sum_sq[j] = np.einsum("ij,ij->j", self.matrix[:, j:j + 1], self.matrix[:, j:j + 1])[0]
+        if value >= self.col_max[j]:
+            self.col_max[j] = value
+        elif old == self.col_max[j]:
+            self.col_max[j] = self.matrix[:, j].max()
+        if value <= self.col_min[j]:
+            self.col_min[j] = value
+        elif old == self.col_min[j]:
+            self.col_min[j] = self.matrix[:, j].min()
+        self._refresh_column(j)
+
+    def update_weight(self, j, weight):
+        if weight == self.weights[j]:
+            return
+        self.weights[j] = weight
+        self._refresh_column(j)
+
+
+class IncrementalWP(_IncrementalRanking):
+    # WP keeps every row's finite log S part and the order of magnitude of its
+    # zero scores, exactly as wp_log_chunk computes them, so a cell edit rescores
+    # one row in O(m). Rows with zeros get log S of +inf (cost) or -inf (benefit)
+    # and are ranked by their zero order first, as in weight_product_log.
+
+    def __init__(self, matrix, weights, is_benefit_criteria, rebuild_every=DEFAULT_REBUILD_EVERY):
+        super().__init__("average", rebuild_every)
+        self.matrix = np.array(matrix, dtype=np.float64)
+        self.weights = np.array(weights, dtype=np.float64)
+        self.is_benefit = np.array(is_benefit_criteria, dtype=bool)
+        self.rebuild()
+
+    def rebuild(self):
+        # Normalised weights change every exponent, so weight edits rebuild too
+        self.exponents = wp_exponents(self.weights, self.is_benefit)
+        self.log_finite, self.zero_order = wp_log_chunk(self.matrix, self.exponents)
+        self._reset_scores(self._log_S(self.log_finite, self.zero_order))
+        self._updates = 0
+
+    def _log_S(self, log_finite, zero_order):
+        return np.where(zero_order == 0, log_finite, np.copysign(np.inf, zero_order))
+
+    def update_cell(self, i, j, value):
+        if value == self.matrix[i, j]:
+            return
+        self.matrix[i, j] = value
+        (self.log_finite[i],), (self.zero_order[i],) = wp_log_chunk(self.matrix[i:i + 1], self.exponents)
+        self._set_score(i, self._log_S(self.log_finite[i], self.zero_order[i]))
+        self._after_update()
+
+    def update_weight(self, j, weight):
+        if weight == self.weights[j]:
+            return
+        self.weights[j] = weight
+        self.rebuild()
+
+    def ranks(self):
+        # Zero rows tie at +-inf in log S; their zero order and finite part
+        # break the tie as in weight_product_log
+        if not self.zero_order.any():
+            return super().ranks()
+        return rank_average_lexicographic(self.zero_order, self.log_finite)
+
+    def rank(self, i):
+        return self.ranks()[i] if self.zero_order.any() else super().rank(i)
+
+    def top(self, k):
+        if not self.zero_order.any():
+            return super().top(k)
+        ranks = self.ranks()
+        order = np.lexsort((np.arange(len(ranks)), ranks))[:k]
+        return order, ranks[order]
+
+    @property
+    def V(self):
+        # Normalised preference over the dominant order of magnitude, as in weight_product_log
+        dominant = self.zero_order == self.zero_order.max()
+        shifted = self.log_finite[dominant] - self.log_finite[dominant].max()
+        V = np.zeros(len(self.scores))
+        V[dominant] = np.exp(shifted - np.log(np.sum(np.exp(shifted))))
+        return V
@@ -0,0 +1,151 @@
+from collections import namedtuple
+
+import numpy as np
+
+from mcdm.ahp import ratio_chunk, ratio_column_params
+from mcdm.instrument import stage
+from mcdm.ranking import RANK_METHOD, top_k
+from mcdm.saw import saw_chunk, saw_column_params
+from mcdm.stats import DEFAULT_CHUNK_SIZE, column_stats, iter_chunks
+from mcdm.topsis import topsis_chunk, topsis_column_params
+from mcdm.wp import wp_exponents, wp_finalize, wp_log_chunk
+
+OPERATORS = ("<", "<=", ">", ">=", "==", "!=", "between")
+
+# Which column statistics a filtered ranking is normalised against: those of
+# the whole matrix ("global", so scores equal the unfiltered ones) or those of
+# the selected rows only ("subset", as if the rest had never been loaded). WP
+# has no normalisation constants, so both give the same ranking.
+NORMALIZATIONS = ("global", "subset")
+
+QueryResult = namedtuple("QueryResult", ["rows", "scores", "ranks", "n_selected"])
+
+_KERNELS = {
+    "ahp": (ratio_chunk, ratio_column_params),
+    "saw": (saw_chunk, saw_column_params),
+    "topsis": (topsis_chunk, topsis_column_params),
+}
+
+
+class DecisionIndex:
+    # Built once per loaded decision matrix and queried many times. Every
+    # criterion is sorted once, so a range condition is two binary searches and
+    # a scatter into a boolean row mask; masks combine with &, | and ~. Column
+    # statistics are computed once, and full-matrix scores per method on first
+    # use, so globally normalised queries only gather and rank the selected rows.
+
+    def __init__(self, matrix, weights, is_benefit_criteria, criteria=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        # float32 matrices (Float32 mode uploads) are indexed as they are and
+        # scored a block at a time in float64
+        matrix = np.asarray(matrix)
+        self.matrix = np.ascontiguousarray(matrix, dtype=matrix.dtype if matrix.dtype == np.float32 else np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+        n_criteria = self.matrix.shape[1]
+        self.criteria = [f"C{j+1}" for j in range(n_criteria)] if criteria is None else [str(c) for c in criteria]
+        self.chunk_size = chunk_size
+
+        with stage("index.build"):
+            # order[j] lists the rows by ascending value of criterion j. Sorted one
+            # criterion at a time, so only one column's int64 argsort is alive at
+            # once, and stored as int32 whenever the row count allows.
+            n_rows = self.matrix.shape[0]
+            index_dtype = np.int32 if n_rows <= np.iinfo(np.int32).max else np.intp
+            self.order = np.empty((n_criteria, n_rows), dtype=index_dtype)
+            self.sorted_values = np.empty((n_criteria, n_rows), dtype=self.matrix.dtype)
+            for j in range(n_criteria):
+                self.order[j] = np.argsort(self.matrix[:, j], kind="stable")
+                self.sorted_values[j] = self.matrix[self.order[j], j]
+            self.stats = column_stats(self.matrix, chunk_size, reciprocal=True)
+        self._scores = {}
+        self._columns = {name: j for j, name in enumerate(self.criteria)}
+
+    @property
+    def n_alternatives(self):
+        return self.matrix.shape[0]
+
+    @property
+    def nbytes(self):
+        # Grows as scores are computed per method
+        return self.matrix.nbytes + self.order.nbytes + self.sorted_values.nbytes + sum(s.nbytes for s in self._scores.values())
+
+    def column(self, criterion):
+        if isinstance(criterion, (int, np.integer)):
+            return int(criterion)
+        try:
+            return self._columns[criterion]
+        except KeyError:
+            raise KeyError(f"Unknown criterion {criterion!r}") from None
+
+    def where(self, criterion, op, value):
+        # Boolean mask of the rows whose criterion satisfies `op value`; for
+        # "between", value is an inclusive (low, high) pair
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator {op!r}, expected one of {OPERATORS}")
+        j = self.column(criterion)
+        values, order = self.sorted_values[j], self.order[j]
+        if op == "between":
+            low, high = value
+            start, stop = np.searchsorted(values, low, "left"), np.searchsorted(values, high, "right")
+        else:
+            left, right = np.searchsorted(values, value, "left"), np.searchsorted(values, value, "right")
+            start, stop = {
+                "<": (0, left),
+                "<=": (0, right),
+                ">": (right, len(values)),
+                ">=": (left, len(values)),
+                "==": (left, right),
+                "!=": (left, right),
+            }[op]
+        mask = np.zeros(len(values), dtype=bool)
+        mask[order[start:stop]] = True
+        return ~mask if op == "!=" else mask
+
+    def select(self, conditions):
+        # All of [(criterion, op, value), ...]; None when there are no conditions
+        mask = None
+        for criterion, op, value in conditions:
+            condition = self.where(criterion, op, value)
+            mask = condition if mask is None else mask & condition
+        return mask
+
+    def _score(self, method, matrix, stats):
+        if method == "wp":
+            exponents = wp_exponents(self.weights, self.is_benefit)
+            log_finite = np.empty(matrix.shape[0])
+            zero_order = np.empty(matrix.shape[0])
+            for start, stop in iter_chunks(matrix.shape[0], self.chunk_size):
+                log_finite[start:stop], zero_order[start:stop] = wp_log_chunk(matrix[start:stop].astype(np.float64, copy=False), exponents)
+            return wp_finalize(log_finite, zero_order, with_ranks=False).log_S
+        kernel, column_params = _KERNELS[method]
+        params = column_params(stats, self.weights, self.is_benefit)
+        scores = np.empty(matrix.shape[0])
+        for start, stop in iter_chunks(matrix.shape[0], self.chunk_size):
+            scores[start:stop] = kernel(matrix[start:stop].astype(np.float64, copy=False), params)
+        return scores
+
+    def scores(self, method):
+        # Scores of every alternative against the whole matrix, cached per method
+        if method not in RANK_METHOD:
+            raise ValueError(f"Unknown method {method!r}, expected one of {tuple(RANK_METHOD)}")
+        if method not in self._scores:
+            with stage("index.scores"):
+                self._scores[method] = self._score(method, self.matrix, self.stats)
+                self._scores[method].setflags(write=False)
+        return self._scores[method]
+
+    def rank(self, method, mask=None, normalization="global", k=None):
+        # Best k of the selected rows (all of them when mask is None), best first.
+        # rows are indices into the full matrix; ranks count within the selection.
+        if normalization not in NORMALIZATIONS:
+            raise ValueError(f"Unknown normalization {normalization!r}, expected one of {NORMALIZATIONS}")
+        rows = np.arange(self.n_alternatives) if mask is None else np.flatnonzero(mask)
+        if normalization == "global" or method == "wp":
+            scores = self.scores(method)[rows]
+        else:
+            with stage("index.subset_scores"):
+                subset = self.matrix[rows]
+                scores = self._score(method, subset, column_stats(subset, self.chunk_size, reciprocal=method == "ahp")) if len(rows) else np.empty(0)
+        with stage("index.rank"):
+            order, ranks = top_k(scores, len(rows) if k is None else k, method=RANK_METHOD[method])
+        return QueryResult(rows[order], scores[order], ranks, len(rows))
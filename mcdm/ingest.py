@@ -0,0 +1,202 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from mcdm.stats import DEFAULT_CHUNK_SIZE
+
+DecisionMatrix = namedtuple("DecisionMatrix", ["alternatives", "criteria", "matrix", "is_benefit", "weights"])
+
+# Header cells may carry criterion metadata as "Name|Benefit|0.3" or "Name|Cost"
+HEADER_SEPARATOR = "|"
+CRITERIA_TYPES = ("Benefit", "Cost")
+
+
+def _source_name(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return getattr(source, "name", "")
+
+
+def detect_format(source):
+    name = _source_name(source).lower()
+    if name.endswith((".parquet", ".pq")):
+        return "parquet"
+    return "csv"
+
+
+def _parse_type(value):
+    for crit_type in CRITERIA_TYPES:
+        if str(value).strip().lower() == crit_type.lower():
+            return crit_type
+    raise ValueError(f"Criteria type must be one of {CRITERIA_TYPES}, got {value!r}")
+
+
+def parse_header(columns):
+    # Split annotated header cells into names, types and weights (None when absent)
+    names, types, weights = [], [], []
+    for column in columns:
+        parts = [part.strip() for part in str(column).split(HEADER_SEPARATOR)]
+        names.append(parts[0])
+        types.append(_parse_type(parts[1]) if len(parts) > 1 and parts[1] else None)
+        weights.append(float(parts[2]) if len(parts) > 2 and parts[2] else None)
+    return names, types, weights
+
+
+def read_sidecar(source):
+    # JSON sidecar: {"criteria": [{"name": "Price", "type": "Cost", "weight": 0.3}, ...]}
+    if isinstance(source, (str, os.PathLike)):
+        with open(source) as f:
+            spec = json.load(f)
+    else:
+        spec = json.load(source)
+    return {
+        entry["name"]: (
+            _parse_type(entry["type"]) if "type" in entry else None,
+            float(entry["weight"]) if "weight" in entry else None,
+        )
+        for entry in spec["criteria"]
+    }
+
+
+def _criteria_metadata(columns, sidecar):
+    names, types, weights = parse_header(columns)
+    if sidecar is not None:
+        spec = read_sidecar(sidecar)
+        for i, name in enumerate(names):
+            sidecar_type, sidecar_weight = spec.get(name, (None, None))
+            types[i] = sidecar_type or types[i]
+            weights[i] = sidecar_weight if sidecar_weight is not None else weights[i]
+
+    is_benefit = np.array([t != "Cost" for t in types], dtype=bool)
+    if all(w is None for w in weights):
+        # Equal weights when nothing is specified
+        weight_vector = np.full(len(names), 1.0 / len(names))
+    else:
+        weight_vector = np.array([0.0 if w is None else w for w in weights])
+    return names, is_benefit, weight_vector
+
+
+def _count_lines(source):
+    # Upper bound on data rows used to preallocate the matrix; quoted newlines
+    # and blank lines only make it larger than the real row count
+    if isinstance(source, (str, os.PathLike)):
+        f = open(source, "rb")
+    elif hasattr(source, "seek"):
+        f = source
+    else:
+        return None
+    lines = 0
+    try:
+        block = f.read(1 << 20)
+        # Text-mode streams such as io.StringIO read str rather than bytes
+        newline = "\n" if isinstance(block, str) else b"\n"
+        last = newline
+        while block:
+            lines += block.count(newline)
+            last = block[-1:]
+            block = f.read(1 << 20)
+    finally:
+        if f is source:
+            f.seek(0)
+        else:
+            f.close()
+    return lines + (last != newline)
+
+
+def _read_csv(source, name_column, chunk_size, dtype):
+    # pandas is imported on first use, like pyarrow below, so importing mcdm
+    # stays cheap for callers that never read a CSV
+    import pandas as pd
+
+    header = pd.read_csv(source, nrows=0).columns
+    if hasattr(source, "seek"):
+        source.seek(0)
+    criteria_columns = [c for i, c in enumerate(header) if i != name_column]
+
+    capacity = _count_lines(source)
+    matrix = np.empty((max(capacity - 1, 0), len(criteria_columns)), dtype=dtype) if capacity is not None else None
+    names = []
+    blocks = []
+    n_rows = 0
+    reader = pd.read_csv(
+        source,
+        chunksize=chunk_size,
+        dtype={c: np.float64 for c in criteria_columns},
+    )
+    for chunk in reader:
+        values = chunk[criteria_columns].to_numpy(dtype=dtype)
+        if matrix is not None:
+            matrix[n_rows:n_rows + len(values)] = values
+        else:
+            blocks.append(values)
+        if name_column is not None:
+            names.append(chunk.iloc[:, name_column].to_numpy(dtype=str))
+        n_rows += len(values)
+
+    if matrix is None:
+        matrix = np.concatenate(blocks) if blocks else np.empty((0, len(criteria_columns)), dtype=dtype)
+    return header, criteria_columns, matrix[:n_rows], names
+
+
+def _read_parquet(source, name_column, chunk_size, dtype):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading Parquet files requires pyarrow, install it with 'pip install pyarrow'") from e
+
+    parquet_file = pq.ParquetFile(source)
+    header = parquet_file.schema_arrow.names
+    criteria_columns = [c for i, c in enumerate(header) if i != name_column]
+
+    matrix = np.empty((parquet_file.metadata.num_rows, len(criteria_columns)), dtype=dtype)
+    names = []
+    n_rows = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        stop = n_rows + batch.num_rows
+        for j, column in enumerate(criteria_columns):
+            matrix[n_rows:stop, j] = batch.column(column).to_numpy(zero_copy_only=False)
+        if name_column is not None:
+            names.append(batch.column(header[name_column]).to_numpy(zero_copy_only=False).astype(str))
+        n_rows = stop
+    return header, criteria_columns, matrix, names
+
+
+def load_decision_matrix(source, sidecar=None, name_column=0, chunk_size=DEFAULT_CHUNK_SIZE, file_format=None, dtype=np.float64):
+    # Stream an alternatives x criteria table into one contiguous float64 matrix
+    # (float32 with dtype=np.float32, for mcdm.precision). name_column holds
+    # alternative names; pass None when every column is a criterion.
+    file_format = file_format or detect_format(source)
+    if file_format == "parquet":
+        header, criteria_columns, matrix, names = _read_parquet(source, name_column, chunk_size, dtype)
+    elif file_format == "csv":
+        header, criteria_columns, matrix, names = _read_csv(source, name_column, chunk_size, dtype)
+    else:
+        raise ValueError(f"Unsupported file format {file_format!r}, expected 'csv' or 'parquet'")
+
+    criteria, is_benefit, weights = _criteria_metadata(criteria_columns, sidecar)
+    if names:
+        alternatives = np.concatenate(names)
+    else:
+        alternatives = np.char.add("Alternative ", np.arange(1, matrix.shape[0] + 1).astype(str))
+    return DecisionMatrix(alternatives, criteria, matrix, is_benefit, weights)
+
+
+def load_comparison_matrix(source):
+    # Square pairwise-comparison matrix as (labels, matrix). CSV files carry the
+    # item labels in the header row and first column; .npy files hold a bare
+    # (n, n) array, or a (k, n, n) stack, and get no labels. Blank cells load
+    # as NaN, which mcdm.ahp.complete_judgments treats as missing comparisons.
+    if _source_name(source).lower().endswith(".npy"):
+        matrix = np.load(source, allow_pickle=False).astype(np.float64)
+        labels = None
+    else:
+        import pandas as pd
+
+        table = pd.read_csv(source, index_col=0)
+        matrix = table.to_numpy(dtype=np.float64)
+        labels = [str(label).strip() for label in table.columns]
+    if matrix.ndim not in (2, 3) or matrix.shape[-1] != matrix.shape[-2]:
+        raise ValueError(f"Comparison matrix must be square, got shape {matrix.shape}")
+    return labels, matrix
@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+from contextvars import ContextVar
+
+# Opt-in per-stage timing. Code marks its hot paths with
+#
+#     with stage("topsis.normalize"):
+#         ...
+#
+# which is a shared no-op unless a Profiler was enabled for the current context
+# (each Streamlit session runs in its own thread, so profiles never mix).
+
+StageRecord = namedtuple("StageRecord", ["name", "seconds", "allocated_bytes", "peak_bytes"])
+StageSummary = namedtuple("StageSummary", ["name", "calls", "seconds", "allocated_bytes", "peak_bytes"])
+
+_active = ContextVar("mcdm_profiler", default=None)
+
+# tracemalloc is process-wide, so profilers that trace memory share it: the
+# first one to start turns it on (unless something else already had), and it
+# is turned off again only when the last of them stops
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+def _acquire_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if not _tracing_users:
+            _tracing_owned = not tracemalloc.is_tracing()
+            if _tracing_owned:
+                tracemalloc.start()
+        _tracing_users += 1
+
+
+def _release_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if not _tracing_users and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "started", "start_bytes", "peak")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler._stack
+        if self.profiler.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak below would lose the enclosing stage's peak so far
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.start_bytes = self.peak = current
+        stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.started
+        stack = self.profiler._stack
+        stack.pop()
+        allocated = peak = 0
+        if self.profiler.trace_memory:
+            current, traced_peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, traced_peak)
+            allocated = max(current - self.start_bytes, 0)
+            peak = self.peak - self.start_bytes
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+        self.profiler.records.append(StageRecord(self.name, seconds, allocated, peak))
+        return False
+
+
+class Profiler:
+    # Records one StageRecord per stage exit: wall time, bytes still allocated
+    # at exit and peak bytes above the level at entry. Memory numbers come from
+    # tracemalloc, which is process-wide, so they also count allocations made by
+    # other threads while the stage runs.
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.records = []
+        self._stack = []
+        self._tracing = False
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def start(self):
+        if self.trace_memory and not self._tracing:
+            _acquire_tracing()
+            self._tracing = True
+        return self
+
+    def stop(self):
+        if self._tracing:
+            _release_tracing()
+            self._tracing = False
+
+    def summary(self):
+        # Totals per stage name, in first-seen order
+        totals = {}
+        for record in self.records:
+            calls, seconds, allocated, peak = totals.get(record.name, (0, 0.0, 0, 0))
+            totals[record.name] = (
+                calls + 1,
+                seconds + record.seconds,
+                allocated + record.allocated_bytes,
+                max(peak, record.peak_bytes),
+            )
+        return [StageSummary(name, *values) for name, values in totals.items()]
+
+    def to_json(self):
+        return json.dumps([record._asdict() for record in self.records])
+
+    def to_prometheus(self, prefix="mcdm_stage"):
+        summary = self.summary()
+        metrics = (
+            ("calls_total", "counter", "Times each stage ran", "calls"),
+            ("seconds_total", "counter", "Wall time spent in each stage", "seconds"),
+            ("allocated_bytes_total", "counter", "Bytes left allocated by each stage", "allocated_bytes"),
+            ("peak_bytes", "gauge", "Largest peak allocation of each stage", "peak_bytes"),
+        )
+        lines = []
+        for suffix, kind, help_text, field in metrics:
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for entry in summary:
+                lines.append(f'{name}{{stage="{entry.name}"}} {getattr(entry, field)}')
+        return "\n".join(lines) + "\n"
+
+
+def stage(name):
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name)
+
+
+def enable(trace_memory=True):
+    # Start a fresh profile for the current context and return it
+    disable()
+    profiler = Profiler(trace_memory).start()
+    _active.set(profiler)
+    return profiler
+
+
+def disable():
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.stop()
+        _active.set(None)
+    return profiler
+
+
+def active_profiler():
+    return _active.get()
@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from mcdm.saw import saw_chunk, saw_column_params
+from mcdm.stats import DEFAULT_CHUNK_SIZE, chunk_stats, iter_chunks, merge_stats
+from mcdm.topsis import topsis_chunk, topsis_column_params
+from mcdm.wp import wp_exponents, wp_finalize, wp_log_chunk
+
+# Background execution for heavy calculations. An asyncio loop on its own thread
+# schedules jobs and a bounded process pool runs them, so a long run holds a
+# worker process instead of a Streamlit script thread. Scoring jobs are split
+# into blocks of rows; each job keeps at most one block per worker in flight, so
+# blocks of concurrent jobs interleave on the pool instead of queueing behind
+# one another, progress advances per block and cancellation stops between them.
+
+SCORE_METHODS = ("saw", "topsis", "wp")
+
+# Jobs one user may run at once; further submissions wait their turn
+DEFAULT_USER_LIMIT = 2
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+def _on_rows(kernel, shm_name, shape, start, stop, *args):
+    # Runs in a worker: apply kernel to rows start:stop of a shared matrix
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # The view must not outlive this call or the segment cannot be closed
+        return kernel(np.ndarray(shape, dtype=np.float64, buffer=shm.buf)[start:stop], *args)
+    finally:
+        shm.close()
+
+
+class Job:
+    # Handle returned by JobQueue.submit*. Status and progress are updated by the
+    # queue's loop thread and can be read from any thread.
+
+    _ids = itertools.count(1)
+
+    def __init__(self, user, description):
+        self.id = next(self._ids)
+        self.user = user
+        self.description = description
+        self.status = QUEUED
+        self.completed = 0
+        self.total = 0
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._future = None
+
+    @property
+    def progress(self):
+        return self.completed / self.total if self.total else 0.0
+
+    def done(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def cancel(self):
+        # Queued jobs never start; running jobs stop after their current blocks
+        return self._future.cancel()
+
+    def result(self, timeout=None):
+        return self._future.result(timeout)
+
+    def _finish(self, future):
+        self.finished_at = time.time()
+        if future.cancelled():
+            self.status = CANCELLED
+        elif future.exception() is not None:
+            self.error = future.exception()
+            self.status = FAILED
+        else:
+            self.status = DONE
+
+
+class JobQueue:
+    # The loop thread and the worker processes start with the first submission
+
+    def __init__(self, max_workers=None, user_limit=DEFAULT_USER_LIMIT):
+        self.max_workers = max_workers or os.cpu_count()
+        self.user_limit = user_limit
+        self._loop = None
+        self._pool = None
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._loop is None:
+                self._pool = ProcessPoolExecutor(self.max_workers)
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="mcdm-jobs", daemon=True).start()
+        return self._loop
+
+    def shutdown(self):
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._pool.shutdown(cancel_futures=True)
+            self._loop = self._pool = None
+
+    def _submit(self, user, description, plan, *args):
+        job = Job(user, description)
+        job._future = asyncio.run_coroutine_threadsafe(self._execute(job, plan, args), self._start())
+        job._future.add_done_callback(job._finish)
+        return job
+
+    async def _execute(self, job, plan, args):
+        # Per-user semaphores live only while that user has jobs
+        slot = self._users.setdefault(job.user, [asyncio.Semaphore(self.user_limit), 0])
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                job.status = RUNNING
+                job.started_at = time.time()
+                return await plan(job, *args)
+        finally:
+            slot[1] -= 1
+            if not slot[1]:
+                del self._users[job.user]
+
+    async def _map(self, job, fn, calls):
+        # fn(*args) for every args in calls on the pool, at most max_workers at a
+        # time; the caller sets job.total
+        loop = asyncio.get_running_loop()
+        calls = list(calls)
+        results = [None] * len(calls)
+        remaining = iter(enumerate(calls))
+        pending = {}
+
+        def schedule(count):
+            for index, args in itertools.islice(remaining, count):
+                pending[loop.run_in_executor(self._pool, fn, *args)] = index
+
+        try:
+            schedule(self.max_workers)
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+                    job.completed += 1
+                schedule(len(done))
+        finally:
+            for future in pending:
+                future.cancel()
+        return results
+
+    def submit(self, user, fn, *args, description=None):
+        # Run fn(*args) in a worker process; fn must be importable by the workers
+        return self._submit(user, description or fn.__qualname__, self._call, fn, args)
+
+    async def _call(self, job, fn, args):
+        job.total = 1
+        (value,) = await self._map(job, fn, [args])
+        return value
+
+    def submit_scores(self, user, method, matrix, weights, is_benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE):
+        # Same results as saw_scores, topsis_closeness and
+        # weight_product_log(..., with_ranks=False)
+        if method not in SCORE_METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {SCORE_METHODS}")
+        matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+        return self._submit(user, f"{method.upper()} scores", self._score, method, matrix, weights, is_benefit, chunk_size)
+
+    async def _score(self, job, method, matrix, weights, is_benefit, chunk_size):
+        chunks = list(iter_chunks(matrix.shape[0], chunk_size))
+        # Both passes are counted up front so progress does not jump back
+        job.total = len(chunks) if method == "wp" else 2 * len(chunks)
+
+        # Workers map the matrix from shared memory instead of pickling every block
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        try:
+            np.ndarray(matrix.shape, dtype=np.float64, buffer=shm.buf)[:] = matrix
+
+            def blocks(*args):
+                return [(shm.name, matrix.shape, start, stop, *args) for start, stop in chunks]
+
+            if method == "wp":
+                parts = await self._map(job, _on_rows, [(wp_log_chunk, *block) for block in blocks(wp_exponents(weights, is_benefit))])
+                log_finite, zero_order = (np.concatenate(part) for part in zip(*parts))
+                return wp_finalize(log_finite, zero_order, with_ranks=False)
+
+            stats = reduce(merge_stats, await self._map(job, _on_rows, [(chunk_stats, *block) for block in blocks()]))
+            column_params, kernel = (saw_column_params, saw_chunk) if method == "saw" else (topsis_column_params, topsis_chunk)
+            params = column_params(stats, weights, is_benefit)
+            return np.concatenate(await self._map(job, _on_rows, [(kernel, *block) for block in blocks(params)]))
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+
+def default_queue():
+    # One queue per server process, shared by every session
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue()
+        return _default_queue
@@ -0,0 +1,88 @@
+from collections import namedtuple
+
+import numpy as np
+
+from mcdm.ahp import ratio_chunk, ratio_column_params
+from mcdm.instrument import stage
+from mcdm.ranking import rank_average, rank_min
+from mcdm.saw import saw_chunk, saw_column_params
+from mcdm.stats import DEFAULT_CHUNK_SIZE, column_stats, iter_chunks
+from mcdm.topsis import topsis_chunk, topsis_column_params
+from mcdm.wp import wp_exponents, wp_finalize, wp_log_chunk
+
+METHODS = ("ahp", "saw", "topsis", "wp")
+
+ComparisonResult = namedtuple(
+    "ComparisonResult",
+    ["methods", "scores", "ranks", "consensus_scores", "consensus_ranks", "agreement"],
+)
+
+
+def _spearman(ranks_a, ranks_b):
+    a = ranks_a - ranks_a.mean()
+    b = ranks_b - ranks_b.mean()
+    denominator = np.sqrt((a * a).sum() * (b * b).sum())
+    return (a @ b) / denominator if denominator else 1.0
+
+
+def compare_methods(matrix, weights, is_benefit_criteria, methods=METHODS, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Run several methods over one decision matrix in two shared passes: one for
+    # the column statistics every method needs, one that scores each block of
+    # rows with all methods while it is still in cache.
+    #
+    # AHP scores the matrix as ratio-scale data (see mcdm.ahp.ratio_column_params).
+    # WP scores are log S. Ranks keep each method's tie semantics: min for AHP and
+    # TOPSIS, average for SAW and WP. The consensus is a Borda count over the
+    # selected methods, and agreement holds pairwise Spearman rank correlations.
+    unknown = set(methods) - set(METHODS)
+    if unknown:
+        raise ValueError(f"Unknown methods {sorted(unknown)}, expected a subset of {METHODS}")
+    matrix = np.asarray(matrix, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+    n_alternatives = matrix.shape[0]
+
+    with stage("compare.stats"):
+        stats = column_stats(matrix, chunk_size, reciprocal="ahp" in methods)
+    kernels = {}
+    if "ahp" in methods:
+        kernels["ahp"] = (ratio_chunk, ratio_column_params(stats, weights, is_benefit))
+    if "saw" in methods:
+        kernels["saw"] = (saw_chunk, saw_column_params(stats, weights, is_benefit))
+    if "topsis" in methods:
+        kernels["topsis"] = (topsis_chunk, topsis_column_params(stats, weights, is_benefit))
+
+    scores = {method: np.empty(n_alternatives) for method in kernels}
+    if "wp" in methods:
+        exponents = wp_exponents(weights, is_benefit)
+        log_finite = np.empty(n_alternatives)
+        zero_order = np.empty(n_alternatives)
+
+    with stage("compare.score"):
+        for start, stop in iter_chunks(n_alternatives, chunk_size):
+            chunk = matrix[start:stop]
+            for method, (kernel, params) in kernels.items():
+                scores[method][start:stop] = kernel(chunk, params)
+            if "wp" in methods:
+                log_finite[start:stop], zero_order[start:stop] = wp_log_chunk(chunk, exponents)
+
+    ranks = {}
+    with stage("compare.rank"):
+        for method in kernels:
+            ranks[method] = rank_min(scores[method]) if method in ("ahp", "topsis") else rank_average(scores[method])
+    if "wp" in methods:
+        wp_result = wp_finalize(log_finite, zero_order)
+        scores["wp"], ranks["wp"] = wp_result.log_S, wp_result.ranks
+
+    methods = tuple(method for method in METHODS if method in methods)
+    with stage("compare.consensus"):
+        consensus_scores = sum(n_alternatives - ranks[method] for method in methods)
+        agreement = np.array([[_spearman(ranks[a], ranks[b]) for b in methods] for a in methods])
+    return ComparisonResult(
+        methods,
+        scores,
+        ranks,
+        consensus_scores,
+        rank_min(consensus_scores),
+        agreement,
+    )
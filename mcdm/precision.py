@@ -0,0 +1,172 @@
+from collections import namedtuple
+
+import numpy as np
+
+from mcdm.instrument import stage
+from mcdm.ranking import rank_average, rank_average_lexicographic, rank_min
+from mcdm.saw import saw_chunk, saw_column_params
+from mcdm.stats import DEFAULT_CHUNK_SIZE, column_stats, iter_chunks
+from mcdm.topsis import calculate_distance, topsis_chunk, topsis_column_params
+from mcdm.wp import wp_exponents, wp_log_chunk
+
+# Reduced-precision scoring of a matrix stored as float32, e.g. from
+# load_decision_matrix(..., dtype=np.float32), which halves its memory and the
+# traffic of the per-cell pass. Column statistics are accumulated in float64.
+#
+# Every float32 score comes with a bound on its rounding error. Scores whose
+# error intervals overlap a neighbour's could be ordered differently in float64,
+# so only those near ties are rescored in float64 and the rest keep their
+# float32 value: the final ranking is the one float64 gives for the stored
+# values. Values were rounded to float32 when the matrix was stored, so that
+# is not necessarily the ranking of the original data. A float64 matrix is
+# accepted too but converted block by block, which saves nothing.
+
+REDUCED_METHODS = ("saw", "topsis", "wp")
+
+ReducedPrecisionResult = namedtuple("ReducedPrecisionResult", ["scores", "ranks", "n_rescored"])
+
+# Safety factor on the rounding-error bounds below
+ERROR_MARGIN = 2
+
+_EPS = np.finfo(np.float32).eps
+
+
+def _saw_chunk32(chunk, params):
+    reference, weights, is_benefit = params
+    ratios = np.where(is_benefit, chunk / reference, reference / chunk)
+    # Each term carries the conversion, division and product roundings, and the
+    # dot product one rounding per criterion
+    bound = (len(weights) + 4) * _EPS * (np.abs(ratios) @ np.abs(weights))
+    return ratios @ weights, bound
+
+
+def _topsis_chunk32(chunk, params):
+    scale, ideal_positive, ideal_negative, magnitude = params
+    weighted = chunk * scale
+    distance_to_positive = calculate_distance(weighted, ideal_positive)
+    distance_to_negative = calculate_distance(weighted, ideal_negative)
+    total = distance_to_positive + distance_to_negative
+
+    # Each weighted value and ideal is off by a few ulps of its column's
+    # magnitude, so by Cauchy-Schwarz a squared distance d**2 is off by at most
+    # 6 eps |magnitude| d, plus one rounding per criterion in the sum; halving
+    # that through the square root leaves a bound that is finite at d = 0
+    def distance_error(distance):
+        return _EPS * (6 * magnitude + (len(scale) + 2) * distance)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        closeness = distance_to_negative / total
+        bound = (
+            distance_to_positive * distance_error(distance_to_negative)
+            + distance_to_negative * distance_error(distance_to_positive)
+        ) / total**2 + 3 * _EPS
+    return closeness, bound
+
+
+def _wp_chunk32(chunk, exponents):
+    # Rows with a zero cell are ranked by their zero order first, so they are
+    # always rescored (an infinite bound)
+    has_zero = (chunk == 0).any(axis=1)
+    logs = np.log(np.where(has_zero[:, np.newaxis] & (chunk == 0), 1, chunk))
+    bound = _EPS * ((len(exponents) + 2) * (np.abs(logs) @ np.abs(exponents)) + np.abs(exponents).sum())
+    bound[has_zero] = np.inf
+    return logs @ exponents, bound
+
+
+def _params(method, matrix, weights, is_benefit, chunk_size):
+    # float32 kernel and parameters, float64 kernel and parameters
+    if method == "wp":
+        exponents = wp_exponents(weights, is_benefit)
+        return _wp_chunk32, exponents.astype(np.float32), wp_log_chunk, exponents
+
+    stats = column_stats(matrix, chunk_size)
+    if method == "saw":
+        reference, weights, is_benefit = params = saw_column_params(stats, weights, is_benefit)
+        return _saw_chunk32, (reference.astype(np.float32), weights.astype(np.float32), is_benefit), saw_chunk, params
+
+    scale, ideal_positive, ideal_negative = params = topsis_column_params(stats, weights, is_benefit)
+    # Length of the largest weighted value of every column, for the error bound
+    magnitude = np.linalg.norm(scale * np.maximum(np.abs(stats.col_max), np.abs(stats.col_min)))
+    params32 = tuple(p.astype(np.float32) for p in params) + (np.float32(magnitude),)
+    return _topsis_chunk32, params32, topsis_chunk, params
+
+
+def _near_ties(keys, bounds):
+    # Rows whose error interval overlaps a neighbour's in score order. Rows with
+    # an infinite or undefined key or bound are always included.
+    uncertain = ~(np.isfinite(keys) & np.isfinite(bounds))
+    rows = np.flatnonzero(~uncertain)
+    # Sorting the float32 keys is the bulk of the check; ties may come in any order
+    order = rows[np.argsort(keys[rows].astype(np.float32))]
+    overlap = np.diff(keys[order]) <= bounds[order[1:]] + bounds[order[:-1]]
+    uncertain[order[1:][overlap]] = True
+    uncertain[order[:-1][overlap]] = True
+    return uncertain
+
+
+def _inside_intervals(keys, bounds, kept, values):
+    # Rows of kept whose error interval contains one of values. The intervals
+    # of kept rows never overlap, so each value falls in at most one.
+    inside = np.zeros(len(keys), dtype=bool)
+    rows = np.flatnonzero(kept)
+    if not len(rows):
+        return inside
+    order = rows[np.argsort(keys[rows], kind="stable")]
+    low, high = keys[order] - bounds[order], keys[order] + bounds[order]
+    values = values[np.isfinite(values)]
+    at = np.searchsorted(low, values, "right") - 1
+    hit = (at >= 0) & (values <= high[np.maximum(at, 0)])
+    inside[order[at[hit]]] = True
+    return inside
+
+
+def reduced_precision_scores(method, matrix, weights, is_benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Scores and ranks equal to saw_scores, topsis_scores and weight_product_log
+    # on the same matrix (log S for WP), normally float32.
+    if method not in REDUCED_METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {REDUCED_METHODS}")
+    matrix = np.asarray(matrix)
+    if matrix.dtype != np.float32:
+        matrix = np.asarray(matrix, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+    n_rows = matrix.shape[0]
+
+    with stage("precision.stats"):
+        kernel32, params32, kernel64, params64 = _params(method, matrix, weights, is_benefit, chunk_size)
+
+    keys = np.empty(n_rows, dtype=np.float32)
+    bounds = np.empty(n_rows, dtype=np.float32)
+    with stage("precision.scores"):
+        for start, stop in iter_chunks(n_rows, chunk_size):
+            keys[start:stop], bounds[start:stop] = kernel32(matrix[start:stop].astype(np.float32, copy=False), params32)
+    keys = keys.astype(np.float64)
+    bounds = ERROR_MARGIN * bounds.astype(np.float64)
+
+    scores = keys.copy()
+    if method == "wp":
+        zero_order = np.zeros(n_rows)
+        log_finite = keys.copy()
+    with stage("precision.rescore"):
+        # A float64 score can land inside the interval of a row kept at float32,
+        # so that row is rescored as well, until no kept interval is hit
+        rescore = _near_ties(keys, bounds)
+        rescored = np.zeros(n_rows, dtype=bool)
+        while rescore.any():
+            rows = np.flatnonzero(rescore)
+            for start, stop in iter_chunks(len(rows), chunk_size):
+                block = rows[start:stop]
+                exact = kernel64(matrix[block].astype(np.float64), params64)
+                if method == "wp":
+                    log_finite[block], zero_order[block] = exact
+                    exact = np.where(zero_order[block] != 0, np.copysign(np.inf, zero_order[block]), log_finite[block])
+                scores[block] = exact
+            rescored |= rescore
+            rescore = _inside_intervals(keys, bounds, ~rescored, scores[rescore])
+
+    with stage("precision.rank"):
+        if method == "wp":
+            ranks = rank_average_lexicographic(zero_order, log_finite)
+        else:
+            ranks = rank_average(scores) if method == "saw" else rank_min(scores)
+    return ReducedPrecisionResult(scores, ranks, int(rescored.sum()))
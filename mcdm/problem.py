@@ -0,0 +1,94 @@
+import sys
+
+import numpy as np
+
+
+def _names(names):
+    # Object array of interned strings, so repeated names share one object
+    array = np.empty(len(names), dtype=object)
+    array[:] = [sys.intern(str(name)) for name in names]
+    return array
+
+
+class DecisionProblem:
+    # One decision problem held as flat arrays: a C-contiguous float64 score
+    # matrix (alternatives x criteria), a weight vector, a bit-packed benefit
+    # mask and interned name arrays. matrix and weights are handed to the
+    # engines as they are, and to_frame() wraps them without copying, so pages
+    # keep a single copy of their inputs in session state.
+    __slots__ = ("alternatives", "criteria", "matrix", "weights", "_benefit_bits")
+
+    def __init__(self, alternatives, criteria, matrix=None, weights=None, is_benefit=None, fill=0.0):
+        n, m = len(alternatives), len(criteria)
+        self.alternatives = _names(alternatives)
+        self.criteria = _names(criteria)
+        if matrix is None:
+            self.matrix = np.full((n, m), fill, dtype=np.float64)
+        else:
+            self.matrix = np.ascontiguousarray(matrix, dtype=np.float64).reshape(n, m)
+        self.weights = np.zeros(m) if weights is None else np.array(weights, dtype=np.float64)
+        self._benefit_bits = np.packbits(np.ones(m, dtype=bool) if is_benefit is None else np.asarray(is_benefit, dtype=bool))
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @property
+    def is_benefit(self):
+        return np.unpackbits(self._benefit_bits, count=len(self.criteria)).astype(bool)
+
+    @is_benefit.setter
+    def is_benefit(self, flags):
+        self._benefit_bits = np.packbits(np.asarray(flags, dtype=bool))
+
+    def set_benefit(self, j, benefit):
+        byte, bit = divmod(j, 8)
+        mask = np.uint8(0x80 >> bit)
+        if benefit:
+            self._benefit_bits[byte] |= mask
+        else:
+            self._benefit_bits[byte] &= ~mask
+
+    def set_alternative(self, i, name):
+        self.alternatives[i] = sys.intern(str(name))
+
+    def set_criterion(self, j, name):
+        self.criteria[j] = sys.intern(str(name))
+
+    def resize(self, n_alternatives, n_criteria, fill=0.0, weight=0.0, benefit=True,
+               alternative_name="Alternative {}", criterion_name="Criteria {}"):
+        # Keep the overlapping block; new rows/columns get the defaults and
+        # names formatted with their 1-based position
+        n, m = self.matrix.shape
+        if (n, m) == (n_alternatives, n_criteria):
+            return self
+        keep_n, keep_m = min(n, n_alternatives), min(m, n_criteria)
+
+        matrix = np.full((n_alternatives, n_criteria), fill, dtype=np.float64)
+        matrix[:keep_n, :keep_m] = self.matrix[:keep_n, :keep_m]
+        weights = np.full(n_criteria, weight, dtype=np.float64)
+        weights[:keep_m] = self.weights[:keep_m]
+        is_benefit = np.full(n_criteria, benefit, dtype=bool)
+        is_benefit[:keep_m] = self.is_benefit[:keep_m]
+
+        alternatives = list(self.alternatives[:keep_n]) + [alternative_name.format(i + 1) for i in range(keep_n, n_alternatives)]
+        criteria = list(self.criteria[:keep_m]) + [criterion_name.format(j + 1) for j in range(keep_m, n_criteria)]
+        self.alternatives = _names(alternatives)
+        self.criteria = _names(criteria)
+        self.matrix, self.weights, self.is_benefit = matrix, weights, is_benefit
+        return self
+
+    def to_frame(self):
+        # Shares memory with self.matrix
+        import pandas as pd
+
+        return pd.DataFrame(self.matrix, index=pd.Index(self.alternatives), columns=pd.Index(self.criteria), copy=False)
+
+    @property
+    def nbytes(self):
+        return self.matrix.nbytes + self.weights.nbytes + self._benefit_bits.nbytes + self.alternatives.nbytes + self.criteria.nbytes
+
+    @classmethod
+    def from_decision_matrix(cls, decision):
+        # Wrap an mcdm.ingest.DecisionMatrix without copying its scores
+        return cls(decision.alternatives, decision.criteria, decision.matrix, decision.weights, decision.is_benefit)
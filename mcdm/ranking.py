@@ -0,0 +1,215 @@
+import numpy as np
+
+
+def _tie_groups(sorted_keys):
+    # Start and end positions of runs of equal keys in a sorted array
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    ends = np.r_[starts[1:], len(sorted_keys)]
+    return starts, ends
+
+
+def _scatter_ranks(order, group_ranks, starts, ends):
+    ranks = np.empty(len(order), dtype=group_ranks.dtype)
+    ranks[order] = np.repeat(group_ranks, ends - starts)
+    return ranks
+
+
+def _unranked(ranks, values):
+    # NaN scores sort after every real one, so the other ranks are already
+    # right; like pandas, the NaN scores themselves get no rank
+    missing = np.isnan(values)
+    if not missing.any():
+        return ranks
+    ranks = ranks.astype(np.float64)
+    ranks[missing] = np.nan
+    return ranks
+
+
+def rank_min(values, ascending=False):
+    # Same as pandas rank(method='min'): ties share the best rank, 1-based
+    values = np.asarray(values, dtype=np.float64)
+    keys = values if ascending else -values
+    order = np.argsort(keys, kind="stable")
+    starts, ends = _tie_groups(keys[order])
+    return _unranked(_scatter_ranks(order, starts + 1, starts, ends), values)
+
+
+def rank_average(values, ascending=False):
+    # Same as pandas rank(method='average'), the pandas default used by SAW and WP
+    values = np.asarray(values, dtype=np.float64)
+    keys = values if ascending else -values
+    order = np.argsort(keys, kind="stable")
+    starts, ends = _tie_groups(keys[order])
+    return _unranked(_scatter_ranks(order, (starts + ends + 1) / 2, starts, ends), values)
+
+
+RANK_METHODS = ("min", "average")
+
+# Tie semantics per decision method, matching the pages
+RANK_METHOD = {"ahp": "min", "saw": "average", "topsis": "min", "wp": "average"}
+
+
+def _sort_keys(values, ascending):
+    # Keys where smaller is better, for scores that are not NaN
+    values = np.asarray(values, dtype=np.float64)
+    return values if ascending else -values
+
+
+def _with_unranked(indices, ranks, missing, k):
+    # NaN scores come after every real one, as in pandas sort_values, lowest
+    # index first and without a rank. missing holds their indices in order.
+    extra = missing[:max(k - len(indices), 0)]
+    if not len(extra):
+        return indices, ranks
+    return np.concatenate([indices, extra]), np.concatenate([ranks, np.full(len(extra), np.nan)])
+
+
+def _order(keys, indices):
+    # Best first, ties broken by original position
+    return np.lexsort((indices, keys))
+
+
+def _select(keys, indices, k):
+    # Positions of the k best keys; ties on the boundary go to the lowest indices
+    # so the selection does not depend on how the scores were chunked
+    if len(keys) <= k:
+        return np.arange(len(keys))
+    boundary = np.partition(keys, k - 1)[k - 1]
+    better = np.flatnonzero(keys < boundary)
+    tied = np.flatnonzero(keys == boundary)
+    needed = k - len(better)
+    if len(tied) > needed:
+        tied = tied[np.argpartition(indices[tied], needed - 1)[:needed]]
+    return np.concatenate([better, tied])
+
+
+def _ranks_for_selection(selected_keys, boundary_key, equal_at_boundary, method):
+    # Every alternative strictly better than a selected one is itself selected,
+    # so strict counts only need the selection. Ties on the boundary key may
+    # extend past it; equal_at_boundary is their global count.
+    sorted_keys = np.sort(selected_keys)
+    better = np.searchsorted(sorted_keys, selected_keys, side="left")
+    if method == "min":
+        return better + 1
+    equal = np.searchsorted(sorted_keys, selected_keys, side="right") - better
+    equal = np.where(selected_keys == boundary_key, equal_at_boundary, equal)
+    return better + (equal + 1) / 2
+
+
+def top_k(values, k, ascending=False, method="average"):
+    # Best k alternatives in O(n) with argpartition instead of a full sort.
+    # Returns (indices, ranks) ordered best first; ranks match pandas rank(method=...)
+    if method not in RANK_METHODS:
+        raise ValueError(f"Unknown rank method {method!r}, expected one of {RANK_METHODS}")
+    keys = _sort_keys(values, ascending)
+    k = min(k, len(keys))
+    if k == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+    missing = np.isnan(keys)
+    if missing.any():
+        # Ranked without the NaN scores, which are then appended
+        valid = np.flatnonzero(~missing)
+        indices, ranks = top_k(keys[valid], k, ascending=True, method=method)
+        return _with_unranked(valid[indices], ranks, np.flatnonzero(missing), k)
+
+    indices = _select(keys, np.arange(len(keys)), k)
+    indices = indices[_order(keys[indices], indices)]
+    selected = keys[indices]
+    boundary = selected[-1]
+    ranks = _ranks_for_selection(selected, boundary, np.count_nonzero(keys == boundary), method)
+    return indices, ranks
+
+
+class TopK:
+    # Running top-k over scores that arrive chunk by chunk. Memory is O(k)
+    # plus one chunk; ranks are exact over everything seen so far.
+
+    def __init__(self, k, ascending=False, method="average"):
+        if method not in RANK_METHODS:
+            raise ValueError(f"Unknown rank method {method!r}, expected one of {RANK_METHODS}")
+        self.k = k
+        self.ascending = ascending
+        self.method = method
+        self.count = 0
+        self._keys = np.empty(0)
+        self._indices = np.empty(0, dtype=np.intp)
+        # Dropped alternatives whose key equals the current boundary
+        self._dropped_at_boundary = 0
+        # Lowest indices of NaN scores, at most k, listed after the ranked ones
+        self._missing = np.empty(0, dtype=np.intp)
+
+    def _boundary(self):
+        # (boundary key, alternatives dropped at it), or None while empty
+        return (self._keys[-1], self._dropped_at_boundary) if len(self._keys) else None
+
+    def update(self, values, offset=None):
+        # offset is the global index of values[0]; defaults to the running count
+        offset = self.count if offset is None else offset
+        chunk_keys = _sort_keys(values, self.ascending)
+        self.count += len(chunk_keys)
+        chunk_indices = np.arange(offset, offset + len(chunk_keys))
+        missing = np.isnan(chunk_keys)
+        if missing.any():
+            self._keep_missing(chunk_indices[missing])
+            chunk_keys, chunk_indices = chunk_keys[~missing], chunk_indices[~missing]
+        return self._keep(
+            np.concatenate([self._keys, chunk_keys]),
+            np.concatenate([self._indices, chunk_indices]),
+            [self._boundary()],
+        )
+
+    def _keep_missing(self, indices):
+        self._missing = np.sort(np.concatenate([self._missing, indices]))[:self.k]
+
+    def merge(self, other):
+        # Fold in a TopK over other alternatives, e.g. one per shard of rows
+        if (other.k, other.ascending, other.method) != (self.k, self.ascending, self.method):
+            raise ValueError("Only TopKs with the same k, order and rank method can be merged")
+        self.count += other.count
+        self._keep_missing(other._missing)
+        return self._keep(
+            np.concatenate([self._keys, other._keys]),
+            np.concatenate([self._indices, other._indices]),
+            [self._boundary(), other._boundary()],
+        )
+
+    def _keep(self, keys, indices, boundaries):
+        # Keep the best k of keys. A part that dropped alternatives was full, so
+        # the new boundary is never worse than its own and it can only hold
+        # dropped ties when both boundaries are equal.
+        if len(keys) > self.k:
+            keep = _select(keys, indices, self.k) if self.k else np.empty(0, dtype=np.intp)
+            dropped = np.ones(len(keys), dtype=bool)
+            dropped[keep] = False
+            keys_dropped = keys[dropped]
+            keys, indices = keys[keep], indices[keep]
+        else:
+            keys_dropped = np.empty(0)
+
+        order = _order(keys, indices)
+        self._keys, self._indices = keys[order], indices[order]
+        if len(self._keys):
+            boundary = self._keys[-1]
+            self._dropped_at_boundary = np.count_nonzero(keys_dropped == boundary) + sum(
+                dropped for previous, dropped in filter(None, boundaries) if previous == boundary
+            )
+        return self
+
+    def result(self):
+        if not len(self._keys):
+            return _with_unranked(self._indices, np.empty(0), self._missing, self.k)
+        boundary = self._keys[-1]
+        equal_at_boundary = np.count_nonzero(self._keys == boundary) + self._dropped_at_boundary
+        ranks = _ranks_for_selection(self._keys, boundary, equal_at_boundary, self.method)
+        return _with_unranked(self._indices, ranks, self._missing, self.k)
+
+
+def rank_average_lexicographic(primary, secondary, ascending=False):
+    # Average ranks ordering by primary, then secondary; used where one score
+    # is not enough to order alternatives (e.g. WP rows with zero scores)
+    sign = 1 if ascending else -1
+    order = np.lexsort((sign * secondary, sign * primary))
+    p, s = primary[order], secondary[order]
+    starts = np.flatnonzero(np.r_[True, (p[1:] != p[:-1]) | (s[1:] != s[:-1])])
+    ends = np.r_[starts[1:], len(order)]
+    return _scatter_ranks(order, (starts + ends + 1) / 2, starts, ends)
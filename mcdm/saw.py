@@ -0,0 +1,31 @@
+import numpy as np
+
+from mcdm.instrument import stage
+from mcdm.stats import DEFAULT_CHUNK_SIZE, column_stats, iter_chunks
+
+
+def saw_column_params(stats, weights, is_benefit):
+    # Benefit columns are divided by their max, cost columns divide their min
+    return np.where(is_benefit, stats.col_max, stats.col_min), weights, is_benefit
+
+
+def saw_chunk(chunk, params):
+    reference, weights, is_benefit = params
+    # einsum rather than @: BLAS rounds a row differently depending on where it
+    # sits in the block, which would split exact ties between equal rows
+    return np.einsum("ij,j->i", np.where(is_benefit, chunk / reference, reference / chunk), weights)
+
+
+def saw_scores(matrix, weights, is_benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE):
+    matrix = np.asarray(matrix, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+
+    with stage("saw.normalize"):
+        params = saw_column_params(column_stats(matrix, chunk_size), weights, is_benefit)
+    scores = np.empty(matrix.shape[0])
+    # Normalising and the weighted sum are fused per block of rows
+    with stage("saw.dot"):
+        for start, stop in iter_chunks(matrix.shape[0], chunk_size):
+            scores[start:stop] = saw_chunk(matrix[start:stop], params)
+    return scores
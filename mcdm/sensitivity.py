@@ -0,0 +1,200 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from mcdm.ahp import solve_batch
+from mcdm.instrument import stage
+from mcdm.ranking import top_k
+from mcdm.saw import saw_scores
+from mcdm.topsis import topsis_closeness
+from mcdm.wp import weight_product_log
+
+WEIGHT_METHODS = ("saw", "wp", "topsis")
+
+# Weight samples scored together in one matrix product
+DEFAULT_BATCH_SIZE = 1024
+
+# Saaty scale bounds for perturbed judgments
+SAATY_MIN = 1 / 9
+SAATY_MAX = 9.0
+
+SensitivityResult = namedtuple(
+    "SensitivityResult",
+    ["rank_acceptability", "winner_probability", "baseline_winner", "flip_probability", "n_samples"],
+)
+
+
+def _prepare(method, matrix, is_benefit):
+    # Weight-independent parts of each method, stacked as (k, n, m) so workers can
+    # share them. Every method then scores a batch of weights with matrix products.
+    if method == "ahp":
+        # For AHP the matrix holds alternative weights per criterion
+        return matrix[np.newaxis]
+    if method == "saw":
+        reference = np.where(is_benefit, matrix.max(axis=0), matrix.min(axis=0))
+        return np.where(is_benefit, matrix / reference, reference / matrix)[np.newaxis]
+    if method == "wp":
+        # Zero scores are split off as in wp_log_chunk: finite signed logs (a
+        # zero counts as 1) and the signed zero mask, whose product with the
+        # weights is each row's zero order
+        sign = np.where(is_benefit, 1, -1)
+        zeros = matrix == 0
+        logs = np.log(np.where(zeros, 1.0, matrix))
+        return np.stack([logs * sign, -(zeros * sign)])
+    # TOPSIS: with non-negative weights the weighted ideals are the normalised
+    # ideals times w, so squared distances are (R - ideal)**2 @ w**2
+    normalized = matrix / np.sqrt((matrix**2).sum(axis=0))
+    col_max, col_min = normalized.max(axis=0), normalized.min(axis=0)
+    ideal_positive = np.where(is_benefit, col_max, col_min)
+    ideal_negative = np.where(is_benefit, col_min, col_max)
+    return np.stack([(normalized - ideal_positive) ** 2, (normalized - ideal_negative) ** 2])
+
+
+def _score_batch(method, prepared, weight_batch):
+    # (n, batch) scores for a (batch, m) block of weight vectors summing to 1
+    if method == "topsis":
+        squared = weight_batch.T**2
+        distance_to_positive = np.sqrt(prepared[0] @ squared)
+        distance_to_negative = np.sqrt(prepared[1] @ squared)
+        return distance_to_negative / (distance_to_positive + distance_to_negative)
+    return prepared[0] @ weight_batch.T
+
+
+def _best(method, prepared, weight_batch, max_rank):
+    # (max_rank, batch) positions of the best alternatives in every sample
+    scores = _score_batch(method, prepared, weight_batch)
+    if method == "wp":
+        zero_order = prepared[1] @ weight_batch.T
+        if zero_order.any():
+            # Rows with zero scores rank by their zero order first, as in
+            # weight_product_log; lexsort keeps ties in input order
+            return np.lexsort((-scores, -zero_order), axis=0)[:max_rank]
+    if max_rank < scores.shape[0]:
+        best = np.argpartition(-scores, max_rank - 1, axis=0)[:max_rank]
+        order = np.argsort(-np.take_along_axis(scores, best, axis=0), axis=0, kind="stable")
+        return np.take_along_axis(best, order, axis=0)
+    return np.argsort(-scores, axis=0, kind="stable")
+
+
+def perturb_judgments(criteria_matrix, n_samples, spread, rng):
+    # Multiply each upper-triangle judgment by a log-normal factor, clip to the
+    # Saaty range and rebuild the reciprocal lower triangle
+    n = criteria_matrix.shape[0]
+    rows, cols = np.triu_indices(n, k=1)
+    factors = np.exp(rng.normal(0.0, spread, size=(n_samples, len(rows))))
+    upper = np.clip(criteria_matrix[rows, cols] * factors, SAATY_MIN, SAATY_MAX)
+    samples = np.ones((n_samples, n, n))
+    samples[:, rows, cols] = upper
+    samples[:, cols, rows] = 1 / upper
+    return samples
+
+
+def _sample_weights(sampler, n_samples, rng):
+    kind = sampler[0]
+    if kind == "dirichlet":
+        return rng.dirichlet(sampler[1], size=n_samples)
+    _, criteria_matrix, spread, weight_method = sampler
+    return solve_batch(perturb_judgments(criteria_matrix, n_samples, spread, rng), weight_method).weights
+
+
+def _accumulate(method, prepared, sampler, n_samples, max_rank, batch_size, seed):
+    rng = np.random.default_rng(seed)
+    n_alternatives = prepared.shape[1]
+    rank_counts = np.zeros((n_alternatives, max_rank), dtype=np.int64)
+    for start in range(0, n_samples, batch_size):
+        weight_batch = _sample_weights(sampler, min(batch_size, n_samples - start), rng)
+        best = _best(method, prepared, weight_batch, max_rank)
+        for r in range(max_rank):
+            rank_counts[:, r] += np.bincount(best[r], minlength=n_alternatives)
+    return rank_counts
+
+
+def _accumulate_shared(method, shm_name, shape, sampler, n_samples, max_rank, batch_size, seed):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # The view must not outlive this call or the segment cannot be closed
+        return _accumulate(
+            method, np.ndarray(shape, dtype=np.float64, buffer=shm.buf), sampler, n_samples, max_rank, batch_size, seed
+        )
+    finally:
+        shm.close()
+
+
+def _run(method, prepared, sampler, baseline_winner, n_samples, max_rank, batch_size, workers, seed):
+    n_alternatives = prepared.shape[1]
+    max_rank = n_alternatives if max_rank is None else min(max_rank, n_alternatives)
+    workers = os.cpu_count() if workers is None else workers
+    n_blocks = max(1, min(workers, -(-n_samples // batch_size)))
+    blocks = [n_samples // n_blocks + (i < n_samples % n_blocks) for i in range(n_blocks)]
+    seeds = np.random.SeedSequence(seed).spawn(len(blocks))
+
+    if len(blocks) == 1:
+        with stage("sensitivity.samples"):
+            rank_counts = _accumulate(method, prepared, sampler, n_samples, max_rank, batch_size, seeds[0])
+    else:
+        # Workers map the prepared matrix from shared memory instead of pickling it
+        shm = shared_memory.SharedMemory(create=True, size=prepared.nbytes)
+        try:
+            np.ndarray(prepared.shape, dtype=np.float64, buffer=shm.buf)[:] = prepared
+            with stage("sensitivity.samples"), ProcessPoolExecutor(max_workers=len(blocks)) as pool:
+                futures = [
+                    pool.submit(
+                        _accumulate_shared, method, shm.name, prepared.shape, sampler, size, max_rank, batch_size, block_seed
+                    )
+                    for size, block_seed in zip(blocks, seeds)
+                ]
+                rank_counts = sum(future.result() for future in futures)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    rank_acceptability = rank_counts / n_samples
+    winner_probability = rank_acceptability[:, 0]
+    return SensitivityResult(
+        rank_acceptability,
+        winner_probability,
+        baseline_winner,
+        1.0 - winner_probability[baseline_winner],
+        n_samples,
+    )
+
+
+def weight_sensitivity(matrix, weights, is_benefit_criteria, method="saw", n_samples=10000, concentration=100.0,
+                       max_rank=None, batch_size=DEFAULT_BATCH_SIZE, workers=1, seed=None):
+    # Monte Carlo stability of the ranking under weight uncertainty. Weights are
+    # drawn from a Dirichlet centred on the given weights; higher concentration
+    # means smaller perturbations. rank_acceptability[i, r] is the share of
+    # samples that put alternative i at rank r + 1.
+    if method not in WEIGHT_METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {WEIGHT_METHODS}")
+    matrix = np.asarray(matrix, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+    mean = weights / weights.sum()
+
+    if method == "wp":
+        # The WP page's ranking, zero scores included; the first of tied winners
+        baseline_winner = int(np.argmin(weight_product_log(mean, matrix, is_benefit).ranks))
+    else:
+        baseline = saw_scores(matrix, mean, is_benefit) if method == "saw" else topsis_closeness(matrix, mean, is_benefit)
+        baseline_winner = int(top_k(baseline, 1)[0][0])
+
+    # Zero weights would give a degenerate Dirichlet parameter
+    alpha = np.maximum(concentration * mean, 1e-3)
+    prepared = _prepare(method, matrix, is_benefit)
+    return _run(method, prepared, ("dirichlet", alpha), baseline_winner, n_samples, max_rank, batch_size, workers, seed)
+
+
+def judgment_sensitivity(criteria_matrix, alternative_weights, n_samples=10000, spread=0.2, weight_method="mean",
+                         max_rank=None, batch_size=DEFAULT_BATCH_SIZE, workers=1, seed=None):
+    # AHP variant: perturb the pairwise criteria judgments within the Saaty range
+    # and rescore with fixed (n, m) alternative weights
+    criteria_matrix = np.asarray(criteria_matrix, dtype=np.float64)
+    alternative_weights = np.asarray(alternative_weights, dtype=np.float64)
+    baseline = alternative_weights @ solve_batch(criteria_matrix, weight_method).weights
+    prepared = _prepare("ahp", alternative_weights, None)
+    sampler = ("judgments", criteria_matrix, spread, weight_method)
+    return _run("ahp", prepared, sampler, int(top_k(baseline, 1)[0][0]), n_samples, max_rank, batch_size, workers, seed)
@@ -0,0 +1,140 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from mcdm.ahp import ratio_chunk, ratio_column_params
+from mcdm.instrument import stage
+from mcdm.ranking import RANK_METHOD, TopK
+from mcdm.saw import saw_chunk, saw_column_params
+from mcdm.stats import DEFAULT_CHUNK_SIZE, chunk_stats, iter_chunks, merge_stats
+from mcdm.topsis import topsis_chunk, topsis_column_params
+from mcdm.wp import wp_exponents, wp_log_chunk
+
+# Multi-core scoring of one large decision matrix. The rows are split into one
+# contiguous shard per worker process, on block boundaries. Pass 1 computes the
+# column statistics of every block and merges them in row order, exactly as
+# column_stats does; pass 2 scores every shard against the merged statistics.
+# Blocks and their order match the single-process engines, so the scores do too,
+# bit for bit.
+# Workers map the matrix and write their scores through shared memory, so neither
+# is pickled, and each shard keeps a running top-k that is merged at the end.
+
+SHARD_METHODS = tuple(RANK_METHOD)
+
+ShardedResult = namedtuple("ShardedResult", ["scores", "top_indices", "top_ranks"])
+
+_KERNELS = {
+    "ahp": (ratio_chunk, ratio_column_params),
+    "saw": (saw_chunk, saw_column_params),
+    "topsis": (topsis_chunk, topsis_column_params),
+}
+
+
+def _wp_log_s_chunk(chunk, exponents):
+    # log S of a block, as wp_finalize gives it
+    log_finite, zero_order = wp_log_chunk(chunk, exponents)
+    return np.where(zero_order != 0, np.copysign(np.inf, zero_order), log_finite)
+
+
+def _shards(n_rows, n_shards, chunk_size):
+    # Whole blocks per shard, so every shard's blocks are the single-process ones
+    n_chunks = -(-n_rows // chunk_size)
+    bounds = np.minimum(np.linspace(0, n_chunks, n_shards + 1).astype(int) * chunk_size, n_rows)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# Shard functions take views of the whole matrix and score buffer first
+
+def _shard_stats(matrix, scores, start, stop, chunk_size, reciprocal):
+    # Per block, unmerged: merging shard totals would add the blocks in a
+    # different order than column_stats and change the last bits
+    return [chunk_stats(matrix[start + a:start + b], reciprocal) for a, b in iter_chunks(stop - start, chunk_size)]
+
+
+def _shard_scores(matrix, scores, start, stop, kernel, params, chunk_size, k, rank_method):
+    best = TopK(k, method=rank_method) if k is not None else None
+    for a, b in iter_chunks(stop - start, chunk_size):
+        block = slice(start + a, start + b)
+        scores[block] = kernel(matrix[block], params)
+        if best is not None:
+            best.update(scores[block], offset=start + a)
+    return best
+
+
+def _on_shared(fn, matrix_name, scores_name, shape, *args):
+    # Runs in a worker: fn over views of the shared matrix and score buffer
+    matrix_shm = shared_memory.SharedMemory(name=matrix_name)
+    scores_shm = shared_memory.SharedMemory(name=scores_name)
+    try:
+        # The views must not outlive this call or the segments cannot be closed
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=matrix_shm.buf)
+        return fn(matrix, np.ndarray(shape[0], dtype=np.float64, buffer=scores_shm.buf), *args)
+    finally:
+        matrix_shm.close()
+        scores_shm.close()
+
+
+def sharded_scores(method, matrix, weights, is_benefit_criteria, workers=None, k=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Same scores as the single-process engines with the same chunk_size, bit
+    # for bit (log S for WP). With k, also the best k alternatives and their
+    # ranks, as top_k would give them.
+    if method not in SHARD_METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {SHARD_METHODS}")
+    matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+    n_rows = matrix.shape[0]
+    if not n_rows:
+        top = (np.empty(0, dtype=np.intp), np.empty(0)) if k is not None else (None, None)
+        return ShardedResult(np.empty(0), *top)
+    workers = os.cpu_count() if workers is None else workers
+    # Shards smaller than one block are not worth a process
+    shards = _shards(n_rows, max(1, min(workers, -(-n_rows // chunk_size))), chunk_size)
+
+    if len(shards) == 1:
+        scores = np.empty(n_rows)
+        top = _score(method, weights, is_benefit, shards, lambda fn, calls: [fn(matrix, scores, *args) for args in calls], k, chunk_size)
+        return ShardedResult(scores, *top)
+
+    matrix_shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    scores_shm = shared_memory.SharedMemory(create=True, size=max(n_rows * 8, 1))
+    try:
+        np.ndarray(matrix.shape, dtype=np.float64, buffer=matrix_shm.buf)[:] = matrix
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            def run(fn, calls):
+                futures = [pool.submit(_on_shared, fn, matrix_shm.name, scores_shm.name, matrix.shape, *args) for args in calls]
+                return [future.result() for future in futures]
+
+            top = _score(method, weights, is_benefit, shards, run, k, chunk_size)
+        # Copied out before the segment is released
+        scores = np.ndarray(n_rows, dtype=np.float64, buffer=scores_shm.buf).copy()
+        return ShardedResult(scores, *top)
+    finally:
+        matrix_shm.close()
+        matrix_shm.unlink()
+        scores_shm.close()
+        scores_shm.unlink()
+
+
+def _score(method, weights, is_benefit, shards, run, k, chunk_size):
+    # Both passes; run(fn, calls) applies a shard function to every argument
+    # tuple in calls. Returns the merged (top_indices, top_ranks).
+    if method == "wp":
+        kernel, params = _wp_log_s_chunk, wp_exponents(weights, is_benefit)
+    else:
+        kernel, column_params = _KERNELS[method]
+        with stage("shard.stats"):
+            blocks = run(_shard_stats, [(start, stop, chunk_size, method == "ahp") for start, stop in shards])
+            stats = reduce(merge_stats, [block for shard in blocks for block in shard])
+        params = column_params(stats, weights, is_benefit)
+
+    with stage("shard.scores"):
+        parts = run(_shard_scores, [(start, stop, kernel, params, chunk_size, k, RANK_METHOD[method]) for start, stop in shards])
+    if k is None:
+        return None, None
+    with stage("shard.top_k"):
+        return reduce(TopK.merge, parts).result()
@@ -0,0 +1,47 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Rows processed per block so temporaries stay bounded on very tall matrices
+DEFAULT_CHUNK_SIZE = 65536
+
+ColumnStats = namedtuple("ColumnStats", ["sum_sq", "col_max", "col_min", "col_sum", "recip_sum"])
+
+
+def iter_chunks(n_rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    for start in range(0, n_rows, chunk_size):
+        yield start, min(start + chunk_size, n_rows)
+
+
+def chunk_stats(chunk, reciprocal=False):
+    # Column statistics of one block; combine blocks with merge_stats. Sums
+    # accumulate in float64 even for float32 blocks.
+    with np.errstate(divide="ignore"):
+        recip_sum = (1.0 / chunk).sum(axis=0, dtype=np.float64) if reciprocal else None
+    return ColumnStats(
+        np.einsum("ij,ij->j", chunk, chunk, dtype=np.float64),
+        chunk.max(axis=0).astype(np.float64),
+        chunk.min(axis=0).astype(np.float64),
+        chunk.sum(axis=0, dtype=np.float64),
+        recip_sum,
+    )
+
+
+def merge_stats(a, b):
+    return ColumnStats(
+        a.sum_sq + b.sum_sq,
+        np.maximum(a.col_max, b.col_max),
+        np.minimum(a.col_min, b.col_min),
+        a.col_sum + b.col_sum,
+        None if a.recip_sum is None else a.recip_sum + b.recip_sum,
+    )
+
+
+def column_stats(matrix, chunk_size=DEFAULT_CHUNK_SIZE, reciprocal=False):
+    # Per-column sum of squares, max, min and sum (plus sum of reciprocals when
+    # asked) in one streaming pass
+    stats = None
+    for start, stop in iter_chunks(matrix.shape[0], chunk_size):
+        block = chunk_stats(matrix[start:stop], reciprocal)
+        stats = block if stats is None else merge_stats(stats, block)
+    return stats
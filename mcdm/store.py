@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+import time
+import uuid
+from collections import namedtuple
+
+import numpy as np
+
+from mcdm.cache import content_key
+
+# Results persisted across sessions and restarts. Every problem is a directory
+# named by the hash of its inputs, holding one .npy file per array plus a small
+# meta.json. Arrays are opened memory-mapped, so every session reading a result
+# shares the OS page cache instead of holding its own copy, and paging through a
+# ranking touches only the rows on screen.
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcdm", "results")
+
+StoredResult = namedtuple(
+    "StoredResult",
+    ["key", "method", "alternatives", "criteria", "matrix", "weights", "is_benefit", "scores", "ranks", "order", "meta"],
+)
+
+_ARRAYS = ("matrix", "weights", "is_benefit", "scores", "ranks", "order")
+
+
+def problem_key(method, matrix, weights, is_benefit_criteria):
+    return content_key(
+        method,
+        np.asarray(matrix, dtype=np.float64),
+        np.asarray(weights, dtype=np.float64),
+        np.asarray(is_benefit_criteria, dtype=bool),
+    )
+
+
+class StoredNames:
+    # Names kept as one UTF-8 byte buffer plus offsets, so millions of them map
+    # in without building a Python string per name; indexing decodes only the
+    # names asked for
+
+    def __init__(self, data, offsets):
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def _name(self, i):
+        return self._data[self._offsets[i]:self._offsets[i + 1]].tobytes().decode()
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._name(index % len(self))
+        indices = np.arange(len(self))[index] if isinstance(index, slice) else np.asarray(index)
+        names = np.empty(len(indices), dtype=object)
+        names[:] = [self._name(i) for i in indices]
+        return names
+
+    def __iter__(self):
+        return (self._name(i) for i in range(len(self)))
+
+
+def _save_names(directory, prefix, names):
+    encoded = [str(name).encode() for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    np.save(os.path.join(directory, f"{prefix}_data.npy"), np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    np.save(os.path.join(directory, f"{prefix}_offsets.npy"), offsets)
+
+
+def _directory_bytes(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+
+class ResultStore:
+    def __init__(self, root=None):
+        self.root = root or os.environ.get("MCDM_STORE_DIR", DEFAULT_STORE_DIR)
+
+    def _path(self, key):
+        return os.path.join(self.root, key)
+
+    def __contains__(self, key):
+        return os.path.isfile(os.path.join(self._path(key), "meta.json"))
+
+    def put(self, key, method, alternatives, criteria, matrix, weights, is_benefit, scores, ranks):
+        # Written to a private directory first and renamed into place, so readers
+        # never see a partial result; a concurrent writer of the same key loses
+        # the rename and its copy is discarded
+        if key in self:
+            return self.get(key)
+        os.makedirs(self.root, exist_ok=True)
+        staging = os.path.join(self.root, f".staging-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            ranks = np.asarray(ranks)
+            arrays = {
+                "matrix": np.asarray(matrix, dtype=np.float64),
+                "weights": np.asarray(weights, dtype=np.float64),
+                "is_benefit": np.asarray(is_benefit, dtype=bool),
+                "scores": np.asarray(scores, dtype=np.float64),
+                "ranks": ranks,
+                # Best first, ties in input order, for paging through the ranking
+                "order": np.argsort(ranks, kind="stable"),
+            }
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, f"{name}.npy"), array)
+            _save_names(staging, "alternatives", alternatives)
+            _save_names(staging, "criteria", criteria)
+            meta = {
+                "method": method,
+                "created": time.time(),
+                "n_alternatives": int(arrays["matrix"].shape[0]),
+                "n_criteria": int(arrays["matrix"].shape[1]),
+            }
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump(meta, f)
+            os.rename(staging, self._path(key))
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            if key not in self:
+                raise
+        return self.get(key)
+
+    def get(self, key):
+        # None when the key was never stored (or has been pruned)
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        def load(name):
+            try:
+                return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            except ValueError:
+                # Empty arrays cannot be mapped
+                return np.load(os.path.join(path, f"{name}.npy"))
+
+        def names(prefix):
+            return StoredNames(load(f"{prefix}_data"), load(f"{prefix}_offsets"))
+
+        # Reading marks the result as recently used for prune()
+        os.utime(path)
+        return StoredResult(key, meta["method"], names("alternatives"), names("criteria"), *map(load, _ARRAYS), meta)
+
+    def entries(self, method=None):
+        # (key, meta) of stored results, newest first
+        if not os.path.isdir(self.root):
+            return []
+        found = []
+        for entry in os.scandir(self.root):
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                with open(os.path.join(entry.path, "meta.json")) as f:
+                    meta = json.load(f)
+            except FileNotFoundError:
+                continue
+            if method is None or meta["method"] == method:
+                found.append((entry.name, meta))
+        return sorted(found, key=lambda item: item[1]["created"], reverse=True)
+
+    def delete(self, key):
+        shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def prune(self, max_bytes):
+        # Drop least recently used results until the store fits in max_bytes
+        if not os.path.isdir(self.root):
+            return
+        directories = [entry for entry in os.scandir(self.root) if entry.is_dir() and not entry.name.startswith(".")]
+        directories.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        # The newest result is always kept
+        total = sum(_directory_bytes(entry.path) for entry in directories[:1])
+        for entry in directories[1:]:
+            total += _directory_bytes(entry.path)
+            if total > max_bytes:
+                shutil.rmtree(entry.path, ignore_errors=True)
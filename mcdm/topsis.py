@@ -0,0 +1,63 @@
+import numpy as np
+
+from mcdm.instrument import stage
+from mcdm.ranking import rank_min
+from mcdm.stats import DEFAULT_CHUNK_SIZE, column_stats, iter_chunks
+
+
+# Vector normalisation of the decision matrix
+def normalize_matrix(matrix):
+    return matrix / np.sqrt((matrix**2).sum(axis=0))
+
+
+# Euclidean distance of every row to an ideal solution
+def calculate_distance(matrix, ideal_solution):
+    return np.sqrt(((matrix - ideal_solution) ** 2).sum(axis=1))
+
+
+def ideal_solutions(weighted_matrix, is_benefit_criteria):
+    is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+    col_max = weighted_matrix.max(axis=0)
+    col_min = weighted_matrix.min(axis=0)
+    ideal_positive = np.where(is_benefit, col_max, col_min)
+    ideal_negative = np.where(is_benefit, col_min, col_max)
+    return ideal_positive, ideal_negative
+
+
+def topsis_column_params(stats, weights, is_benefit):
+    # Normalising and weighting only scale each column by a non-negative factor,
+    # so the ideal solutions follow directly from the raw column max/min
+    scale = weights / np.sqrt(stats.sum_sq)
+    ideal_positive = np.where(is_benefit, stats.col_max, stats.col_min) * scale
+    ideal_negative = np.where(is_benefit, stats.col_min, stats.col_max) * scale
+    return scale, ideal_positive, ideal_negative
+
+
+def topsis_chunk(chunk, params):
+    scale, ideal_positive, ideal_negative = params
+    weighted = chunk * scale
+    distance_to_positive = calculate_distance(weighted, ideal_positive)
+    distance_to_negative = calculate_distance(weighted, ideal_negative)
+    return distance_to_negative / (distance_to_positive + distance_to_negative)
+
+
+def topsis_closeness(matrix, weights, is_benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE):
+    matrix = np.asarray(matrix, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    is_benefit = np.asarray(is_benefit_criteria, dtype=bool)
+
+    # Pass 1: column norms and extremes; pass 2: closeness one block of rows at a time
+    with stage("topsis.ideal_solutions"):
+        params = topsis_column_params(column_stats(matrix, chunk_size), weights, is_benefit)
+    closeness = np.empty(matrix.shape[0])
+    with stage("topsis.closeness"):
+        for start, stop in iter_chunks(matrix.shape[0], chunk_size):
+            closeness[start:stop] = topsis_chunk(matrix[start:stop], params)
+    return closeness
+
+
+def topsis_scores(matrix, weights, is_benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE):
+    closeness = topsis_closeness(matrix, weights, is_benefit_criteria, chunk_size)
+    with stage("topsis.rank"):
+        ranks = rank_min(closeness)
+    return closeness, ranks
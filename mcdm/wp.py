@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+import numpy as np
+
+from mcdm.instrument import stage
+from mcdm.ranking import rank_average_lexicographic
+from mcdm.stats import DEFAULT_CHUNK_SIZE, iter_chunks
+
+LogWPResult = namedtuple("LogWPResult", ["log_S", "V", "ranks"])
+
+
+def weight_product(criteria_weights, alternative_matrix, benefit_criteria):
+    with stage("wp.S"):
+        normalized_weights = criteria_weights / np.sum(criteria_weights)
+        S = np.prod(alternative_matrix ** (normalized_weights * np.where(benefit_criteria, 1, -1)), axis=1)
+    with stage("wp.V"):
+        V = S / np.sum(S)
+    return S, V
+
+
+def wp_exponents(criteria_weights, benefit_criteria):
+    return criteria_weights / np.sum(criteria_weights) * np.where(benefit_criteria, 1, -1)
+
+
+def wp_log_chunk(chunk, exponents):
+    # Finite part of log S and the order of magnitude contributed by zero scores.
+    # einsum rounds every row the same wherever it sits in the block, so
+    # IncrementalWP can rescore single rows and get the same bits.
+    zeros = chunk == 0
+    zero_order = np.zeros(chunk.shape[0])
+    if zeros.any():
+        # Criteria with zero weight contribute x**0 == 1 even for x == 0
+        zero_order = -np.einsum("ij,j->i", zeros, exponents)
+        chunk = np.where(zeros, 1.0, chunk)
+    return np.einsum("ij,j->i", np.log(chunk), exponents), zero_order
+
+
+def wp_finalize(log_finite, zero_order, with_ranks=True):
+    # Infinite magnitude only where the zero cells carry a non-zero exponent
+    log_S = log_finite.copy()
+    log_S[zero_order != 0] = np.copysign(np.inf, zero_order[zero_order != 0])
+
+    # V over the dominant order of magnitude, everything below it is exactly 0
+    with stage("wp.V"):
+        dominant = zero_order == zero_order.max()
+        shifted = log_finite[dominant] - log_finite[dominant].max()
+        V = np.zeros(len(log_finite))
+        V[dominant] = np.exp(shifted - np.log(np.sum(np.exp(shifted))))
+
+    with stage("wp.rank"):
+        ranks = rank_average_lexicographic(zero_order, log_finite) if with_ranks else None
+    return LogWPResult(log_S, V, ranks)
+
+
+def weight_product_log(criteria_weights, alternative_matrix, benefit_criteria, chunk_size=DEFAULT_CHUNK_SIZE, with_ranks=True):
+    # Weighted Product in the log domain: log S is a matrix-vector product of
+    # log scores, and V is normalised with log-sum-exp, so no power matrix is built
+    # and very small or large products neither underflow nor overflow.
+    #
+    # A zero score makes S zero (benefit) or infinite (cost). Such rows are ranked
+    # by the limit of the product as the zeros shrink towards 0: the summed exponent
+    # of their zero cells sets an order of magnitude that dominates the finite part.
+    matrix = np.asarray(alternative_matrix, dtype=np.float64)
+    exponents = wp_exponents(np.asarray(criteria_weights, dtype=np.float64), benefit_criteria)
+
+    log_finite = np.empty(matrix.shape[0])
+    zero_order = np.empty(matrix.shape[0])
+    with stage("wp.S"):
+        for start, stop in iter_chunks(matrix.shape[0], chunk_size):
+            log_finite[start:stop], zero_order[start:stop] = wp_log_chunk(matrix[start:stop], exponents)
+    return wp_finalize(log_finite, zero_order, with_ranks)
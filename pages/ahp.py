@@ -2,13 +2,18 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 
-def calculate_consistency_ratio(matrix, n):
-    eigenvalues = np.linalg.eigvals(matrix)
-    lambda_max = max(eigenvalues.real)
-    consistency_index = (lambda_max - n) / (n - 1)
-    random_index = {1: 0, 2: 0, 3: 0.58, 4: 0.9, 5: 1.12, 6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49}
-    consistency_ratio = consistency_index / random_index[n]
-    return consistency_ratio
+from mcdm.ahp import complete_judgments, reciprocal_judgments, solve_scenarios, suggest_repairs
+from mcdm.cache import content_key, memoize
+from mcdm.instrument import stage
+from mcdm.sensitivity import judgment_sensitivity
+from ui.comparison import GRID_MAX_ITEMS, comparison_grid, upload_comparison_matrices
+from ui.display import lazy_table
+from ui.jobs import background_result, has_job
+from ui.profiling import profiling_toggle, show_profile
+from ui.sensitivity import SENSITIVITY_SAMPLES, sensitivity_toggle, show_sensitivity
+
+# Engine results are shared across reruns and sessions with identical inputs
+cached_solve_scenarios = memoize(solve_scenarios)
 
 def create_comparison_matrix(labels, prefix):
     n = len(labels)
@@ -35,7 +40,7 @@ def create_comparison_matrix(labels, prefix):
                     f"Importance",
                     min_value=1/9,
                     max_value=9.0,
-                    value=matrix[i, j],
+                    value=matrix[i, j] if np.isfinite(matrix[i, j]) else 1.0,
                     step=0.1,
                     key=key,
                     on_change=update_matrix,
@@ -51,6 +56,50 @@ def update_matrix(prefix, i, j, key):
     st.session_state[f"{prefix}_matrix"][i, j] = value
     st.session_state[f"{prefix}_matrix"][j, i] = 1 / value
 
+def apply_repairs(repairs):
+    # Button callback: write repaired matrices back before the widgets render
+    for prefix, labels, repaired in repairs:
+        st.session_state[f"{prefix}_matrix"] = repaired.copy()
+        # Dropping the pairwise widget state makes them re-read the matrix
+        rows, cols = np.triu_indices(len(labels), k=1)
+        for i, j in zip(rows, cols):
+            st.session_state.pop(f"{prefix}{labels[i]}{labels[j]}", None)
+        st.session_state[f"{prefix}_grid_version"] = st.session_state.get(f"{prefix}_grid_version", 0) + 1
+
+def show_repair_advice(criteria_matrix, alternative_matrices, criteria_labels, alternative_labels, can_apply):
+    # Suggested judgment changes for every matrix above CR 0.1, worked out in two batched calls
+    criteria_repair = suggest_repairs(criteria_matrix)
+    alternative_repair = suggest_repairs(alternative_matrices)
+    matrices = [("criteria", "Criteria", criteria_labels, criteria_matrix, criteria_repair.matrices, criteria_repair.cr_before, criteria_repair.cr_after, criteria_repair.changes)]
+    for k, criterion in enumerate(criteria_labels):
+        matrices.append((
+            f"alt_{k}", f"Alternatives for {criterion}", alternative_labels, alternative_matrices[k],
+            alternative_repair.matrices[k], alternative_repair.cr_before[k], alternative_repair.cr_after[k], alternative_repair.changes[k]
+        ))
+
+    rows, repairs = [], []
+    for prefix, title, labels, original, repaired, cr_before, cr_after, changes in matrices:
+        if not changes:
+            continue
+        repairs.append((prefix, labels, repaired))
+        for i, j in dict.fromkeys((i, j) for i, j, _, _ in changes):
+            rows.append({
+                'Matrix': title,
+                'Comparison': f"{labels[i]} vs {labels[j]}",
+                'Current': original[i, j],
+                'Suggested': repaired[i, j],
+                'CR before': cr_before,
+                'CR after': cr_after
+            })
+    if not rows:
+        return
+
+    st.subheader("Consistency Repair Suggestions")
+    st.write("Changing these judgments, largest inconsistency first, brings every matrix below CR 0.1:")
+    st.write(pd.DataFrame(rows))
+    if can_apply:
+        st.button("Apply suggested judgments", on_click=apply_repairs, args=(repairs,), key="ahp_apply_repairs")
+
 def initialize_session_state():
     if 'num_criteria' not in st.session_state:
         st.session_state.num_criteria = 5
@@ -72,74 +121,135 @@ def ahp_page():
 
     initialize_session_state()
 
-    # Input for criteria and alternatives
-    st.sidebar.header("AHP Parameters")
-    num_criteria = st.sidebar.number_input("Number of Criteria", min_value=2, max_value=10, value=st.session_state.num_criteria, key="ahp_num_criteria")
-    num_alternatives = st.sidebar.number_input("Number of Alternatives", min_value=2, max_value=10, value=st.session_state.num_alternatives, key="ahp_num_alternatives")
-
-    # Update criteria and alternatives lists dynamically based on user input
-    if len(st.session_state.ahp_criteria) != num_criteria:
-        st.session_state.ahp_criteria = [f'C{i+1:02d}' for i in range(num_criteria)]
-        st.session_state.num_criteria = num_criteria
-    if len(st.session_state.ahp_alternatives) != num_alternatives:
-        st.session_state.ahp_alternatives = [f'A{i+1:02d}' for i in range(num_alternatives)]
-        st.session_state.num_alternatives = num_alternatives
-
-    # Input for criteria names
-    st.sidebar.header("Criteria Names")
-    for i in range(st.session_state.num_criteria):
-        st.session_state.ahp_criteria[i] = st.sidebar.text_input(f"Criterion {i+1}", value=st.session_state.ahp_criteria[i], key=f"ahp_criterion_{i}")
-
-    # Input for alternative names
-    st.sidebar.header("Alternative Names")
-    for i in range(st.session_state.num_alternatives):
-        st.session_state.ahp_alternatives[i] = st.sidebar.text_input(f"Alternative {i+1}", value=st.session_state.ahp_alternatives[i], key=f"ahp_alternative_{i}")
+    # Pairwise inputs need one widget per pair, so they stop at 10 items
+    st.sidebar.header("Comparison Input")
+    input_mode = st.sidebar.radio(
+        "Enter comparisons as",
+        options=["Pairwise", "Grid", "Upload"],
+        format_func=lambda m: {"Pairwise": "One input per pair", "Grid": "Editable matrix grid", "Upload": "Uploaded matrices"}[m],
+        key="ahp_input_mode",
+        help="Grid and uploaded matrices may leave comparisons blank; they are filled by logarithmic least squares"
+    )
+    max_items = 10 if input_mode == "Pairwise" else GRID_MAX_ITEMS
+
+    if input_mode == "Upload":
+        uploaded = upload_comparison_matrices("ahp")
+        if uploaded is None:
+            st.info("Upload a criteria comparison matrix and one alternative comparison matrix per criterion.")
+            return
+        criteria_labels, alternative_labels, uploaded_criteria, uploaded_alternatives = uploaded
+    else:
+        # Input for criteria and alternatives
+        st.sidebar.header("AHP Parameters")
+        num_criteria = st.sidebar.number_input("Number of Criteria", min_value=2, max_value=max_items, value=min(st.session_state.num_criteria, max_items), key="ahp_num_criteria")
+        num_alternatives = st.sidebar.number_input("Number of Alternatives", min_value=2, max_value=max_items, value=min(st.session_state.num_alternatives, max_items), key="ahp_num_alternatives")
+
+        # Update criteria and alternatives lists dynamically based on user input
+        if len(st.session_state.ahp_criteria) != num_criteria:
+            st.session_state.ahp_criteria = [f'C{i+1:02d}' for i in range(num_criteria)]
+            st.session_state.num_criteria = num_criteria
+        if len(st.session_state.ahp_alternatives) != num_alternatives:
+            st.session_state.ahp_alternatives = [f'A{i+1:02d}' for i in range(num_alternatives)]
+            st.session_state.num_alternatives = num_alternatives
+
+        # Input for criteria names
+        st.sidebar.header("Criteria Names")
+        for i in range(st.session_state.num_criteria):
+            st.session_state.ahp_criteria[i] = st.sidebar.text_input(f"Criterion {i+1}", value=st.session_state.ahp_criteria[i], key=f"ahp_criterion_{i}")
+
+        # Input for alternative names
+        st.sidebar.header("Alternative Names")
+        for i in range(st.session_state.num_alternatives):
+            st.session_state.ahp_alternatives[i] = st.sidebar.text_input(f"Alternative {i+1}", value=st.session_state.ahp_alternatives[i], key=f"ahp_alternative_{i}")
+
+        criteria_labels = list(st.session_state.ahp_criteria)
+        alternative_labels = list(st.session_state.ahp_alternatives)
+    comparison_input = comparison_grid if input_mode == "Grid" else create_comparison_matrix
+
+    # Weighting method for priority vectors
+    st.sidebar.header("Weighting Method")
+    weight_method = st.sidebar.radio(
+        "Priority vector",
+        options=["mean", "eigen"],
+        format_func=lambda m: "Column mean (approximate)" if m == "mean" else "Principal eigenvector",
+        key="ahp_weight_method"
+    )
+
+    # Uploaded matrices are weighted on the background job queue
+    job_inputs = content_key(uploaded_criteria, uploaded_alternatives, weight_method) if input_mode == "Upload" else None
+
+    run_sensitivity = sensitivity_toggle("ahp", "Judgment sensitivity analysis")
+    profiler = profiling_toggle("ahp")
 
     # Pairwise comparison for criteria
     st.header("Pairwise Comparison of Criteria")
-    criteria_matrix = create_comparison_matrix(st.session_state.ahp_criteria, "criteria")
+    if input_mode == "Upload":
+        criteria_matrix = uploaded_criteria
+    else:
+        criteria_matrix = comparison_input(criteria_labels, "criteria")
 
     # Display criteria matrix
-    st.subheader("Criteria Comparison Matrix")
-    criteria_df = pd.DataFrame(criteria_matrix, columns=st.session_state.ahp_criteria, index=st.session_state.ahp_criteria)
-    st.write(criteria_df)
+    with stage("ahp.render"):
+        lazy_table(
+            "Criteria Comparison Matrix",
+            lambda: pd.DataFrame(criteria_matrix, columns=criteria_labels, index=criteria_labels),
+            "ahp_criteria_table"
+        )
 
     # Pairwise comparison for alternatives with respect to each criterion
     alternative_matrices = []
-    for k, criterion in enumerate(st.session_state.ahp_criteria):
+    for k, criterion in enumerate(criteria_labels):
         st.header(f"Pairwise Comparison of Alternatives with respect to {criterion}")
-        alt_matrix = create_comparison_matrix(st.session_state.ahp_alternatives, f"alt_{k}")
+        if input_mode == "Upload":
+            alt_matrix = uploaded_alternatives[k]
+        else:
+            alt_matrix = comparison_input(alternative_labels, f"alt_{k}")
         alternative_matrices.append(alt_matrix)
 
         # Display alternative matrix for each criterion
-        st.subheader(f"Alternative Comparison Matrix for {criterion}")
-        alt_df = pd.DataFrame(alt_matrix, columns=st.session_state.ahp_alternatives, index=st.session_state.ahp_alternatives)
-        st.write(alt_df)
+        with stage("ahp.render"):
+            lazy_table(
+                f"Alternative Comparison Matrix for {criterion}",
+                lambda matrix=alt_matrix, labels=alternative_labels: pd.DataFrame(matrix, columns=labels, index=labels),
+                f"ahp_alt_{k}_table"
+            )
 
-    if st.button("Calculate AHP"):
-        # Calculate weights for criteria
-        criteria_weights = np.mean(criteria_matrix / np.sum(criteria_matrix, axis=0), axis=1)
+    if st.button("Calculate AHP") or has_job("ahp", job_inputs):
+        # Blank comparisons are filled from the known ones before weighting
+        criteria_matrix = reciprocal_judgments(criteria_matrix)
+        alternative_matrices = reciprocal_judgments(np.array(alternative_matrices))
+        missing = (np.isnan(criteria_matrix).sum() + np.isnan(alternative_matrices).sum()) // 2
+        if missing:
+            try:
+                criteria_matrix = complete_judgments(criteria_matrix)
+                alternative_matrices = complete_judgments(alternative_matrices)
+            except ValueError as e:
+                st.error(str(e))
+                return
+            st.info(f"Filled {missing} missing comparisons by logarithmic least squares.")
 
-        # Calculate consistency ratio for criteria
-        cr_criteria = calculate_consistency_ratio(criteria_matrix, num_criteria)
-
-        # Calculate weights for alternatives with respect to each criterion
-        alternative_weights = []
-        cr_alternatives = []
-        for alt_matrix in alternative_matrices:
-            weights = np.mean(alt_matrix / np.sum(alt_matrix, axis=0), axis=1)
-            alternative_weights.append(weights)
-            cr_alternatives.append(calculate_consistency_ratio(alt_matrix, num_alternatives))
-
-        # Calculate final scores
-        final_scores = np.dot(np.array(alternative_weights).T, criteria_weights)
+        # Weights and consistency ratios for criteria and every alternative matrix in one batched call
+        if input_mode == "Upload":
+            result = background_result("ahp", job_inputs, lambda queue, user: queue.submit(
+                user, solve_scenarios, criteria_matrix[np.newaxis], alternative_matrices[np.newaxis], weight_method, description="AHP weights"
+            ))
+            if result is None:
+                show_profile(profiler, "ahp")
+                return
+        else:
+            result = cached_solve_scenarios(criteria_matrix[np.newaxis], alternative_matrices[np.newaxis], weight_method)
+        criteria_weights = result.criteria_weights[0]
+        cr_criteria = result.cr_criteria[0]
+        alternative_weights = result.alternative_weights[0]
+        cr_alternatives = result.cr_alternatives[0]
+        final_scores = result.final_scores[0]
 
         # Display results
         st.header("Results")
 
         st.subheader("Criteria Weights")
         criteria_df = pd.DataFrame({
-            'Criterion': st.session_state.ahp_criteria,
+            'Criterion': criteria_labels,
             'Weight': criteria_weights
         })
         st.write(criteria_df)
@@ -148,10 +258,10 @@ def ahp_page():
             st.warning("The consistency ratio for criteria is greater than 0.1. Consider revising your judgments.")
 
         st.subheader("Alternative Weights for each Criterion")
-        for i, criterion in enumerate(st.session_state.ahp_criteria):
+        for i, criterion in enumerate(criteria_labels):
             st.write(f"For {criterion}:")
             alt_df = pd.DataFrame({
-                'Alternative': st.session_state.ahp_alternatives,
+                'Alternative': alternative_labels,
                 'Weight': alternative_weights[i]
             })
             st.write(alt_df)
@@ -161,7 +271,7 @@ def ahp_page():
 
         st.subheader("Final Scores")
         final_df = pd.DataFrame({
-            'Alternative': st.session_state.ahp_alternatives,
+            'Alternative': alternative_labels,
             'Score': final_scores
         })
         final_df = final_df.sort_values('Score', ascending=False)
@@ -170,5 +280,14 @@ def ahp_page():
 
         st.success(f"The best alternative is {final_df.iloc[0]['Alternative']} with a score of {final_df.iloc[0]['Score']:.4f}")
 
+        with stage("ahp.repair"):
+            show_repair_advice(criteria_matrix, alternative_matrices, criteria_labels, alternative_labels, input_mode != "Upload")
+
+        if run_sensitivity:
+            sensitivity = judgment_sensitivity(criteria_matrix, alternative_weights.T, n_samples=SENSITIVITY_SAMPLES, weight_method=weight_method)
+            show_sensitivity(alternative_labels, sensitivity)
+
+    show_profile(profiler, "ahp")
+
 if __name__ == "__main__":
     ahp_page()
\ No newline at end of file
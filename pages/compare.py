@@ -0,0 +1,46 @@
+import streamlit as st
+import pandas as pd
+
+from mcdm.cache import memoize
+from mcdm.pipeline import METHODS, compare_methods
+from mcdm.ranking import top_k
+from ui.upload import RANKING_DISPLAY_LIMIT, show_criteria, upload_decision_matrix
+
+METHOD_LABELS = {"ahp": "AHP", "saw": "SAW", "topsis": "TOPSIS", "wp": "WP"}
+
+# Engine results are shared across reruns and sessions with identical inputs
+cached_compare_methods = memoize(compare_methods)
+
+st.title("Method Comparison")
+st.write("Rank one decision matrix with every method at once and see where they agree.")
+
+uploaded = upload_decision_matrix("compare", offer_float32=False)
+methods = st.sidebar.multiselect(
+    "Methods",
+    options=list(METHODS),
+    default=list(METHODS),
+    format_func=METHOD_LABELS.get,
+    key="compare_methods"
+)
+
+if uploaded is None:
+    st.info("Upload a decision matrix in the sidebar to compare methods.")
+elif not methods:
+    st.warning("Select at least one method.")
+else:
+    show_criteria(uploaded)
+    result = cached_compare_methods(uploaded.matrix, uploaded.weights, uploaded.is_benefit, tuple(methods))
+
+    st.subheader("Consensus Ranking (Borda count)")
+    order, consensus_ranks = top_k(result.consensus_scores, RANKING_DISPLAY_LIMIT, method="min")
+    ranking_df = pd.DataFrame({'Alternative': uploaded.alternatives[order], 'Consensus Rank': consensus_ranks})
+    for method in result.methods:
+        ranking_df[f"{METHOD_LABELS[method]} Rank"] = result.ranks[method][order]
+    st.write(f"Top {len(order)} of {len(result.consensus_scores)} alternatives")
+    st.write(ranking_df)
+
+    st.subheader("Method Agreement (Spearman rank correlation)")
+    labels = [METHOD_LABELS[method] for method in result.methods]
+    st.write(pd.DataFrame(result.agreement, index=labels, columns=labels))
+
+    st.success(f"The consensus choice is {uploaded.alternatives[order[0]]}")
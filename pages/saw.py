@@ -1,128 +1,198 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 
+from mcdm.cache import memoize
+from mcdm.fuzzy import defuzzify, fuzzy_saw_scores
+from mcdm.incremental import IncrementalSAW
+from mcdm.instrument import stage
+from mcdm.problem import DecisionProblem
+from mcdm.saw import saw_scores
+from mcdm.sensitivity import weight_sensitivity
+from ui.display import lazy_table
+from ui.fuzzy import fuzzy_scores_editor, invalid_triangles
+from ui.jobs import uploaded_scores
+from ui.profiling import profiling_toggle, show_profile
+from ui.query import filter_ranking
+from ui.results import past_result, show_stored_ranking, show_stored_result, store_result
+from ui.sensitivity import SENSITIVITY_SAMPLES, sensitivity_toggle, show_sensitivity
+from ui.upload import show_criteria, upload_decision_matrix
+
 # Initialize session state if it doesn't exist
 if 'alternativesCount' not in st.session_state:
     st.session_state.alternativesCount = 1
 if 'criteriaCount' not in st.session_state:
     st.session_state.criteriaCount = 1
-if 'criteria_names' not in st.session_state:
-    st.session_state.criteria_names = ['Criteria 1']
-if 'criteria_types' not in st.session_state:
-    st.session_state.criteria_types = ['Benefit']
-if 'weights' not in st.session_state:
-    st.session_state.weights = [0.00]
-if 'alternatives' not in st.session_state:
-    st.session_state.alternatives = ['Alternative 1']
-if 'scores' not in st.session_state:
-    st.session_state.scores = {}
+if 'saw_problem' not in st.session_state:
+    st.session_state.saw_problem = DecisionProblem(['Alternative 1'], ['Criteria 1'], fill=50.0)
+
+# Engine results are shared across reruns and sessions with identical inputs
+cached_saw_scores = memoize(saw_scores)
+cached_fuzzy_saw_scores = memoize(fuzzy_saw_scores)
+
+profiler = profiling_toggle("saw")
+
+# Uploaded decision matrix replaces the manual inputs below
+uploaded = upload_decision_matrix("saw")
+if uploaded is not None:
+    st.title("Simple Additive Weighting")
+    show_criteria(uploaded)
+    total_weight = uploaded.weights.sum()
+    if abs(total_weight - 1) > 0.001:
+        st.warning(f"Cannot calculate SAW results because the total weight is not 1, it's :orange[{total_weight}]")
+    else:
+        st.header("Result")
+        # Large uploads run on the background job queue; None while they do
+        final_scores = uploaded_scores("saw", "saw", uploaded, lambda: cached_saw_scores(uploaded.matrix, uploaded.weights, uploaded.is_benefit))
+        if final_scores is not None:
+            # Stored on disk so the ranking can be reopened later from any session
+            stored = store_result("saw", uploaded, final_scores)
+            with stage("saw.render"):
+                chosen, _ = show_stored_ranking(stored, "Final Score", "saw")
+            st.success(f"The chosen alternative is {chosen}")
+            filter_ranking("saw", "saw", uploaded, "Final Score")
+    show_profile(profiler, "saw")
+    st.stop()
+
+# An earlier uploaded result can be reopened without its file
+reopened = past_result("saw")
+if reopened is not None:
+    st.title("Simple Additive Weighting")
+    st.header("Result")
+    with stage("saw.render"):
+        chosen, _ = show_stored_result(reopened, "Final Score", "saw")
+    st.success(f"The chosen alternative is {chosen}")
+    show_profile(profiler, "saw")
+    st.stop()
 
 # Count inputs
 num_alternatives = st.session_state.alternativesCount = st.sidebar.number_input("Number of Alternatives", min_value=1, max_value=10, value=st.session_state.alternativesCount)
 num_criteria = st.session_state.criteriaCount = st.sidebar.number_input("Number of Criteria", min_value=1, max_value=10, value=st.session_state.criteriaCount)
 
-# Session state extends based on count inputs
-if len(st.session_state.criteria_names) < num_criteria:
-    st.session_state.criteria_names.extend([f"Criteria {i+1}" for i in range(len(st.session_state.criteria_names), num_criteria)])
-if len(st.session_state.criteria_types) < num_criteria:
-    st.session_state.criteria_types.extend(["Benefit"] * (num_criteria - len(st.session_state.criteria_types)))
-if len(st.session_state.weights) < num_criteria:
-    st.session_state.weights.extend([0.00] * (num_criteria - len(st.session_state.weights)))
-if len(st.session_state.alternatives) < num_alternatives:
-    st.session_state.alternatives.extend([f"Alternative {i+1}" for i in range(len(st.session_state.alternatives), num_alternatives)])
+# Problem arrays resize based on count inputs
+problem = st.session_state.saw_problem.resize(num_alternatives, num_criteria, fill=50.0)
 
 # Input criteria names and types (cost/benefit)
-criteria_names = []
-criteria_types = []
 for i in range(num_criteria):
     st.sidebar.title(f"Criteria {i+1}")
-    criteria_name = st.session_state.criteria_names[i] = st.sidebar.text_input(f"Criteria {i+1} Name", value=st.session_state.criteria_names[i])
-    criteria_names.append(st.session_state.criteria_names[i])
+    criteria_name = st.sidebar.text_input(f"Criteria {i+1} Name", value=problem.criteria[i])
+    problem.set_criterion(i, criteria_name)
     
-    criteria_type = st.session_state.criteria_types[i] = st.sidebar.selectbox(
+    criteria_type = st.sidebar.selectbox(
         f"Type for {criteria_name}",
         options=["Benefit", "Cost"],
-        index=0 if st.session_state.criteria_types[i] == "Benefit" else 1,
+        index=0 if problem.is_benefit[i] else 1,
     )
-    criteria_types.append(st.session_state.criteria_types[i])
+    problem.set_benefit(i, criteria_type == "Benefit")
 
 # Input criteria weights
 st.sidebar.title("Criteria Weights")
-weights = []
-total_weight = 0.0
 for i in range(num_criteria):
-    weight = st.session_state.weights[i] = st.sidebar.number_input(f"Weight for {criteria_names[i]}", min_value=0.0, max_value=1.0, value=st.session_state.weights[i])
-    weights.append(weight)
-    total_weight += weight
+    problem.weights[i] = st.sidebar.number_input(f"Weight for {problem.criteria[i]}", min_value=0.0, max_value=1.0, value=float(problem.weights[i]))
+total_weight = problem.weights.sum()
 
 st.sidebar.info("Please adjust weights until equals 1.")
 
+# Fuzzy scores are entered as a table on the main page instead
+fuzzy = st.sidebar.checkbox("Fuzzy scores", key="saw_fuzzy", help="Enter each score as a triangle: lowest, most likely and highest value")
+
 # Input alternatives and their scores
-alternatives = []
 for i in range(num_alternatives):
     st.sidebar.title(f"Alternative {i+1}")
-    alt_name = st.session_state.alternatives[i] = st.sidebar.text_input(f"Alternative {i+1} Name", value=st.session_state.alternatives[i])
-    alternatives.append(alt_name)
-    
-    # Specific alternative score storing in session state
-    if alt_name not in st.session_state.scores:
-        st.session_state.scores[alt_name] = [50.0] * num_criteria
-
-    # Score session state adjustments based on count inputs
-    if len(st.session_state.scores[alt_name]) < num_criteria:
-        st.session_state.scores[alt_name].extend([50.0] * (num_criteria - len(st.session_state.scores[alt_name])))
-    elif len(st.session_state.scores[alt_name]) > num_criteria:
-        st.session_state.scores[alt_name] = st.session_state.scores[alt_name][:num_criteria]
+    alt_name = st.sidebar.text_input(f"Alternative {i+1} Name", value=problem.alternatives[i])
+    problem.set_alternative(i, alt_name)
 
-    for j in range(num_criteria):
-        score = st.session_state.scores[alt_name][j] = st.sidebar.number_input(f"Score for {alt_name} in {criteria_names[j]}", min_value=0.0, max_value=100.0, value=st.session_state.scores[alt_name][j])
+    for j in range(num_criteria if not fuzzy else 0):
+        problem.matrix[i, j] = st.sidebar.number_input(f"Score for {alt_name} in {problem.criteria[j]}", min_value=0.0, max_value=100.0, value=float(problem.matrix[i, j]))
 
 # Normalise
-def saw_method(criteria, weights, scores, criteria_types):
-    # Convert session scores from dict to table
-    scores_dict = {alt: st.session_state.scores[alt] for alt in alternatives}
-    df = pd.DataFrame.from_dict(scores_dict, orient='index', columns=criteria)
+def saw_method(problem):
+    # Table view over the problem's score matrix, no copy
+    df = problem.to_frame()
     
     # Display scores
-    st.write("Scores", df)
+    with stage("saw.render"):
+        lazy_table("Scores", lambda: df, "saw_scores")
     
-    # Normalising based on criteria types
-    normalized_df = pd.DataFrame(index=df.index, columns=df.columns)
-    for i, crit_type in enumerate(criteria_types):
-        if crit_type == "Benefit":
-            normalized_df.iloc[:, i] = df.iloc[:, i] / df.iloc[:, i].max()
-        else:    # Cost
-            normalized_df.iloc[:, i] = df.iloc[:, i].min() / df.iloc[:, i]
+    # Edits since the last run are applied incrementally; the engine keeps the
+    # column max/min so unchanged columns are never renormalised
+    is_benefit = problem.is_benefit
+    engine = st.session_state.get('saw_engine')
+    with stage("saw.dot"):
+        if engine is None or not np.array_equal(engine.is_benefit, is_benefit):
+            engine = st.session_state.saw_engine = IncrementalSAW(problem.matrix, problem.weights, is_benefit)
+        else:
+            engine.sync(problem.matrix, problem.weights)
     
-    # Display normalised table
-    st.write("Normalised", normalized_df)
+    # Normalised table is only built when its section is opened
+    def normalized_df():
+        with stage("saw.normalize"):
+            return pd.DataFrame(engine.normalized(), index=df.index, columns=df.columns)
+    with stage("saw.render"):
+        lazy_table("Normalised", normalized_df, "saw_normalized")
     
-    saw_scores = normalized_df.dot(weights)  # Weighted sum
+    weighted_sum = pd.Series(engine.scores.copy(), index=df.index)
     
     # Rank the alternatives based on the final scores
-    final_scores = pd.DataFrame(saw_scores, columns=["Final Score"])
-    final_scores['Rank'] = final_scores['Final Score'].rank(ascending=False)
-    final_scores = final_scores.sort_values(by='Final Score', ascending=False)
+    with stage("saw.rank"):
+        final_scores = pd.DataFrame(weighted_sum, columns=["Final Score"])
+        final_scores['Rank'] = engine.ranks()
+        final_scores = final_scores.sort_values(by='Final Score', ascending=False)
     
     # Display chosen alternative
     chosen = final_scores.index[0]
     
     return final_scores, chosen
 
+# Fuzzy SAW over the (alternatives, criteria, 3) triangles, ranked by centroid
+def saw_fuzzy_method(problem, fuzzy_matrix):
+    result = cached_fuzzy_saw_scores(fuzzy_matrix, problem.weights, problem.is_benefit)
+    with stage("saw.rank"):
+        final_scores = pd.DataFrame(result.fuzzy_scores, index=problem.alternatives, columns=["Low", "Likely", "High"])
+        final_scores["Final Score"] = result.scores
+        final_scores["Rank"] = result.ranks
+        final_scores = final_scores.sort_values(by="Final Score", ascending=False)
+    return final_scores, final_scores.index[0]
+
 
 st.title("Simple Additive Weighting")
 st.write("Thank you for choosing this method!")
 st.markdown('Please fill in all of the input blocks and pay attention to the :orange[warnings!]')
 
+if fuzzy:
+    st.subheader("Fuzzy Scores")
+    fuzzy_matrix = fuzzy_scores_editor(problem.alternatives, problem.criteria, "saw", default=50.0)
+    invalid = invalid_triangles(fuzzy_matrix)
+else:
+    invalid = []
+
+run_sensitivity = sensitivity_toggle("saw")
+
 # Display results
-if st.sidebar.button("Calculate") and abs(total_weight - 1) <= 0.001:
+if st.sidebar.button("Calculate") and abs(total_weight - 1) <= 0.001 and not len(invalid):
     st.header("Result")
-    result, chosen = saw_method(criteria_names, weights, st.session_state.scores, criteria_types)
+    if fuzzy:
+        result, chosen = saw_fuzzy_method(problem, fuzzy_matrix)
+    else:
+        result, chosen = saw_method(problem)
     
-    st.write("Rankings")
-    st.write(result)
+    with stage("saw.render"):
+        st.write("Rankings")
+        st.write(result)
     
     st.success(f"The chosen alternative is {chosen}")
+    
+    if run_sensitivity:
+        # Fuzzy scores are perturbed at their centroids
+        matrix = defuzzify(fuzzy_matrix) if fuzzy else problem.matrix
+        sensitivity = weight_sensitivity(matrix, problem.weights, problem.is_benefit, "saw", n_samples=SENSITIVITY_SAMPLES)
+        show_sensitivity(problem.alternatives, sensitivity)
 elif abs(total_weight - 1) > 0.001:
     st.subheader(':orange[Warnings]')
-    st.warning(f"Cannot calculate SAW results because the total weight is not 1, it's :orange[{total_weight}]")
\ No newline at end of file
+    st.warning(f"Cannot calculate SAW results because the total weight is not 1, it's :orange[{total_weight}]")
+elif len(invalid):
+    st.subheader(':orange[Warnings]')
+    i, j = invalid[0]
+    st.warning(f"The fuzzy score for {problem.alternatives[i]} in {problem.criteria[j]} must satisfy low <= likely <= high")
+
+show_profile(profiler, "saw")
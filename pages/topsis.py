@@ -2,88 +2,140 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
-# Fungsi untuk normalisasi matriks keputusan
-def normalize_matrix(matrix):
-    return matrix / np.sqrt((matrix**2).sum(axis=0))
-
-# Fungsi untuk menghitung jarak ke solusi ideal positif dan negatif
-def calculate_distance(matrix, ideal_solution):
-    return np.sqrt(((matrix - ideal_solution) ** 2).sum(axis=1))
+from mcdm.cache import memoize
+from mcdm.fuzzy import defuzzify, fuzzy_topsis_scores
+from mcdm.instrument import stage
+from mcdm.problem import DecisionProblem
+from mcdm.sensitivity import weight_sensitivity
+from mcdm.topsis import calculate_distance, ideal_solutions, normalize_matrix, topsis_closeness, topsis_scores
+from ui.display import lazy_table
+from ui.fuzzy import fuzzy_scores_editor, invalid_triangles
+from ui.jobs import uploaded_scores
+from ui.profiling import profiling_toggle, show_profile
+from ui.query import filter_ranking
+from ui.results import past_result, show_stored_result, store_result
+from ui.sensitivity import SENSITIVITY_SAMPLES, sensitivity_toggle, show_sensitivity
+from ui.upload import upload_decision_matrix
+
+# Hasil engine dipakai bersama antar rerun dan sesi dengan input identik
+cached_topsis_scores = memoize(topsis_scores)
+cached_topsis_closeness = memoize(topsis_closeness)
+cached_fuzzy_topsis_scores = memoize(fuzzy_topsis_scores)
 
 # Fungsi utama untuk perhitungan TOPSIS
-def topsis(vendor_data, weights, is_benefit_criteria):
-    # 1. Normalisasi matriks keputusan
-    normalized_matrix = normalize_matrix(vendor_data.iloc[:, 1:].astype(float))
-    st.subheader('Matriks Normalisasi')
-    st.write(normalized_matrix)
-
-    # 2. Normalisasi bobot
-    weighted_matrix = normalized_matrix * weights
-    st.subheader('Matriks Bobot')
-    st.write(weighted_matrix)
-
-    # 3. Solusi ideal positif dan negatif
-    ideal_positive = np.zeros(weighted_matrix.shape[1])
-    ideal_negative = np.zeros(weighted_matrix.shape[1])
-
-    for i in range(weighted_matrix.shape[1]):
-        if is_benefit_criteria[i]:
-            ideal_positive[i] = weighted_matrix.iloc[:, i].max()  # Benefit criteria
-            ideal_negative[i] = weighted_matrix.iloc[:, i].min()  # Benefit criteria
-        else:
-            ideal_positive[i] = weighted_matrix.iloc[:, i].min()  # Cost criteria
-            ideal_negative[i] = weighted_matrix.iloc[:, i].max()  # Cost criteria
-
-    st.subheader('Solusi Ideal Positif dan Negatif')
-    ideal_df = pd.DataFrame({
-        'Kriteria': vendor_data.columns[1:],  # Mengambil nama kriteria dari vendor_data
-        'Ideal Positif': ideal_positive,
-        'Ideal Negatif': ideal_negative
+def topsis(problem):
+    criteria = problem.criteria
+    matrix = problem.matrix
+    weights = problem.weights
+    is_benefit_criteria = problem.is_benefit
+
+    # 1-4. Tabel perantara hanya dihitung saat bagiannya dibuka
+    def normalized_matrix():
+        # 1. Normalisasi matriks keputusan
+        with stage('topsis.1_normalize'):
+            return normalize_matrix(matrix)
+
+    def weighted_matrix():
+        # 2. Normalisasi bobot
+        normalized = normalized_matrix()
+        with stage('topsis.2_weight'):
+            return normalized * weights
+
+    def ideal_table():
+        # 3. Solusi ideal positif dan negatif
+        weighted = weighted_matrix()
+        with stage('topsis.3_ideal'):
+            ideal_positive, ideal_negative = ideal_solutions(weighted, is_benefit_criteria)
+        return pd.DataFrame({
+            'Kriteria': criteria,  # Mengambil nama kriteria dari vendor_data
+            'Ideal Positif': ideal_positive,
+            'Ideal Negatif': ideal_negative
+        })
+
+    def distance_table():
+        # 4. Menghitung jarak ke solusi ideal positif dan negatif
+        weighted = weighted_matrix()
+        ideal_positive, ideal_negative = ideal_solutions(weighted, is_benefit_criteria)
+        with stage('topsis.4_distance'):
+            distance_to_positive = calculate_distance(weighted, ideal_positive)
+            distance_to_negative = calculate_distance(weighted, ideal_negative)
+        return pd.DataFrame({
+            'Vendor': problem.alternatives,
+            'Jarak ke Solusi Ideal Positif': distance_to_positive,
+            'Jarak ke Solusi Ideal Negatif': distance_to_negative
+        })
+
+    with stage('topsis.render'):
+        lazy_table('Matriks Normalisasi', lambda: pd.DataFrame(normalized_matrix(), columns=criteria), 'topsis_normalized')
+        lazy_table('Matriks Bobot', lambda: pd.DataFrame(weighted_matrix(), columns=criteria), 'topsis_weighted')
+        lazy_table('Solusi Ideal Positif dan Negatif', ideal_table, 'topsis_ideal')
+        lazy_table('Jarak ke Solusi Ideal Positif dan Negatif', distance_table, 'topsis_distance')
+
+    # 5. Kedekatan relatif dan ranking dari engine TOPSIS
+    with stage('topsis.5_closeness'):
+        relative_closeness, ranking = cached_topsis_scores(matrix, weights, is_benefit_criteria)
+
+    return tabel_hasil(problem, relative_closeness, ranking)
+
+# TOPSIS fuzzy: nilai berupa segitiga (rendah, paling mungkin, tinggi) berbentuk (n, m, 3)
+def topsis_fuzzy(problem, fuzzy_matrix):
+    with stage('topsis.5_closeness'):
+        relative_closeness, ranking = cached_fuzzy_topsis_scores(fuzzy_matrix, problem.weights, problem.is_benefit)
+    return tabel_hasil(problem, relative_closeness, ranking)
+
+# Hasil dan kesimpulan berdasarkan ranking
+def tabel_hasil(problem, relative_closeness, ranking):
+    return pd.DataFrame({
+        'Vendor': problem.alternatives,
+        'Closeness Coefficient': relative_closeness,
+        'Ranking': ranking,
+        'Kesimpulan': np.where(
+            ranking == 1,
+            'Merupakan vendor terpilih',
+            np.char.add('Tidak terpilih, ranking ', ranking.astype(str))
+        )
     })
-    st.write(ideal_df)
-
-    # 4. Menghitung jarak ke solusi ideal positif dan negatif
-    distance_to_positive = calculate_distance(weighted_matrix, ideal_positive)
-    distance_to_negative = calculate_distance(weighted_matrix, ideal_negative)
-
-    st.subheader('Jarak ke Solusi Ideal Positif dan Negatif')
-    distance_df = pd.DataFrame({
-        'Vendor': vendor_data['index'],
-        'Jarak ke Solusi Ideal Positif': distance_to_positive,
-        'Jarak ke Solusi Ideal Negatif': distance_to_negative
-    })
-    st.write(distance_df)
-
-    # 5. Menghitung kedekatan relatif dengan solusi ideal positif
-    relative_closeness = distance_to_negative / (distance_to_positive + distance_to_negative)
-
-    # Menambahkan hasil ke dataframe
-    vendor_data['Closeness Coefficient'] = relative_closeness
-    vendor_data['Ranking'] = vendor_data['Closeness Coefficient'].rank(ascending=False, method='min').astype(int)
-
-    # Kesimpulan berdasarkan ranking
-    vendor_data['Kesimpulan'] = ''
-    for index, row in vendor_data.iterrows():
-        if row['Ranking'] == 1:
-            vendor_data.at[index, 'Kesimpulan'] = 'Merupakan vendor terpilih'
-        else:
-            vendor_data.at[index, 'Kesimpulan'] = f'Tidak terpilih, ranking {row["Ranking"]}'
-
-    return vendor_data
 
 # Inisialisasi session_state
-if 'vendor_data' not in st.session_state:
-    st.session_state.vendor_data = pd.DataFrame()
-if 'weights' not in st.session_state:
-    st.session_state.weights = []
-if 'is_benefit_criteria' not in st.session_state:
-    st.session_state.is_benefit_criteria = []
+if 'topsis_problem' not in st.session_state:
+    st.session_state.topsis_problem = None
 if 'topsis_result' not in st.session_state:
     st.session_state.topsis_result = pd.DataFrame()
+if 'topsis_fuzzy' not in st.session_state:
+    st.session_state.topsis_fuzzy = None
 
 # Judul aplikasi
 st.title('Implementasi TOPSIS Manual dengan Streamlit')
 
+# Instrumentasi per tahap, hanya aktif jika dicentang
+profiler = profiling_toggle("topsis")
+
+# Data dari file menggantikan input manual di bawah
+uploaded = upload_decision_matrix("topsis")
+if uploaded is not None:
+    # Data besar dihitung di antrean job latar belakang; None selama masih berjalan
+    relative_closeness = uploaded_scores("topsis", "topsis", uploaded, lambda: cached_topsis_closeness(uploaded.matrix, uploaded.weights, uploaded.is_benefit))
+    st.subheader('Hasil Ranking TOPSIS')
+    if relative_closeness is not None:
+        # Disimpan ke disk agar ranking bisa dibuka lagi dari sesi mana pun
+        stored = store_result("topsis", uploaded, relative_closeness)
+        with stage('topsis.render'):
+            chosen, _ = show_stored_result(stored, 'Closeness Coefficient', 'topsis')
+        st.success(f"{chosen} merupakan vendor terpilih")
+        filter_ranking('topsis', 'topsis', uploaded, 'Closeness Coefficient')
+    show_profile(profiler, "topsis")
+    st.stop()
+
+# Hasil upload sebelumnya bisa dibuka lagi tanpa file aslinya
+reopened = past_result("topsis")
+if reopened is not None:
+    st.subheader('Hasil Ranking TOPSIS')
+    with stage('topsis.render'):
+        chosen, _ = show_stored_result(reopened, 'Closeness Coefficient', 'topsis')
+    st.success(f"{chosen} merupakan vendor terpilih")
+    show_profile(profiler, "topsis")
+    st.stop()
+
 # Input di Sidebar
 st.sidebar.header("Input Data TOPSIS")
 
@@ -103,45 +155,72 @@ for j in range(num_criteria):
     criterion = st.sidebar.text_input(f'Nama Kriteria {j+1}', f'C{j+1}')
     criteria.append(criterion)
 
+# Semua input ditulis langsung ke array masalah keputusan
+problem = DecisionProblem(vendors, criteria)
+
 # Input bobot kriteria
-weights = []
 st.sidebar.subheader('Masukkan bobot untuk masing-masing kriteria')
 for j in range(num_criteria):
-    weight = st.sidebar.number_input(f'Bobot untuk {criteria[j]}', min_value=0.0, max_value=1.0, step=0.01)
-    weights.append(weight)
+    problem.weights[j] = st.sidebar.number_input(f'Bobot untuk {criteria[j]}', min_value=0.0, max_value=1.0, step=0.01)
 
 # Tentukan apakah kriteria adalah benefit atau cost
-is_benefit_criteria = []
 st.sidebar.subheader('Tentukan apakah kriteria ini benefit atau cost')
 for j in range(num_criteria):
     is_benefit = st.sidebar.radio(f'{criteria[j]} adalah:', ['Benefit', 'Cost'], index=0)
-    is_benefit_criteria.append(is_benefit == 'Benefit')
+    problem.set_benefit(j, is_benefit == 'Benefit')
+
+# Nilai fuzzy diisi sebagai tabel di halaman utama
+fuzzy = st.sidebar.checkbox('Nilai fuzzy (rendah / paling mungkin / tinggi)', key='topsis_fuzzy_mode')
 
 # Input nilai tiap vendor pada setiap kriteria
-vendor_data = pd.DataFrame(index=vendors, columns=criteria)
-for i in range(num_vendors):
-    for j in range(num_criteria):
-        score = st.sidebar.number_input(f'Nilai {vendors[i]} untuk {criteria[j]}', min_value=0.0, step=0.1)
-        vendor_data.loc[vendors[i], criteria[j]] = score
+fuzzy_matrix = None
+if fuzzy:
+    st.subheader('Nilai Fuzzy Vendor')
+    fuzzy_matrix = fuzzy_scores_editor(vendors, criteria, 'topsis')
+else:
+    for i in range(num_vendors):
+        for j in range(num_criteria):
+            problem.matrix[i, j] = st.sidebar.number_input(f'Nilai {vendors[i]} untuk {criteria[j]}', min_value=0.0, step=0.1)
 
 # Simpan data ke session_state
 if st.sidebar.button('Simpan Data'):
-    st.session_state.vendor_data = vendor_data.astype(float)
-    st.session_state.weights = np.array(weights)
-    st.session_state.is_benefit_criteria = is_benefit_criteria
-    st.success("Data berhasil disimpan!")
+    invalid = invalid_triangles(fuzzy_matrix) if fuzzy else []
+    if len(invalid):
+        i, j = invalid[0]
+        st.error(f"Nilai {vendors[i]} untuk {criteria[j]} harus memenuhi rendah <= paling mungkin <= tinggi")
+    else:
+        if fuzzy:
+            # Matriks crisp berisi titik pusat tiap segitiga, dipakai analisis sensitivitas
+            problem.matrix[:] = defuzzify(fuzzy_matrix)
+        st.session_state.topsis_problem = problem
+        st.session_state.topsis_fuzzy = fuzzy_matrix.copy() if fuzzy else None
+        st.success("Data berhasil disimpan!")
+
+run_sensitivity = sensitivity_toggle("topsis", "Analisis sensitivitas bobot")
 
 # Menjalankan TOPSIS jika data sudah lengkap
-if st.sidebar.button('Hitung TOPSIS') and not st.session_state.vendor_data.empty:
-    result = topsis(st.session_state.vendor_data.reset_index(), st.session_state.weights, st.session_state.is_benefit_criteria)
+if st.sidebar.button('Hitung TOPSIS') and st.session_state.topsis_problem is not None:
+    saved = st.session_state.topsis_problem
+    saved_fuzzy = st.session_state.topsis_fuzzy
+    if saved_fuzzy is not None:
+        result = topsis_fuzzy(saved, saved_fuzzy)
+    else:
+        result = topsis(saved)
     st.session_state.topsis_result = result  # Simpan hasil ke session_state
     
     # Menampilkan hasil perhitungan di halaman utama
     st.subheader('Hasil Ranking TOPSIS')
-    st.write(result[['index', 'Closeness Coefficient', 'Ranking', 'Kesimpulan']].rename(columns={'index': 'Vendor'}))
+    with stage('topsis.render'):
+        st.write(result)
+
+    if run_sensitivity:
+        sensitivity = weight_sensitivity(saved.matrix, saved.weights, saved.is_benefit, "topsis", n_samples=SENSITIVITY_SAMPLES)
+        show_sensitivity(saved.alternatives, sensitivity)
 elif st.session_state.topsis_result is not None and not st.session_state.topsis_result.empty:
     # Jika hasil sudah ada di session_state, tampilkan
     st.subheader('Hasil Ranking TOPSIS')
-    st.write(st.session_state.topsis_result[['index', 'Closeness Coefficient', 'Ranking', 'Kesimpulan']].rename(columns={'index': 'Vendor'}))
+    st.write(st.session_state.topsis_result)
 else:
     st.info("Masukkan data dan simpan terlebih dahulu.")
+
+show_profile(profiler, "topsis")
@@ -2,128 +2,162 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 
+from mcdm.cache import memoize
+from mcdm.instrument import stage
+from mcdm.problem import DecisionProblem
+from mcdm.sensitivity import weight_sensitivity
+from mcdm.wp import weight_product, weight_product_log
+from ui.display import lazy_table
+from ui.jobs import uploaded_scores
+from ui.profiling import profiling_toggle, show_profile
+from ui.query import filter_ranking
+from ui.results import past_result, show_stored_result, store_result
+from ui.sensitivity import SENSITIVITY_SAMPLES, sensitivity_toggle, show_sensitivity
+from ui.upload import upload_decision_matrix
+
 # Initialize WP-specific session state if it doesn't exist
 if 'wp_alternativesCount' not in st.session_state:
     st.session_state.wp_alternativesCount = 2
 if 'wp_criteriaCount' not in st.session_state:
     st.session_state.wp_criteriaCount = 2
-if 'wp_criteria_names' not in st.session_state:
-    st.session_state.wp_criteria_names = ['Criteria 1', 'Criteria 2', 'Criteria 3', 'Criteria 4', 'Criteria 5']
-if 'wp_criteria_types' not in st.session_state:
-    st.session_state.wp_criteria_types = ['Cost', 'Benefit', 'Cost', 'Benefit', 'Cost']
-if 'wp_weights' not in st.session_state:
-    st.session_state.wp_weights = [5.0, 3.0, 4.0, 4.0, 2.0]
-if 'wp_alternatives' not in st.session_state:
-    st.session_state.wp_alternatives = ['Alternative 1', 'Alternative 2', 'Alternative 3']
-if 'wp_scores' not in st.session_state:
-    st.session_state.wp_scores = {}
-
-def weight_product(criteria_weights, alternative_matrix, benefit_criteria):
-    normalized_weights = criteria_weights / np.sum(criteria_weights)
-    S = np.prod(alternative_matrix ** (normalized_weights * np.where(benefit_criteria, 1, -1)), axis=1)
-    V = S / np.sum(S)
-    return S, V
+if 'wp_problem' not in st.session_state:
+    st.session_state.wp_problem = DecisionProblem(
+        ['Alternative 1', 'Alternative 2'],
+        ['Criteria 1', 'Criteria 2'],
+        weights=[5.0, 3.0],
+        is_benefit=[False, True],
+        fill=50.0
+    )
+
+# Engine results are shared across reruns and sessions with identical inputs
+cached_weight_product = memoize(weight_product)
+cached_weight_product_log = memoize(weight_product_log)
 
 def wp_page():
     st.title("Weight Product Method")
     st.write("Thank you for choosing this method!")
     st.info('Please fill in all of the input blocks in the sidebar.')
 
+    profiler = profiling_toggle("wp")
+    wp_results()
+    show_profile(profiler, "wp")
+
+def wp_results():
+    # Uploaded decision matrix replaces the manual inputs below
+    uploaded = upload_decision_matrix("wp")
+    if uploaded is not None:
+        # Large uploads run on the background job queue; None while they do
+        log_S = uploaded_scores("wp", "wp", uploaded, lambda: cached_weight_product_log(uploaded.weights, uploaded.matrix, uploaded.is_benefit, with_ranks=False).log_S)
+        st.header("Weight Product Method Results")
+        if log_S is None:
+            return
+        # Stored on disk so the ranking can be reopened later from any session
+        stored = store_result("wp", uploaded, log_S)
+        with stage("wp.render"):
+            best_alternative, best_log_s = show_stored_result(stored, "log S Value", "wp")
+        st.success(f"The best alternative is {best_alternative} with log S of {best_log_s:.4f}")
+        filter_ranking("wp", "wp", uploaded, "log S Value")
+        return
+
+    # An earlier uploaded result can be reopened without its file
+    reopened = past_result("wp")
+    if reopened is not None:
+        st.header("Weight Product Method Results")
+        with stage("wp.render"):
+            best_alternative, best_log_s = show_stored_result(reopened, "log S Value", "wp")
+        st.success(f"The best alternative is {best_alternative} with log S of {best_log_s:.4f}")
+        return
+
     # Count inputs
     num_alternatives = st.session_state.wp_alternativesCount = st.sidebar.number_input("Number of Alternatives", min_value=2, max_value=10, value=st.session_state.wp_alternativesCount, key="wp_alt_count")
     num_criteria = st.session_state.wp_criteriaCount = st.sidebar.number_input("Number of Criteria", min_value=2, max_value=10, value=st.session_state.wp_criteriaCount, key="wp_crit_count")
 
-    # Session state extends based on count inputs
-    if len(st.session_state.wp_criteria_names) < num_criteria:
-        st.session_state.wp_criteria_names.extend([f"Criteria {i+1}" for i in range(len(st.session_state.wp_criteria_names), num_criteria)])
-    if len(st.session_state.wp_criteria_types) < num_criteria:
-        st.session_state.wp_criteria_types.extend(["Cost"] * (num_criteria - len(st.session_state.wp_criteria_types)))
-    if len(st.session_state.wp_weights) < num_criteria:
-        st.session_state.wp_weights.extend([1.0] * (num_criteria - len(st.session_state.wp_weights)))
-    if len(st.session_state.wp_alternatives) < num_alternatives:
-        st.session_state.wp_alternatives.extend([f"Alternative {i+1}" for i in range(len(st.session_state.wp_alternatives), num_alternatives)])
+    # Problem arrays resize based on count inputs
+    problem = st.session_state.wp_problem.resize(num_alternatives, num_criteria, fill=50.0, weight=1.0, benefit=False)
 
     # Input criteria names and types (cost/benefit)
-    criteria_names = []
-    criteria_types = []
     for i in range(num_criteria):
         st.sidebar.title(f"Criteria {i+1}")
-        criteria_name = st.session_state.wp_criteria_names[i] = st.sidebar.text_input(f"Criteria {i+1} Name", value=st.session_state.wp_criteria_names[i], key=f"wp_crit_name_{i}")
-        criteria_names.append(st.session_state.wp_criteria_names[i])
+        criteria_name = st.sidebar.text_input(f"Criteria {i+1} Name", value=problem.criteria[i], key=f"wp_crit_name_{i}")
+        problem.set_criterion(i, criteria_name)
         
-        criteria_type = st.session_state.wp_criteria_types[i] = st.sidebar.selectbox(
+        criteria_type = st.sidebar.selectbox(
             f"Type for {criteria_name}",
             options=["Benefit", "Cost"],
-            index=0 if st.session_state.wp_criteria_types[i] == "Benefit" else 1,
+            index=0 if problem.is_benefit[i] else 1,
             key=f"wp_crit_type_{i}"
         )
-        criteria_types.append(st.session_state.wp_criteria_types[i])
+        problem.set_benefit(i, criteria_type == "Benefit")
 
     # Input criteria weights
     st.sidebar.title("Criteria Weights")
-    weights = []
     for i in range(num_criteria):
-        weight = st.session_state.wp_weights[i] = st.sidebar.number_input(f"Weight for {criteria_names[i]}", min_value=0.0, value=st.session_state.wp_weights[i], key=f"wp_weight_{i}")
-        weights.append(weight)
+        problem.weights[i] = st.sidebar.number_input(f"Weight for {problem.criteria[i]}", min_value=0.0, value=float(problem.weights[i]), key=f"wp_weight_{i}")
 
     # Input alternatives and their scores
-    alternatives = []
     for i in range(num_alternatives):
         st.sidebar.title(f"Alternative {i+1}")
-        alt_name = st.session_state.wp_alternatives[i] = st.sidebar.text_input(f"Alternative {i+1} Name", value=st.session_state.wp_alternatives[i], key=f"wp_alt_name_{i}")
-        alternatives.append(alt_name)
-        
-        # Specific alternative score storing in session state
-        if alt_name not in st.session_state.wp_scores:
-            st.session_state.wp_scores[alt_name] = [50.0] * num_criteria
-
-        # Score session state adjustments based on count inputs
-        if len(st.session_state.wp_scores[alt_name]) < num_criteria:
-            st.session_state.wp_scores[alt_name].extend([50.0] * (num_criteria - len(st.session_state.wp_scores[alt_name])))
-        elif len(st.session_state.wp_scores[alt_name]) > num_criteria:
-            st.session_state.wp_scores[alt_name] = st.session_state.wp_scores[alt_name][:num_criteria]
+        alt_name = st.sidebar.text_input(f"Alternative {i+1} Name", value=problem.alternatives[i], key=f"wp_alt_name_{i}")
+        problem.set_alternative(i, alt_name)
 
         for j in range(num_criteria):
-            score = st.session_state.wp_scores[alt_name][j] = st.sidebar.number_input(f"Score for {alt_name} in {criteria_names[j]}", min_value=0.0, max_value=100.0, value=st.session_state.wp_scores[alt_name][j], key=f"wp_score_{i}_{j}")
+            problem.matrix[i, j] = st.sidebar.number_input(f"Score for {alt_name} in {problem.criteria[j]}", min_value=0.0, max_value=100.0, value=float(problem.matrix[i, j]), key=f"wp_score_{i}_{j}")
+
+    log_space = st.sidebar.checkbox("Log-space computation", value=False, key="wp_log_space", help="Numerically stable for zero scores and many criteria")
+
+    run_sensitivity = sensitivity_toggle("wp")
 
     if st.sidebar.button("Calculate", key="wp_calculate"):
-        # Prepare data for calculation
-        alternative_matrix = np.array([st.session_state.wp_scores[alt] for alt in alternatives])
-        criteria_weights = np.array(weights)
-        benefit_criteria = np.array([t == 'Benefit' for t in criteria_types])
+        # Engines read the problem arrays directly
+        alternative_matrix = problem.matrix
+        criteria_weights = problem.weights
+        benefit_criteria = problem.is_benefit
+        alternatives = problem.alternatives
 
         # Calculate results
-        S, V = weight_product(criteria_weights, alternative_matrix, benefit_criteria)
+        if log_space:
+            result = cached_weight_product_log(criteria_weights, alternative_matrix, benefit_criteria)
+            V = result.V
+        else:
+            S, V = cached_weight_product(criteria_weights, alternative_matrix, benefit_criteria)
 
         # Display results
         st.header("Weight Product Method Results")
         
         # Display input data
-        st.subheader("Input Data")
-        input_df = pd.DataFrame(alternative_matrix, columns=criteria_names, index=alternatives)
-        st.write("Alternative Scores:")
-        st.write(input_df)
-        
-        st.write("Criteria Weights:")
-        weight_df = pd.DataFrame({'Criteria': criteria_names, 'Weight': weights, 'Type': criteria_types})
-        st.write(weight_df)
+        with stage("wp.render"):
+            st.subheader("Input Data")
+            lazy_table("Alternative Scores", problem.to_frame, "wp_input")
+            lazy_table("Criteria Weights", lambda: pd.DataFrame({
+                'Criteria': problem.criteria,
+                'Weight': problem.weights,
+                'Type': np.where(problem.is_benefit, 'Benefit', 'Cost')
+            }), "wp_weights")
 
         # S vector table
-        st.subheader("Vector S")
-        s_df = pd.DataFrame({'Alternative': alternatives, 'S Value': S})
-        st.write(s_df)
+        with stage("wp.render"):
+            if log_space:
+                lazy_table("Vector log S", lambda: pd.DataFrame({'Alternative': alternatives, 'log S Value': result.log_S}), "wp_s")
+            else:
+                lazy_table("Vector S", lambda: pd.DataFrame({'Alternative': alternatives, 'S Value': S}), "wp_s")
 
         # V vector table
-        st.subheader("Vector V (Final Normalized Scores)")
-        v_df = pd.DataFrame({'Alternative': alternatives, 'V Value': V})
-        v_df['Rank'] = v_df['V Value'].rank(ascending=False)
-        v_df = v_df.sort_values('V Value', ascending=False)
-        st.write(v_df)
+        with stage("wp.rank"):
+            v_df = pd.DataFrame({'Alternative': alternatives, 'V Value': V})
+            v_df['Rank'] = result.ranks if log_space else v_df['V Value'].rank(ascending=False)
+            v_df = v_df.sort_values(['Rank', 'V Value'], ascending=[True, False])
+        with stage("wp.render"):
+            st.subheader("Vector V (Final Normalized Scores)")
+            st.write(v_df)
 
         # Best alternative
-        best_alternative = alternatives[np.argmax(V)]
-        best_score = np.max(V)
+        best_alternative = v_df.iloc[0]['Alternative']
+        best_score = v_df.iloc[0]['V Value']
         st.success(f"The best alternative is {best_alternative} with a score of {best_score:.4f}")
 
+        if run_sensitivity:
+            sensitivity = weight_sensitivity(alternative_matrix, criteria_weights, benefit_criteria, "wp", n_samples=SENSITIVITY_SAMPLES)
+            show_sensitivity(alternatives, sensitivity)
+
 if __name__ == "__main__":
     wp_page()
\ No newline at end of file
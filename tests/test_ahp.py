@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from mcdm.ahp import ratio_chunk, ratio_column_params, solve_batch, solve_scenarios
+from mcdm.stats import column_stats, iter_chunks
+
+
+def baseline_weights(matrix):
+    # The AHP page's original weighting: column-normalise, then average each row
+    return (matrix / matrix.sum(axis=0)).mean(axis=1)
+
+
+def ratio_scores(matrix, weights, is_benefit, chunk_size, params=None):
+    if params is None:
+        params = ratio_column_params(column_stats(matrix, chunk_size, reciprocal=True), weights, is_benefit)
+    return np.concatenate([ratio_chunk(matrix[start:stop], params) for start, stop in iter_chunks(len(matrix), chunk_size)])
+
+
+def test_solve_batch_matches_the_baseline_formula():
+    rng = np.random.default_rng(5)
+    upper = rng.choice([1 / 5, 1 / 3, 1, 3, 5], (4, 4))
+    matrix = np.triu(upper, 1) + np.tril(1 / upper.T, -1) + np.eye(4)
+    result = solve_batch(matrix)
+    np.testing.assert_allclose(result.weights, baseline_weights(matrix), rtol=1e-12)
+    assert result.cr == pytest.approx((np.linalg.eigvals(matrix).real.max() - 4) / 3 / 0.89, rel=0.05)
+
+
+def test_ratio_scores_equal_ahp_on_ratio_judgments():
+    rng = np.random.default_rng(6)
+    matrix = rng.uniform(1, 10, (5, 3))
+    weights, is_benefit = np.array([0.5, 0.3, 0.2]), np.array([True, False, True])
+    # Pairwise comparisons a_ij = x_i / x_j, inverted for cost criteria
+    values = np.where(is_benefit, matrix, 1 / matrix)
+    alternative_matrices = (values.T[:, :, None] / values.T[:, None, :])[None]
+    criteria_matrix = (weights[:, None] / weights[None, :])[None]
+    expected = solve_scenarios(criteria_matrix, alternative_matrices).final_scores[0]
+    np.testing.assert_allclose(ratio_scores(matrix, weights, is_benefit, 2), expected, rtol=1e-12)
+
+
+def test_ratio_scores_do_not_depend_on_the_block_a_row_is_in():
+    rng = np.random.default_rng(7)
+    # Repeated rows land at different positions within their blocks
+    matrix = np.tile(rng.uniform(1, 10, (37, 9)), (50, 1))
+    weights, is_benefit = rng.uniform(0.1, 1, 9), rng.random(9) < 0.5
+    params = ratio_column_params(column_stats(matrix, reciprocal=True), weights, is_benefit)
+    scores = ratio_scores(matrix, weights, is_benefit, len(matrix), params)
+    assert (scores.reshape(50, 37) == scores[:37]).all()
+    np.testing.assert_array_equal(ratio_scores(matrix, weights, is_benefit, 101, params), scores)
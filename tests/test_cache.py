@@ -0,0 +1,32 @@
+import numpy as np
+
+from mcdm.cache import ResultCache, memoize
+
+
+def test_identical_inputs_share_one_result():
+    calls = []
+    cache = ResultCache()
+    square = memoize(lambda x: calls.append(1) or x * x, cache=cache)
+    first = square(np.arange(4.0))
+    np.testing.assert_array_equal(square(np.arange(4.0)), first)
+    assert len(calls) == 1
+    assert not first.flags.writeable
+
+
+def test_oversize_results_are_counted():
+    cache = ResultCache(max_bytes=1024)
+    ones = memoize(np.ones, cache=cache)
+    ones(1024)
+    ones(1024)
+    stats = cache.stats()
+    assert stats["entries"] == 0 and stats["bytes"] == 0
+    assert stats["oversize"] == 2 and stats["misses"] == 2
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = ResultCache(max_bytes=2500)
+    zeros = memoize(np.zeros, cache=cache)
+    for n in (100, 101, 102, 100, 103):
+        zeros(n)
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["hits"] == 1
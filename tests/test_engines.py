@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm.pipeline import compare_methods
+from mcdm.saw import saw_scores
+from mcdm.topsis import topsis_scores
+from mcdm.wp import weight_product, weight_product_log
+
+# The formulas the SAW, TOPSIS and WP pages used before the chunked engines
+
+
+def baseline_saw(matrix, weights, is_benefit):
+    df = pd.DataFrame(matrix)
+    normalized_df = pd.DataFrame(index=df.index, columns=df.columns, dtype=np.float64)
+    for i in range(len(is_benefit)):
+        if is_benefit[i]:
+            normalized_df.iloc[:, i] = df.iloc[:, i] / df.iloc[:, i].max()
+        else:
+            normalized_df.iloc[:, i] = df.iloc[:, i].min() / df.iloc[:, i]
+    scores = normalized_df.dot(weights)
+    return scores.to_numpy(), scores.rank(ascending=False).to_numpy()
+
+
+def baseline_topsis(matrix, weights, is_benefit):
+    normalized = matrix / np.sqrt((matrix**2).sum(axis=0))
+    weighted = normalized * weights
+    ideal_positive = np.where(is_benefit, weighted.max(axis=0), weighted.min(axis=0))
+    ideal_negative = np.where(is_benefit, weighted.min(axis=0), weighted.max(axis=0))
+    distance_positive = np.sqrt(((weighted - ideal_positive) ** 2).sum(axis=1))
+    distance_negative = np.sqrt(((weighted - ideal_negative) ** 2).sum(axis=1))
+    closeness = distance_negative / (distance_positive + distance_negative)
+    return closeness, pd.Series(closeness).rank(ascending=False, method="min").to_numpy()
+
+
+def baseline_wp(matrix, weights, is_benefit):
+    normalized_weights = weights / np.sum(weights)
+    S = np.prod(matrix ** (normalized_weights * np.where(is_benefit, 1, -1)), axis=1)
+    V = S / np.sum(S)
+    return S, V, pd.Series(V).rank(ascending=False).to_numpy()
+
+
+def decision(seed, n=2000, m=6):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(1, 100, (n, m)), rng.uniform(0.1, 1, m), rng.random(m) < 0.5
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("chunk_size", [1, 333, 65536])
+def test_saw_matches_the_baseline(seed, chunk_size):
+    matrix, weights, is_benefit = decision(seed)
+    expected_scores, expected_ranks = baseline_saw(matrix, weights, is_benefit)
+    scores = saw_scores(matrix, weights, is_benefit, chunk_size=chunk_size)
+    np.testing.assert_allclose(scores, expected_scores, rtol=1e-12)
+    np.testing.assert_array_equal(pd.Series(scores).rank(ascending=False).to_numpy(), expected_ranks)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("chunk_size", [1, 333, 65536])
+def test_topsis_matches_the_baseline(seed, chunk_size):
+    matrix, weights, is_benefit = decision(seed)
+    expected_closeness, expected_ranks = baseline_topsis(matrix, weights, is_benefit)
+    closeness, ranks = topsis_scores(matrix, weights, is_benefit, chunk_size=chunk_size)
+    np.testing.assert_allclose(closeness, expected_closeness, rtol=1e-12)
+    np.testing.assert_array_equal(ranks, expected_ranks)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("chunk_size", [1, 333, 65536])
+def test_wp_matches_the_baseline(seed, chunk_size):
+    matrix, weights, is_benefit = decision(seed)
+    S, V, expected_ranks = baseline_wp(matrix, weights, is_benefit)
+    result = weight_product_log(weights, matrix, is_benefit, chunk_size=chunk_size)
+    np.testing.assert_allclose(np.exp(result.log_S), S, rtol=1e-12)
+    np.testing.assert_allclose(result.V, V, rtol=1e-10)
+    np.testing.assert_array_equal(result.ranks, expected_ranks)
+    np.testing.assert_array_equal(weight_product(weights, matrix, is_benefit)[0], S)
+
+
+def test_equal_rows_tie_in_every_block():
+    # Equal alternatives must share a rank however the rows are blocked
+    matrix, weights, is_benefit = decision(3, n=300)
+    matrix = np.concatenate([matrix, matrix[::-1], matrix[:7]])
+    for chunk_size in (1, 64, 1000):
+        saw = pd.Series(saw_scores(matrix, weights, is_benefit, chunk_size=chunk_size))
+        _, topsis_ranks = topsis_scores(matrix, weights, is_benefit, chunk_size=chunk_size)
+        wp_ranks = weight_product_log(weights, matrix, is_benefit, chunk_size=chunk_size).ranks
+        for ranks in (saw.rank(ascending=False).to_numpy(), topsis_ranks, wp_ranks):
+            np.testing.assert_array_equal(ranks[:300], ranks[300:600][::-1])
+            np.testing.assert_array_equal(ranks[:7], ranks[600:])
+
+
+def test_wp_ranks_zero_scores_by_their_limit():
+    # A zero benefit score sends S to 0, a zero cost score sends it to infinity;
+    # two zero benefit scores send it to 0 faster than one
+    matrix = np.array([[5.0, 5, 5], [0, 5, 5], [0, 0, 5], [5, 5, 0], [2, 2, 2]])
+    weights, is_benefit = np.array([1.0, 1, 1]), np.array([True, True, False])
+    result = weight_product_log(weights, matrix, is_benefit)
+    np.testing.assert_array_equal(result.ranks, [2, 4, 5, 1, 3])
+    np.testing.assert_array_equal(result.log_S[1:4], [-np.inf, -np.inf, np.inf])
+    np.testing.assert_array_equal(result.V, [0, 0, 0, 1, 0])
+    # The baseline agrees wherever S is finite and non-zero
+    S, _, _ = baseline_wp(matrix[[0, 4]], weights, is_benefit)
+    np.testing.assert_allclose(np.exp(result.log_S[[0, 4]]), S, rtol=1e-12)
+
+
+def test_compare_methods_matches_each_engine():
+    matrix, weights, is_benefit = decision(4)
+    result = compare_methods(matrix, weights, is_benefit, chunk_size=500)
+    np.testing.assert_array_equal(result.scores["saw"], saw_scores(matrix, weights, is_benefit, chunk_size=500))
+    closeness, topsis_ranks = topsis_scores(matrix, weights, is_benefit, chunk_size=500)
+    np.testing.assert_array_equal(result.scores["topsis"], closeness)
+    np.testing.assert_array_equal(result.ranks["topsis"], topsis_ranks)
+    wp = weight_product_log(weights, matrix, is_benefit, chunk_size=500)
+    np.testing.assert_array_equal(result.scores["wp"], wp.log_S)
+    np.testing.assert_array_equal(result.ranks["wp"], wp.ranks)
+    np.testing.assert_allclose(np.diag(result.agreement), 1.0)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from mcdm.fuzzy import fuzzy_saw_scores, fuzzy_topsis_scores
+
+
+def weighted_triangles(matrix, weights, is_benefit):
+    # Chen's linear scaling cell by cell, then the weight triangles vertex by vertex
+    n, m, _ = matrix.shape
+    weighted = np.empty_like(matrix)
+    for j in range(m):
+        high_max, low_min = matrix[:, j, 2].max(), matrix[:, j, 0].min()
+        for i in range(n):
+            low, mode, high = matrix[i, j]
+            normalized = (low / high_max, mode / high_max, high / high_max) if is_benefit[j] else (low_min / high, low_min / mode, low_min / low)
+            weighted[i, j] = np.array(normalized) * weights[j]
+    return weighted
+
+
+def random_problem(seed, n=40, m=4):
+    rng = np.random.default_rng(seed)
+    corners = np.sort(rng.uniform(1, 10, (n, m, 3)), axis=-1)
+    weights = np.sort(rng.uniform(0.1, 1, (m, 3)), axis=-1)
+    return corners, weights, rng.random(m) < 0.5
+
+
+def test_fuzzy_saw_matches_the_formula():
+    matrix, weights, is_benefit = random_problem(1)
+    result = fuzzy_saw_scores(matrix, weights, is_benefit, chunk_size=7)
+    expected = weighted_triangles(matrix, weights, is_benefit).sum(axis=1)
+    np.testing.assert_allclose(result.fuzzy_scores, expected, rtol=1e-12)
+    np.testing.assert_array_equal(result.ranks, pd.Series(result.scores).rank(ascending=False).to_numpy())
+
+
+def test_fuzzy_topsis_matches_the_formula():
+    matrix, weights, is_benefit = random_problem(2)
+    closeness, ranks = fuzzy_topsis_scores(matrix, weights, is_benefit, chunk_size=7)
+    weighted = weighted_triangles(matrix, weights, is_benefit)
+    ideal_positive, ideal_negative = weighted[..., 2].max(axis=0), weighted[..., 0].min(axis=0)
+    distance_to_positive = np.sqrt(((weighted - ideal_positive[:, None]) ** 2).mean(axis=2)).sum(axis=1)
+    distance_to_negative = np.sqrt(((weighted - ideal_negative[:, None]) ** 2).mean(axis=2)).sum(axis=1)
+    np.testing.assert_allclose(closeness, distance_to_negative / (distance_to_positive + distance_to_negative), rtol=1e-12)
+    np.testing.assert_array_equal(ranks, pd.Series(closeness).rank(method="min", ascending=False).to_numpy())
+
+
+def test_fuzzy_topsis_distance_at_the_ideal_is_exact():
+    # Triangles far from the origin and next to the ideal: squaring before
+    # subtracting would cancel to noise, or to a negative distance
+    matrix = np.array([[[1e8, 1e8, 1e8], [1, 2, 3]], [[1e8 - 1, 1e8, 1e8 + 1], [2, 3, 4]], [[1e8 - 2, 1e8 - 1, 1e8], [3, 4, 5]]])
+    weights = np.full((2, 3), 0.5)
+    closeness, _ = fuzzy_topsis_scores(matrix, weights, [True, True])
+    weighted = weighted_triangles(matrix, weights, [True, True])
+    ideal_positive, ideal_negative = weighted[..., 2].max(axis=0), weighted[..., 0].min(axis=0)
+    distance_to_positive = np.sqrt(((weighted - ideal_positive[:, None]) ** 2).mean(axis=2)).sum(axis=1)
+    distance_to_negative = np.sqrt(((weighted - ideal_negative[:, None]) ** 2).mean(axis=2)).sum(axis=1)
+    np.testing.assert_allclose(closeness, distance_to_negative / (distance_to_positive + distance_to_negative), rtol=1e-12)
@@ -0,0 +1,34 @@
+import numpy as np
+
+from mcdm.ahp import solve_scenarios
+from mcdm.hierarchy import Hierarchy
+
+STRUCTURE = {"Cost": {"Price": {}, "Upkeep": {}}, "Quality": {"Build": {}, "Support": {"Phone": {}, "Email": {}}}, "Looks": {}}
+
+
+def random_judgments(rng, n):
+    upper = rng.choice([1 / 7, 1 / 5, 1 / 3, 1, 3, 5, 7], (n, n))
+    return np.triu(upper, 1) + np.tril(1 / upper.T, -1) + np.eye(n)
+
+
+def test_single_node_edits_equal_a_full_rebuild():
+    rng = np.random.default_rng(4)
+    hierarchy = Hierarchy(STRUCTURE, ["A", "B", "C", "D"])
+    for _ in range(200):
+        i = rng.integers(len(hierarchy.paths))
+        hierarchy.set_judgments(i, random_judgments(rng, hierarchy.judgments[i].shape[0]))
+    scores = hierarchy.scores.copy()
+    global_weights = hierarchy.global_weights.copy()
+    hierarchy.rebuild()
+    np.testing.assert_array_equal(hierarchy.global_weights, global_weights)
+    np.testing.assert_array_equal(hierarchy.scores, scores)
+
+
+def test_one_level_hierarchy_matches_flat_ahp():
+    rng = np.random.default_rng(8)
+    hierarchy = Hierarchy({"Price": {}, "Quality": {}, "Looks": {}}, ["A", "B", "C"])
+    criteria = random_judgments(rng, 3)
+    alternatives = np.stack([random_judgments(rng, 3) for _ in range(3)])
+    hierarchy.update_judgments({"Goal": criteria, "Price": alternatives[0], "Quality": alternatives[1], "Looks": alternatives[2]})
+    expected = solve_scenarios(criteria[None], alternatives[None]).final_scores[0]
+    np.testing.assert_allclose(hierarchy.scores, expected, rtol=1e-12)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm.incremental import IncrementalSAW, IncrementalTOPSIS, IncrementalWP
+from mcdm.saw import saw_scores
+from mcdm.topsis import topsis_closeness
+from mcdm.wp import weight_product_log
+
+
+def saw_ranks(matrix, weights, is_benefit):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.Series(saw_scores(matrix, weights, is_benefit)).rank(ascending=False).to_numpy()
+
+
+def topsis_ranks(matrix, weights, is_benefit):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.Series(topsis_closeness(matrix, weights, is_benefit)).rank(method="min", ascending=False).to_numpy()
+
+
+def wp_ranks(matrix, weights, is_benefit):
+    return weight_product_log(weights, matrix, is_benefit).ranks
+
+
+ENGINES = [(IncrementalSAW, saw_ranks), (IncrementalTOPSIS, topsis_ranks), (IncrementalWP, wp_ranks)]
+
+
+def test_saw_nan_scores_are_not_ranked_above_real_ones():
+    # A cost column with a 0 reference makes 0/0 for that row
+    matrix = np.array([[0.0, 50], [20, 60], [40, 70]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        engine = IncrementalSAW(matrix, [0.5, 0.5], [False, True])
+    np.testing.assert_array_equal(engine.ranks(), [np.nan, 2, 1])
+    np.testing.assert_array_equal(engine.ranks(), saw_ranks(matrix, np.array([0.5, 0.5]), np.array([False, True])))
+
+
+def test_nan_scores_enter_and_leave_the_ranking():
+    matrix = np.array([[10.0, 50], [20, 60], [40, 70]])
+    weights, is_benefit = np.array([0.5, 0.5]), np.array([False, True])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        engine = IncrementalSAW(matrix, weights, is_benefit)
+        for value in (0.0, 5.0, 0.0, 30.0):
+            engine.update_cell(0, 0, value)
+            matrix[0, 0] = value
+            np.testing.assert_array_equal(engine.ranks(), saw_ranks(matrix, weights, is_benefit))
+
+
+def test_ties_stay_exact():
+    # Equal rows must tie after edits that pass through other values
+    matrix = np.array([[0.1, 0.7, 0.3], [0.1, 0.7, 0.3], [0.1, 0.7, 0.3], [0.2, 0.4, 0.9]])
+    weights, is_benefit = np.array([0.3, 0.3, 0.4]), np.array([True, False, True])
+    for engine_type, reference in ENGINES:
+        engine = engine_type(matrix, weights, is_benefit)
+        engine.update_cell(1, 1, 0.123456789)
+        engine.update_cell(1, 1, 0.7)
+        engine.update_weight(2, 0.41)
+        engine.update_weight(2, 0.4)
+        ranks = engine.ranks()
+        assert ranks[0] == ranks[1] == ranks[2]
+        np.testing.assert_array_equal(ranks, reference(matrix, weights, is_benefit))
+
+
+@pytest.mark.parametrize("engine_type, reference", ENGINES)
+def test_random_edits_match_a_full_recompute(engine_type, reference):
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        # Few distinct values, including 0, so ties, zero scores and NaN come up
+        matrix = rng.integers(0, 4, (6, 4)).astype(np.float64)
+        weights = rng.integers(1, 4, 4).astype(np.float64)
+        weights /= weights.sum()
+        is_benefit = rng.random(4) < 0.5
+        with np.errstate(divide="ignore", invalid="ignore"):
+            engine = engine_type(matrix, weights, is_benefit)
+            for _ in range(20):
+                if rng.random() < 0.8:
+                    i, j = rng.integers(6), rng.integers(4)
+                    matrix[i, j] = rng.integers(0, 4)
+                    engine.update_cell(i, j, matrix[i, j])
+                else:
+                    j = rng.integers(4)
+                    weights[j] = rng.integers(1, 4) / 6
+                    engine.update_weight(j, weights[j])
+                np.testing.assert_array_equal(engine.ranks(), reference(matrix, weights, is_benefit))
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from mcdm.index import OPERATORS, DecisionIndex
+from mcdm.ranking import top_k
+from mcdm.saw import saw_scores
+
+
+@pytest.fixture
+def decision():
+    rng = np.random.default_rng(3)
+    matrix = rng.integers(1, 20, (200, 3)).astype(np.float64)
+    return matrix, np.array([0.5, 0.3, 0.2]), np.array([True, False, True])
+
+
+@pytest.mark.parametrize("op", OPERATORS)
+def test_where_matches_a_scan(decision, op):
+    matrix, weights, is_benefit = decision
+    index = DecisionIndex(matrix, weights, is_benefit, ["A", "B", "C"])
+    column = matrix[:, 1]
+    expected = {
+        "<": column < 10,
+        "<=": column <= 10,
+        ">": column > 10,
+        ">=": column >= 10,
+        "==": column == 10,
+        "!=": column != 10,
+        "between": (column >= 5) & (column <= 12),
+    }[op]
+    np.testing.assert_array_equal(index.where("B", op, (5, 12) if op == "between" else 10), expected)
+
+
+def test_global_ranking_matches_the_full_scores(decision):
+    matrix, weights, is_benefit = decision
+    index = DecisionIndex(matrix, weights, is_benefit)
+    mask = index.select([(0, ">", 5), (2, "<=", 15)])
+    result = index.rank("saw", mask, k=10)
+    rows = np.flatnonzero(mask)
+    order, ranks = top_k(saw_scores(matrix, weights, is_benefit)[rows], 10, method="average")
+    np.testing.assert_array_equal(result.rows, rows[order])
+    np.testing.assert_array_equal(result.ranks, ranks)
+    assert result.n_selected == len(rows)
+
+
+def test_subset_ranking_normalises_against_the_selection(decision):
+    matrix, weights, is_benefit = decision
+    index = DecisionIndex(matrix, weights, is_benefit)
+    mask = index.where(0, ">=", 10)
+    result = index.rank("saw", mask, normalization="subset")
+    rows = np.flatnonzero(mask)
+    np.testing.assert_array_equal(result.scores, np.sort(saw_scores(matrix[rows], weights, is_benefit))[::-1])
+
+
+def test_order_is_stored_compactly(decision):
+    matrix, weights, is_benefit = decision
+    index = DecisionIndex(matrix.astype(np.float32), weights, is_benefit)
+    assert index.order.dtype == np.int32 and index.sorted_values.dtype == np.float32
+    before = index.nbytes
+    index.scores("topsis")
+    assert index.nbytes == before + 8 * len(matrix)
@@ -0,0 +1,66 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from mcdm.ingest import load_comparison_matrix, load_decision_matrix
+
+CSV = "Name,Price|Cost|0.5,Quality|Benefit|0.3,Speed\nA,10,7.5,3\nB,20,8,4\nC,15,6.25,5\n"
+MATRIX = np.array([[10, 7.5, 3], [20, 8, 4], [15, 6.25, 5]])
+
+
+@pytest.mark.parametrize("source", [lambda: io.StringIO(CSV), lambda: io.BytesIO(CSV.encode())])
+def test_csv_with_annotated_header(source):
+    decision = load_decision_matrix(source())
+    np.testing.assert_array_equal(decision.alternatives, ["A", "B", "C"])
+    assert decision.criteria == ["Price", "Quality", "Speed"]
+    np.testing.assert_array_equal(decision.matrix, MATRIX)
+    np.testing.assert_array_equal(decision.is_benefit, [False, True, True])
+    # An unannotated criterion gets no weight once any weight is given
+    np.testing.assert_array_equal(decision.weights, [0.5, 0.3, 0.0])
+
+
+def test_small_chunks_give_the_same_matrix():
+    decision = load_decision_matrix(io.StringIO(CSV), chunk_size=1)
+    np.testing.assert_array_equal(decision.matrix, MATRIX)
+
+
+def test_sidecar_overrides_the_header():
+    sidecar = io.StringIO(json.dumps({"criteria": [{"name": "Quality", "type": "Cost"}, {"name": "Speed", "weight": 0.2}]}))
+    decision = load_decision_matrix(io.StringIO(CSV), sidecar=sidecar)
+    np.testing.assert_array_equal(decision.is_benefit, [False, False, True])
+    np.testing.assert_array_equal(decision.weights, [0.5, 0.3, 0.2])
+
+
+def test_equal_weights_without_annotations():
+    decision = load_decision_matrix(io.StringIO("1,2\n3,4\n5,6\n"), name_column=None)
+    np.testing.assert_array_equal(decision.matrix, [[3, 4], [5, 6]])
+    np.testing.assert_array_equal(decision.weights, [0.5, 0.5])
+    np.testing.assert_array_equal(decision.alternatives, ["Alternative 1", "Alternative 2"])
+
+
+def test_float32_loading():
+    decision = load_decision_matrix(io.StringIO(CSV), dtype=np.float32)
+    assert decision.matrix.dtype == np.float32
+    np.testing.assert_array_equal(decision.matrix, MATRIX.astype(np.float32))
+
+
+def test_parquet_matches_csv(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table({"Name": ["A", "B", "C"], "Price|Cost|0.5": MATRIX[:, 0], "Quality|Benefit|0.3": MATRIX[:, 1], "Speed": MATRIX[:, 2]})
+    path = tmp_path / "data.parquet"
+    pq.write_table(table, path)
+    expected = load_decision_matrix(io.StringIO(CSV))
+    decision = load_decision_matrix(path, chunk_size=2)
+    np.testing.assert_array_equal(decision.alternatives, expected.alternatives)
+    np.testing.assert_array_equal(decision.matrix, expected.matrix)
+    np.testing.assert_array_equal(decision.is_benefit, expected.is_benefit)
+    np.testing.assert_array_equal(decision.weights, expected.weights)
+
+
+def test_comparison_matrix_with_blanks():
+    labels, matrix = load_comparison_matrix(io.StringIO(",X,Y,Z\nX,1,3,\nY,,1,2\nZ,,,1\n"))
+    assert labels == ["X", "Y", "Z"]
+    assert np.isnan(matrix[0, 2]) and matrix[0, 1] == 3
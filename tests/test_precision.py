@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm.precision import reduced_precision_scores
+from mcdm.saw import saw_scores
+from mcdm.topsis import topsis_scores
+from mcdm.wp import weight_product_log
+
+
+def exact_ranks(method, matrix, weights, is_benefit):
+    # The float64 engines on the float32 values, upcast
+    matrix = matrix.astype(np.float64)
+    if method == "saw":
+        return pd.Series(saw_scores(matrix, weights, is_benefit)).rank(ascending=False).to_numpy()
+    if method == "topsis":
+        return topsis_scores(matrix, weights, is_benefit)[1]
+    return weight_product_log(weights, matrix, is_benefit).ranks
+
+
+def near_ties(seed, n=20000, m=5):
+    # Values on a coarse grid, so many scores are equal or differ in the last bits
+    rng = np.random.default_rng(seed)
+    matrix = (1 + rng.integers(0, 50, (n, m)) / 8).astype(np.float32)
+    matrix = np.concatenate([matrix, matrix[: n // 10]])
+    return matrix, rng.uniform(0.1, 1, m), rng.random(m) < 0.5
+
+
+@pytest.mark.parametrize("method", ["saw", "topsis", "wp"])
+@pytest.mark.parametrize("seed", range(2))
+def test_ranks_equal_the_float64_engines(method, seed):
+    matrix, weights, is_benefit = near_ties(seed)
+    result = reduced_precision_scores(method, matrix, weights, is_benefit, chunk_size=4096)
+    np.testing.assert_array_equal(result.ranks, exact_ranks(method, matrix, weights, is_benefit))
+
+
+def test_wp_zero_scores_are_ranked_exactly():
+    matrix, weights, is_benefit = near_ties(2, n=5000)
+    rng = np.random.default_rng(2)
+    matrix[rng.random(matrix.shape) < 0.05] = 0
+    result = reduced_precision_scores("wp", matrix, weights, is_benefit)
+    np.testing.assert_array_equal(result.ranks, exact_ranks("wp", matrix, weights, is_benefit))
+
+
+def test_well_separated_scores_stay_in_float32():
+    rng = np.random.default_rng(3)
+    matrix = rng.uniform(1, 100, (2000, 4)).astype(np.float32)
+    weights, is_benefit = np.array([0.4, 0.3, 0.2, 0.1]), np.array([True, False, True, False])
+    result = reduced_precision_scores("saw", matrix, weights, is_benefit)
+    assert result.n_rescored < len(matrix) // 10
+    np.testing.assert_array_equal(result.ranks, exact_ranks("saw", matrix, weights, is_benefit))
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm.ranking import TopK, rank_average, rank_average_lexicographic, rank_min, top_k
+
+
+def pandas_ranks(values, method, ascending=False):
+    return pd.Series(values).rank(method=method, ascending=ascending).to_numpy()
+
+
+def pandas_top(values, k, method, ascending=False):
+    # Best k as pandas orders them (NaN last, ties by position) with their ranks
+    series = pd.Series(values)
+    order = series.sort_values(ascending=ascending, kind="stable").index.to_numpy()[:k]
+    return order, series.rank(method=method, ascending=ascending).to_numpy()[order]
+
+
+def scores(seed, n=500, nan_fraction=0.1):
+    # Few distinct values, so most scores tie, plus some NaNs
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 40, n).astype(np.float64)
+    values[rng.random(n) < nan_fraction] = np.nan
+    return values
+
+
+@pytest.mark.parametrize("rank, method", [(rank_min, "min"), (rank_average, "average")])
+@pytest.mark.parametrize("ascending", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_ranks_match_pandas(rank, method, ascending, seed):
+    values = scores(seed)
+    np.testing.assert_array_equal(rank(values, ascending), pandas_ranks(values, method, ascending))
+
+
+def test_nan_scores_are_not_ranked():
+    values = np.array([3, np.nan, 1, 3, np.nan, 2])
+    np.testing.assert_array_equal(rank_min(values), [1, np.nan, 4, 1, np.nan, 3])
+    np.testing.assert_array_equal(rank_average(values), [1.5, np.nan, 4, 1.5, np.nan, 3])
+    assert rank_min(np.array([3.0, 1, 2])).dtype.kind == "i"
+
+
+@pytest.mark.parametrize("method", ["min", "average"])
+@pytest.mark.parametrize("k", [1, 10, 37, 460, 500])
+@pytest.mark.parametrize("seed", range(3))
+def test_top_k_matches_pandas(method, k, seed):
+    values = scores(seed)
+    indices, ranks = top_k(values, k, method=method)
+    expected_indices, expected_ranks = pandas_top(values, k, method)
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_array_equal(ranks, expected_ranks)
+
+
+@pytest.mark.parametrize("method", ["min", "average"])
+@pytest.mark.parametrize("k", [1, 25, 480])
+@pytest.mark.parametrize("chunk_size", [7, 64, 500])
+def test_streamed_and_merged_top_k_match_pandas(method, k, chunk_size):
+    values = scores(4)
+    expected_indices, expected_ranks = pandas_top(values, k, method)
+
+    streamed = TopK(k, method=method)
+    for start in range(0, len(values), chunk_size):
+        streamed.update(values[start:start + chunk_size])
+
+    # One TopK per block, merged as the sharded scorer does
+    parts = []
+    for start in range(0, len(values), chunk_size):
+        part = TopK(k, method=method)
+        part.update(values[start:start + chunk_size], offset=start)
+        parts.append(part)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    for result in (streamed.result(), merged.result()):
+        np.testing.assert_array_equal(result[0], expected_indices)
+        np.testing.assert_array_equal(result[1], expected_ranks)
+
+
+def test_all_nan_scores():
+    values = np.full(5, np.nan)
+    indices, ranks = top_k(values, 3)
+    np.testing.assert_array_equal(indices, [0, 1, 2])
+    assert np.isnan(ranks).all()
+    streamed = TopK(3)
+    streamed.update(values)
+    np.testing.assert_array_equal(streamed.result()[0], [0, 1, 2])
+
+
+def test_lexicographic_ranks_match_pandas_on_pairs():
+    rng = np.random.default_rng(5)
+    primary = rng.integers(0, 4, 300).astype(np.float64)
+    secondary = rng.integers(0, 6, 300).astype(np.float64)
+    # secondary < 10, so the pair orders like one combined key
+    combined = pandas_ranks(primary * 10 + secondary, "average")
+    np.testing.assert_array_equal(rank_average_lexicographic(primary, secondary), combined)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcdm.saw import saw_scores
+from mcdm.sensitivity import WEIGHT_METHODS, _best, _prepare, weight_sensitivity
+from mcdm.topsis import topsis_closeness
+from mcdm.wp import weight_product_log
+
+MATRIX = np.array([[3.0, 5, 2], [1, 4, 6], [2, 2, 3], [4, 1, 5], [5, 3, 1], [2, 2, 2]])
+# Zeros in a benefit and a cost column, so WP has rows at -inf and +inf
+ZEROS_MATRIX = np.array([[3.0, 0, 2], [1, 4, 0], [2, 2, 3], [4, 2, 0], [0, 3, 1], [2, 2, 2]])
+WEIGHTS = np.array([0.3, 0.3, 0.4])
+IS_BENEFIT = np.array([True, True, False])
+
+
+def engine_ranks(method, matrix, weights):
+    if method == "wp":
+        return weight_product_log(weights, matrix, IS_BENEFIT).ranks
+    scores = saw_scores(matrix, weights, IS_BENEFIT) if method == "saw" else topsis_closeness(matrix, weights, IS_BENEFIT)
+    return pd.Series(scores).rank(ascending=False).to_numpy()
+
+
+@pytest.mark.parametrize("method, matrix", [(method, MATRIX) for method in WEIGHT_METHODS] + [("wp", ZEROS_MATRIX)])
+def test_samples_are_ordered_as_the_engine_ranks_them(method, matrix):
+    weight_batch = np.random.default_rng(2).dirichlet(np.ones(3), size=20)
+    with np.errstate(divide="ignore"):
+        best = _best(method, _prepare(method, matrix, IS_BENEFIT), weight_batch, len(matrix))
+        for sample, weights in enumerate(weight_batch):
+            ranks = engine_ranks(method, matrix, weights)[best[:, sample]]
+            np.testing.assert_array_equal(ranks, np.sort(ranks))
+
+
+def test_wp_baseline_winner_is_the_pages_winner():
+    with np.errstate(divide="ignore"):
+        result = weight_sensitivity(ZEROS_MATRIX, WEIGHTS, IS_BENEFIT, method="wp", n_samples=500, concentration=1e6, seed=1)
+        winner = int(np.argmin(weight_product_log(WEIGHTS, ZEROS_MATRIX, IS_BENEFIT).ranks))
+    assert result.baseline_winner == winner
+    assert result.winner_probability[winner] == 1.0
+    np.testing.assert_allclose(result.rank_acceptability.sum(axis=0), 1.0)
+
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from mcdm.ahp import ratio_chunk, ratio_column_params
+from mcdm.ranking import RANK_METHOD, top_k
+from mcdm.saw import saw_scores
+from mcdm.shard import sharded_scores
+from mcdm.stats import column_stats, iter_chunks
+from mcdm.topsis import topsis_closeness
+from mcdm.wp import weight_product_log
+
+CHUNK_SIZE = 1000
+
+
+def single_process(method, matrix, weights, is_benefit):
+    if method == "ahp":
+        # AHP has no matrix engine of its own; the comparison pipeline runs this loop
+        params = ratio_column_params(column_stats(matrix, CHUNK_SIZE, reciprocal=True), weights, is_benefit)
+        return np.concatenate([ratio_chunk(matrix[start:stop], params) for start, stop in iter_chunks(len(matrix), CHUNK_SIZE)])
+    if method == "saw":
+        return saw_scores(matrix, weights, is_benefit, chunk_size=CHUNK_SIZE)
+    if method == "topsis":
+        return topsis_closeness(matrix, weights, is_benefit, chunk_size=CHUNK_SIZE)
+    return weight_product_log(weights, matrix, is_benefit, chunk_size=CHUNK_SIZE).log_S
+
+
+@pytest.fixture(scope="module")
+def decision():
+    rng = np.random.default_rng(11)
+    # Repeated rows, so ties must survive sharding too
+    matrix = np.repeat(rng.uniform(1, 10, (2501, 5)), 2, axis=0)
+    return matrix, rng.uniform(0.1, 1, 5), rng.random(5) < 0.5
+
+
+@pytest.mark.parametrize("method", list(RANK_METHOD))
+def test_sharded_scores_match_single_process_bit_for_bit(decision, method):
+    matrix, weights, is_benefit = decision
+    result = sharded_scores(method, matrix, weights, is_benefit, workers=3, k=10, chunk_size=CHUNK_SIZE)
+    expected = single_process(method, matrix, weights, is_benefit)
+    np.testing.assert_array_equal(result.scores, expected)
+    order, ranks = top_k(expected, 10, method=RANK_METHOD[method])
+    np.testing.assert_array_equal(result.top_indices, order)
+    np.testing.assert_array_equal(result.top_ranks, ranks)
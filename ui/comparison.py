@@ -0,0 +1,83 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from mcdm.ingest import load_comparison_matrix
+
+# Largest matrix order offered by the grid and upload inputs
+GRID_MAX_ITEMS = 100
+
+
+def comparison_grid(labels, prefix):
+    # One editable grid per matrix instead of a number input per pair. Blank
+    # cells are missing comparisons; editing a cell also sets its reciprocal.
+    n = len(labels)
+    key = f"{prefix}_matrix"
+    if key not in st.session_state or st.session_state[key].shape != (n, n):
+        st.session_state[key] = np.ones((n, n))
+    matrix = st.session_state[key]
+
+    # The editor keeps its own edits, so it is re-keyed after they are folded
+    # into the matrix to show the updated reciprocals
+    version_key = f"{prefix}_grid_version"
+    version = st.session_state.get(version_key, 0)
+    edited = st.data_editor(
+        pd.DataFrame(matrix, index=labels, columns=labels),
+        key=f"{prefix}_grid_{version}"
+    ).to_numpy(dtype=np.float64)
+
+    changed = ~((edited == matrix) | (np.isnan(edited) & np.isnan(matrix)))
+    np.fill_diagonal(changed, False)
+    if changed.any():
+        for i, j in zip(*np.nonzero(changed)):
+            value = edited[i, j] if edited[i, j] > 0 else np.nan
+            matrix[i, j] = value
+            matrix[j, i] = 1 / value
+        st.session_state[version_key] = version + 1
+        st.rerun()
+    return matrix
+
+
+def _default_labels(prefix, n):
+    return [f"{prefix}{i+1:02d}" for i in range(n)]
+
+
+def upload_comparison_matrices(key):
+    # Criteria matrix plus one alternative matrix per criterion (CSV or .npy,
+    # in criterion order), or a single (criteria, n, n) .npy stack
+    st.sidebar.header("Comparison Matrices")
+    criteria_file = st.sidebar.file_uploader("Criteria comparison matrix", type=["csv", "npy"], key=f"{key}_criteria_upload")
+    alternative_files = st.sidebar.file_uploader(
+        "Alternative comparison matrices",
+        type=["csv", "npy"],
+        accept_multiple_files=True,
+        key=f"{key}_alternatives_upload",
+        help="One file per criterion in criterion order, or one .npy array of shape (criteria, alternatives, alternatives)"
+    )
+    if criteria_file is None or not alternative_files:
+        return None
+
+    try:
+        criteria_labels, criteria_matrix = load_comparison_matrix(criteria_file)
+        if criteria_matrix.ndim != 2:
+            raise ValueError("The criteria comparison matrix must be 2-dimensional")
+        loaded = [load_comparison_matrix(f) for f in alternative_files]
+        alternative_labels = loaded[0][0]
+        if len(loaded) == 1 and loaded[0][1].ndim == 3:
+            alternative_matrices = loaded[0][1]
+        else:
+            alternative_matrices = np.stack([matrix for _, matrix in loaded])
+    except ValueError as e:
+        st.error(f"Could not read comparison matrices: {e}")
+        return None
+
+    m, n = criteria_matrix.shape[0], alternative_matrices.shape[-1]
+    if alternative_matrices.shape[0] != m:
+        st.error(f"Expected {m} alternative matrices (one per criterion), got {alternative_matrices.shape[0]}")
+        return None
+    return (
+        criteria_labels or _default_labels("C", m),
+        alternative_labels or _default_labels("A", n),
+        criteria_matrix,
+        alternative_matrices,
+    )
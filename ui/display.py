@@ -0,0 +1,42 @@
+import streamlit as st
+
+# Rows sent to the browser per page of an intermediate table
+PAGE_SIZE = 50
+
+# Tables with more cells than this open on summary statistics instead of rows
+SUMMARY_CELLS = 10000
+
+
+@st.fragment
+def lazy_table(title, compute, key, page_size=PAGE_SIZE):
+    # compute() builds the DataFrame and only runs while the section is switched
+    # on. Toggling or paging reruns just this fragment, so the rest of the page
+    # (and its results) stay as they are.
+    if not st.toggle(title, key=f"{key}_show"):
+        return
+    table = compute()
+    n_rows = len(table)
+    if n_rows <= page_size:
+        st.dataframe(table)
+        return
+
+    views = ["Summary", "Rows"]
+    view = st.radio(
+        f"{title} view",
+        views,
+        index=0 if table.size > SUMMARY_CELLS else 1,
+        horizontal=True,
+        key=f"{key}_view",
+        label_visibility="collapsed",
+    )
+    if view == "Summary":
+        st.dataframe(table.describe())
+        st.caption(f"Summary of {n_rows} rows")
+        return
+
+    n_pages = -(-n_rows // page_size)
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    stop = min(start + page_size, n_rows)
+    st.dataframe(table.iloc[start:stop])
+    st.caption(f"Rows {start + 1}-{stop} of {n_rows}")
@@ -0,0 +1,28 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+VERTEX_LABELS = ("low", "likely", "high")
+
+
+def fuzzy_scores_editor(alternatives, criteria, key, default=0.0):
+    # One row per alternative with low / likely / high columns per criterion,
+    # kept as an (n, m, 3) array in session state
+    n, m = len(alternatives), len(criteria)
+    state_key = f"{key}_fuzzy_scores"
+    if state_key not in st.session_state or st.session_state[state_key].shape != (n, m, 3):
+        st.session_state[state_key] = np.full((n, m, 3), default)
+    scores = st.session_state[state_key]
+
+    columns = [f"{criterion} ({vertex})" for criterion in criteria for vertex in VERTEX_LABELS]
+    edited = st.data_editor(
+        pd.DataFrame(scores.reshape(n, 3 * m), index=list(alternatives), columns=columns),
+        key=f"{key}_fuzzy_editor_{n}_{m}"
+    )
+    scores[:] = edited.fillna(default).to_numpy(dtype=np.float64).reshape(n, m, 3)
+    return scores
+
+
+def invalid_triangles(scores):
+    # Triangles whose vertices are out of order, as (row, column) pairs
+    return np.argwhere((scores[..., 0] > scores[..., 1]) | (scores[..., 1] > scores[..., 2]))
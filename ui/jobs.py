@@ -0,0 +1,98 @@
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from mcdm import jobs
+from mcdm.cache import content_key, memoize
+from mcdm.precision import reduced_precision_scores
+from ui.upload import float32_mode
+
+# Uploads with at least this many cells are scored on the background job queue
+BACKGROUND_CELLS = 1_000_000
+
+# How often a running job's progress bar refreshes
+POLL_SECONDS = 0.5
+
+cached_reduced_precision_scores = memoize(reduced_precision_scores)
+
+
+def session_user():
+    # Concurrency limits apply per browser session
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+
+def has_job(key, inputs):
+    current = st.session_state.get(f"{key}_job")
+    return current is not None and current[0] == inputs
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _job_progress(key, job):
+    # Only this fragment polls; the page reruns once when the job finishes
+    if job.done():
+        st.rerun()
+    if job.status == jobs.QUEUED:
+        st.progress(0.0, text=f"{job.description}: waiting for a free worker")
+    else:
+        st.progress(job.progress, text=f"{job.description}: {job.completed} of {job.total} blocks")
+    st.button("Cancel", key=f"{key}_job_cancel", on_click=job.cancel)
+
+
+def background_result(key, inputs, submit):
+    # inputs is a content key of everything the job reads; submit(queue, user)
+    # returns the Job. The session's job for this page is kept across reruns and
+    # replaced (and cancelled) when the inputs change. Returns the result once
+    # the job is done, None while it is queued, running, failed or cancelled.
+    state_key = f"{key}_job"
+    current = st.session_state.get(state_key)
+    if current is None or current[0] != inputs:
+        if current is not None:
+            current[1].cancel()
+        current = st.session_state[state_key] = (inputs, submit(jobs.default_queue(), session_user()))
+    job = current[1]
+
+    if job.status == jobs.DONE:
+        return job.result()
+    if job.status == jobs.FAILED:
+        st.error(f"Calculation failed: {job.error}")
+    elif job.status == jobs.CANCELLED:
+        st.info("Calculation cancelled.")
+        if st.button("Run again", key=f"{key}_job_restart"):
+            del st.session_state[state_key]
+            st.rerun()
+    else:
+        _job_progress(key, job)
+    return None
+
+
+def _reduced_scores(key, method, uploaded):
+    # Float32 uploads (ui.upload's Float32 mode) skip the float64 engines
+    args = (method, uploaded.matrix, uploaded.weights, uploaded.is_benefit)
+    if uploaded.matrix.size < BACKGROUND_CELLS:
+        result = cached_reduced_precision_scores(*args)
+    else:
+        result = background_result(
+            key,
+            content_key(*args),
+            lambda queue, user: queue.submit(user, reduced_precision_scores, *args, description=f"{method.upper()} float32 scores"),
+        )
+        if result is None:
+            return None
+    st.caption(f"Float32 mode: {result.n_rescored} of {len(result.scores)} alternatives were near a tie and rescored in float64.")
+    return result.scores
+
+
+def uploaded_scores(key, method, uploaded, compute):
+    # Scores of an upload (log S for WP). Small uploads are scored inline with
+    # compute(); large ones go to the queue.
+    if float32_mode(key):
+        return _reduced_scores(key, method, uploaded)
+    if uploaded.matrix.size < BACKGROUND_CELLS:
+        return compute()
+    inputs = content_key(method, uploaded.matrix, uploaded.weights, uploaded.is_benefit)
+    result = background_result(
+        key,
+        inputs,
+        lambda queue, user: queue.submit_scores(user, method, uploaded.matrix, uploaded.weights, uploaded.is_benefit),
+    )
+    return result.log_S if method == "wp" and result is not None else result
@@ -0,0 +1,42 @@
+import streamlit as st
+import pandas as pd
+
+from mcdm import instrument
+from mcdm.cache import default_cache
+
+
+def profiling_toggle(key):
+    # Profiles the rest of this run when checked; returns the Profiler or None
+    if st.sidebar.checkbox("Stage timing", key=f"{key}_profiling", help="Time each calculation step and count the memory it allocates"):
+        return instrument.enable()
+    instrument.disable()
+    return None
+
+
+def show_profile(profiler, key):
+    if profiler is None:
+        return
+    instrument.disable()
+    summary = profiler.summary()
+    with st.expander("Stage timing", expanded=False):
+        if not summary:
+            st.write("No stages ran.")
+            return
+        table = pd.DataFrame({
+            "Stage": [entry.name for entry in summary],
+            "Calls": [entry.calls for entry in summary],
+            "Time (ms)": [entry.seconds * 1e3 for entry in summary],
+            "Allocated (KiB)": [entry.allocated_bytes / 1024 for entry in summary],
+            "Peak (KiB)": [entry.peak_bytes / 1024 for entry in summary],
+        })
+        st.dataframe(table, hide_index=True)
+        cache = default_cache.stats()
+        st.caption(
+            f"Result cache: {cache['entries']} entries, {cache['bytes'] / 1024**2:.1f} of {cache['max_bytes'] / 1024**2:.0f} MiB, "
+            f"{cache['hits']} hits, {cache['misses']} misses, {cache['oversize']} results too large to keep"
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Download JSON log", profiler.to_json(), f"{key}_stages.json", "application/json", key=f"{key}_profile_json")
+        with col2:
+            st.download_button("Download Prometheus metrics", profiler.to_prometheus(), f"{key}_stages.prom", "text/plain", key=f"{key}_profile_prom")
@@ -0,0 +1,67 @@
+import streamlit as st
+import pandas as pd
+
+from mcdm.index import NORMALIZATIONS, OPERATORS, DecisionIndex
+from ui.upload import RANKING_DISPLAY_LIMIT
+
+# Conditions offered by the filter form
+MAX_CONDITIONS = 5
+
+
+def session_index(key, decision):
+    # One index per uploaded matrix, kept in the session next to the parsed
+    # upload it was built from. An index is about three times the matrix, far
+    # over the shared cache's budget for large uploads, and the scores it adds
+    # per method would leave the cache's byte count stale.
+    state_key = f"{key}_filter_index"
+    cached = st.session_state.get(state_key)
+    if cached is None or cached[0] is not decision:
+        st.session_state.pop(state_key, None)
+        cached = st.session_state[state_key] = (decision, DecisionIndex(decision.matrix, decision.weights, decision.is_benefit, list(decision.criteria)))
+    return cached[1]
+
+
+def _condition(index, key, k):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        criterion = st.selectbox("Criterion", index.criteria, key=f"{key}_filter_{k}_criterion")
+    with col2:
+        op = st.selectbox("Condition", OPERATORS, key=f"{key}_filter_{k}_op")
+    with col3:
+        if op == "between":
+            low = st.number_input("From", value=0.0, key=f"{key}_filter_{k}_low")
+            high = st.number_input("To", value=100.0, key=f"{key}_filter_{k}_high")
+            value = (low, high)
+        else:
+            value = st.number_input("Value", value=0.0, key=f"{key}_filter_{k}_value")
+    return criterion, op, value
+
+
+@st.fragment
+def filter_ranking(key, method, decision, score_label):
+    # Rank only the alternatives that meet every condition. Editing the form
+    # reruns just this fragment against the session's index.
+    if not st.toggle("Filter alternatives", key=f"{key}_filter_show"):
+        return
+    index = session_index(key, decision)
+    n_conditions = st.number_input("Number of conditions", min_value=1, max_value=MAX_CONDITIONS, value=1, key=f"{key}_filter_count")
+    conditions = [_condition(index, key, k) for k in range(n_conditions)]
+    normalization = st.radio(
+        "Normalise against",
+        NORMALIZATIONS,
+        format_func=lambda n: "All alternatives" if n == "global" else "Filtered alternatives only",
+        horizontal=True,
+        key=f"{key}_filter_normalization",
+        help="Filtered-only rescales every criterion to the selected rows, which can reorder them"
+    )
+
+    result = index.rank(method, index.select(conditions), normalization, k=RANKING_DISPLAY_LIMIT)
+    if not result.n_selected:
+        st.warning("No alternative meets every condition.")
+        return
+    st.write(f"Top {len(result.rows)} of {result.n_selected} matching alternatives")
+    st.write(pd.DataFrame({
+        'Alternative': decision.alternatives[result.rows],
+        score_label: result.scores,
+        'Rank': result.ranks
+    }))
@@ -0,0 +1,87 @@
+import time
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from mcdm.ranking import rank_average, rank_average_lexicographic, rank_min
+from mcdm.store import ResultStore, problem_key
+from mcdm.wp import wp_exponents, wp_log_chunk
+from ui.upload import show_criteria
+
+# Stored results beyond this size are dropped, least recently used first
+STORE_MAX_BYTES = 8 * 1024**3
+
+# Ranking rows read from disk per page
+RANKING_PAGE_SIZE = 100
+
+store = ResultStore()
+
+
+def _wp_ranks(decision, log_S):
+    # Rows with a zero score all sit at +-inf in log S. As in wp_finalize they
+    # are ranked by their zero order, then their finite part, which only those
+    # rows need recomputed; the others have a zero order of 0.
+    zero_rows = np.flatnonzero(np.isinf(log_S))
+    if not len(zero_rows):
+        return rank_average(log_S)
+    log_finite = np.array(log_S, dtype=np.float64)
+    zero_order = np.zeros(len(log_S))
+    exponents = wp_exponents(decision.weights, decision.is_benefit)
+    log_finite[zero_rows], zero_order[zero_rows] = wp_log_chunk(decision.matrix[zero_rows].astype(np.float64), exponents)
+    return rank_average_lexicographic(zero_order, log_finite)
+
+
+def store_result(method, decision, scores):
+    # Persist an uploaded problem with its scores (log S for WP); ties follow
+    # the page's method
+    key = problem_key(method, decision.matrix, decision.weights, decision.is_benefit)
+    result = store.get(key)
+    if result is None:
+        if method == "wp":
+            ranks = _wp_ranks(decision, scores)
+        else:
+            ranks = rank_min(scores) if method == "topsis" else rank_average(scores)
+        result = store.put(key, method, decision.alternatives, decision.criteria, decision.matrix, decision.weights, decision.is_benefit, scores, ranks)
+        store.prune(STORE_MAX_BYTES)
+    return result
+
+
+def show_stored_ranking(result, score_label, key, page_size=RANKING_PAGE_SIZE):
+    # Pages through the ranking straight from the memory-mapped files
+    n = len(result.order)
+    n_pages = -(-n // page_size)
+    page = st.number_input("Ranking page", min_value=1, max_value=n_pages, value=1, key=f"{key}_ranking_page") if n_pages > 1 else 1
+    start = (page - 1) * page_size
+    rows = np.asarray(result.order[start:start + page_size])
+    st.write(pd.DataFrame({
+        'Alternative': result.alternatives[rows],
+        score_label: result.scores[rows],
+        'Rank': result.ranks[rows]
+    }))
+    st.caption(f"Ranks {start + 1}-{start + len(rows)} of {n} alternatives")
+    best = result.order[0]
+    return result.alternatives[best], result.scores[best]
+
+
+def past_result(key):
+    # Sidebar picker over earlier results of this method, from any session
+    entries = dict(store.entries(key))
+    if not entries:
+        return None
+
+    def describe(k):
+        if k is None:
+            return "None"
+        meta = entries[k]
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(meta["created"]))
+        return f"{created}: {meta['n_alternatives']} x {meta['n_criteria']}"
+
+    st.sidebar.header("Past Results")
+    choice = st.sidebar.selectbox("Reopen a stored result", [None, *entries], format_func=describe, key=f"{key}_past_result")
+    return store.get(choice) if choice is not None else None
+
+
+def show_stored_result(result, score_label, key):
+    show_criteria(result)
+    return show_stored_ranking(result, score_label, key)
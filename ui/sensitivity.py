@@ -0,0 +1,29 @@
+import streamlit as st
+import pandas as pd
+
+# Monte Carlo samples drawn for the in-page analysis
+SENSITIVITY_SAMPLES = 5000
+
+# Rank columns shown in the acceptability table
+ACCEPTABILITY_RANKS = 3
+
+
+def sensitivity_toggle(key, label="Weight sensitivity analysis"):
+    return st.sidebar.checkbox(label, key=f"{key}_sensitivity", help="Re-rank under randomly perturbed weights to see how stable the winner is")
+
+
+def show_sensitivity(alternatives, result):
+    st.subheader("Sensitivity Analysis")
+    winner = alternatives[result.baseline_winner]
+    st.write(
+        f"{winner} stays the winner in {1 - result.flip_probability:.1%} of {result.n_samples} samples "
+        f"(winner flip probability {result.flip_probability:.1%})."
+    )
+    n_ranks = min(ACCEPTABILITY_RANKS, result.rank_acceptability.shape[1])
+    acceptability = pd.DataFrame(
+        result.rank_acceptability[:, :n_ranks],
+        index=list(alternatives),
+        columns=[f"Rank {r+1}" for r in range(n_ranks)]
+    )
+    st.write("Rank acceptability (share of samples at each rank):")
+    st.write(acceptability.sort_values("Rank 1", ascending=False))
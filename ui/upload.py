@@ -0,0 +1,62 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+from mcdm.ingest import load_decision_matrix
+
+# Rows shown in the uploaded-data ranking table
+RANKING_DISPLAY_LIMIT = 100
+
+
+def _load_uploaded(key, data_file, sidecar_file, dtype):
+    # Parsed once per uploaded file and kept in the session. Uploads are keyed
+    # by Streamlit's file id rather than a hash of their bytes, so a rerun costs
+    # nothing however large the file is, and results over the shared cache's
+    # memory budget are kept too.
+    file_id = (data_file.file_id, sidecar_file.file_id if sidecar_file is not None else None, np.dtype(dtype).str)
+    state_key = f"{key}_parsed_upload"
+    parsed = st.session_state.get(state_key)
+    if parsed is None or parsed[0] != file_id:
+        # Dropped first, so the old matrix and the new one are never both held
+        st.session_state.pop(state_key, None)
+        data_file.seek(0)
+        if sidecar_file is not None:
+            sidecar_file.seek(0)
+        parsed = st.session_state[state_key] = (file_id, load_decision_matrix(data_file, sidecar=sidecar_file, dtype=dtype))
+    return parsed[1]
+
+
+def upload_decision_matrix(key, offer_float32=True):
+    st.sidebar.header("Upload Data")
+    data_file = st.sidebar.file_uploader("Decision matrix (CSV or Parquet)", type=["csv", "parquet"], key=f"{key}_upload")
+    sidecar_file = st.sidebar.file_uploader("Criteria sidecar (JSON, optional)", type=["json"], key=f"{key}_sidecar")
+    st.sidebar.caption("Header cells may be annotated as Name|Benefit|0.3; the sidecar overrides them.")
+    if offer_float32:
+        st.sidebar.checkbox(
+            "Float32 mode",
+            key=f"{key}_float32",
+            help="Loads the matrix in single precision, half the memory for large files. Values are rounded to float32 on load; near ties are rescored in float64, so the ranking is exact for the rounded values"
+        )
+    if data_file is None:
+        return None
+    try:
+        dtype = np.float32 if offer_float32 and float32_mode(key) else np.float64
+        return _load_uploaded(key, data_file, sidecar_file, dtype)
+    except (ValueError, KeyError, ImportError) as e:
+        st.sidebar.error(f"Could not read {data_file.name}: {e}")
+        return None
+
+
+def float32_mode(key):
+    # Whether the Float32 mode checkbox of upload_decision_matrix(key) is ticked
+    return st.session_state.get(f"{key}_float32", False)
+
+
+def show_criteria(decision):
+    st.write("Criteria:")
+    st.write(pd.DataFrame({
+        'Criteria': list(decision.criteria),
+        'Weight': decision.weights,
+        'Type': np.where(decision.is_benefit, 'Benefit', 'Cost')
+    }))
+
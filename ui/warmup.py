@@ -0,0 +1,47 @@
+import importlib
+import os
+import threading
+
+# Modules the method pages import. The Welcome page only needs streamlit, so a
+# fresh server serves it without them and then loads them on a background
+# thread, once per process, before the first method page is opened.
+PAGE_MODULES = (
+    "numpy",
+    "pandas",
+    "mcdm.ahp",
+    "mcdm.fuzzy",
+    "mcdm.incremental",
+    "mcdm.pipeline",
+    "mcdm.problem",
+    "mcdm.sensitivity",
+    "ui.comparison",
+    "ui.display",
+    "ui.fuzzy",
+    "ui.jobs",
+    "ui.profiling",
+    "ui.query",
+    "ui.results",
+    "ui.sensitivity",
+    "ui.upload",
+)
+
+_thread = None
+_lock = threading.Lock()
+
+
+def _import_all(modules):
+    for name in modules:
+        importlib.import_module(name)
+
+
+def warm_up(modules=PAGE_MODULES):
+    # Starts the import thread unless it already ran in this process or
+    # MCDM_WARMUP=0 (e.g. to time a cold page load); returns it or None
+    global _thread
+    if os.environ.get("MCDM_WARMUP", "1") == "0":
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_import_all, args=(modules,), name="mcdm-warmup", daemon=True)
+            _thread.start()
+    return _thread